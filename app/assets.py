@@ -0,0 +1,108 @@
+"""
+Banners de las páginas, optimizados una sola vez.
+
+Las imágenes originales (app/museo.jpg, app/fed_bn.jpg) miden ~2000 px de
+ancho y se muestran a 180 px de alto. Aquí se redimensionan a ANCHO_MAX (el
+doble del alto mostrado como tope, para pantallas hi-dpi) y se recomprimen a
+WebP en data/assets/. El data URI resultante se memoriza por proceso: los
+reruns de Streamlit ya no leen ni codifican la imagen.
+
+Para generarlos al construir la imagen / desplegar:
+    python -m app.assets
+"""
+from pathlib import Path
+import sys
+
+#  raíz del proyecto en el path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import base64
+import functools
+import threading
+
+from app import config
+
+APP_DIR = ROOT_DIR / "app"
+ASSETS_DIR = Path(config.getenv("DASHBOARD_DATA_DIR", str(ROOT_DIR / "data"))) / "assets"
+
+# nombre -> imagen original dentro de app/
+BANNERS = {
+    "banxico": "museo.jpg",
+    "fed": "fed_bn.jpg",
+}
+
+ALTO_MOSTRADO_PX = 180
+ALTO_MAX = 2 * ALTO_MOSTRADO_PX
+ANCHO_MAX = 1600
+CALIDAD = 80
+
+_lock = threading.Lock()
+
+
+def ruta_optimizada(nombre: str) -> Path:
+    return ASSETS_DIR / f"{Path(BANNERS[nombre]).stem}.webp"
+
+
+def optimizar(nombre: str, forzar: bool = False) -> Path | None:
+    """
+    Genera (si falta o el original es más nuevo) la versión WebP del banner.
+    Regresa la ruta optimizada, o None si el original no existe.
+    """
+    original = APP_DIR / BANNERS[nombre]
+    if not original.exists():
+        return None
+
+    destino = ruta_optimizada(nombre)
+    with _lock:
+        if not forzar and destino.exists() and destino.stat().st_mtime >= original.stat().st_mtime:
+            return destino
+
+        from PIL import Image
+
+        with Image.open(original) as im:
+            im = im.convert("RGB")
+            # Sólo se reduce: el banner se muestra con object-fit: cover
+            escala = min(1.0, ANCHO_MAX / im.width, ALTO_MAX / im.height)
+            if escala < 1.0:
+                im = im.resize(
+                    (round(im.width * escala), round(im.height * escala)),
+                    Image.Resampling.LANCZOS,
+                )
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            tmp = destino.with_suffix(".tmp")
+            im.save(tmp, format="WEBP", quality=CALIDAD, method=6)
+            tmp.replace(destino)
+    return destino
+
+
+@functools.lru_cache(maxsize=None)
+def data_uri(nombre: str) -> str | None:
+    """
+    data URI (base64) del banner optimizado, calculado una vez por proceso.
+    Si no se puede optimizar (sin Pillow, disco de sólo lectura...) se usa
+    el original tal cual.
+    """
+    try:
+        ruta, mime = optimizar(nombre), "image/webp"
+    except Exception:
+        ruta, mime = APP_DIR / BANNERS[nombre], "image/jpeg"
+    if ruta is None or not ruta.exists():
+        return None
+    return f"data:{mime};base64,{base64.b64encode(ruta.read_bytes()).decode('ascii')}"
+
+
+def main() -> None:
+    for nombre, archivo in BANNERS.items():
+        destino = optimizar(nombre, forzar=True)
+        if destino is None:
+            print(f"{archivo}: no existe")
+            continue
+        antes = (APP_DIR / archivo).stat().st_size
+        despues = destino.stat().st_size
+        print(f"{archivo}: {antes / 1024:.1f} KB -> {destino.name}: {despues / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Caché en memoria para las llamadas de datos del dashboard.
+
+Cada función envuelta con @cached guarda sus resultados por argumentos con:
+- TTL por fuente (fijo o calculado a partir de los argumentos),
+- tamaño acotado con desalojo LRU,
+- stale-while-revalidate: vencido el TTL se regresa el valor anterior de
+  inmediato y se refresca en un hilo de fondo,
+- los refrescos de fondo salen con prioridad baja en el limitador de
+  peticiones (app/data_sources/limitador.py),
+- un resultado que es copia de respaldo (df.attrs['respaldo'], ver
+  app/data_sources/instantanea.py) se guarda ya vencido: la siguiente
+  llamada lo sirve y busca el dato fresco en segundo plano,
+- single-flight: el caché es del proceso (lo comparten todas las sesiones de
+  Streamlit) y si ya hay una petición en curso para la misma clave, las demás
+  llamadas esperan ese mismo resultado en lugar de salir a la fuente. Así la
+  carga sobre Banxico / FRED / Yahoo no crece con el número de usuarios.
+
+Los aciertos / fallos / valores vencidos / esperas a una petición en curso se
+cuentan en app.metricas como 'cache.<función>'.
+"""
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from app import metricas
+
+log = logging.getLogger(__name__)
+
+
+def _normalizar(firma: inspect.Signature, args, kwargs) -> tuple[tuple, dict]:
+    """
+    Argumentos como los recibe la función (con sus valores por defecto): la
+    misma llamada hecha con posicionales o con nombres da la misma clave y
+    el mismo TTL.
+    """
+    ligados = firma.bind(*args, **kwargs)
+    ligados.apply_defaults()
+    return ligados.args, ligados.kwargs
+
+
+def _clave(args, kwargs):
+    return args, tuple(sorted(kwargs.items()))
+
+
+class _Vuelo:
+    """Petición en curso para una clave; quienes llegan después esperan 'listo'."""
+    __slots__ = ("listo", "valor", "error")
+
+    def __init__(self):
+        self.listo = threading.Event()
+        self.valor = None
+        self.error: BaseException | None = None
+
+
+def cached(ttl_seg, maxsize: int = 64):
+    """
+    Decorador de caché TTL + LRU + stale-while-revalidate + single-flight.
+
+    'ttl_seg' puede ser un número o una función que recibe los mismos
+    argumentos que la función envuelta y regresa el TTL en segundos.
+    """
+    def decorador(fn):
+        entradas: OrderedDict = OrderedDict()   # clave -> (valor, guardado)
+        en_vuelo: dict = {}                      # clave -> _Vuelo
+        lock = threading.Lock()
+        nombre = f"cache.{fn.__name__}"
+        firma = inspect.signature(fn)
+
+        def _ttl(args, kwargs) -> float:
+            return ttl_seg(*args, **kwargs) if callable(ttl_seg) else ttl_seg
+
+        def _guardar(clave, valor):
+            respaldo = bool(getattr(valor, "attrs", {}).get("respaldo"))
+            with lock:
+                entradas[clave] = (valor, 0.0 if respaldo else time.time())
+                entradas.move_to_end(clave)
+                while len(entradas) > maxsize:
+                    entradas.popitem(last=False)
+
+        def _volar(clave, vuelo, args, kwargs):
+            """Hace la petición de 'vuelo' y despierta a quienes la esperan."""
+            try:
+                vuelo.valor = fn(*args, **kwargs)
+                _guardar(clave, vuelo.valor)
+                return vuelo.valor
+            except BaseException as e:
+                vuelo.error = e
+                raise
+            finally:
+                with lock:
+                    en_vuelo.pop(clave, None)
+                vuelo.listo.set()
+
+        def _refrescar(clave, vuelo, args, kwargs):
+            from app.data_sources import limitador
+
+            try:
+                with limitador.prioridad(limitador.PRIORIDAD_FONDO):
+                    _volar(clave, vuelo, args, kwargs)
+            except Exception:
+                # Conservamos el valor viejo; se reintenta en la siguiente llamada
+                log.exception("Falló el refresco en segundo plano de %s", fn.__name__)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            args, kwargs = _normalizar(firma, args, kwargs)
+            clave = _clave(args, kwargs)
+            with lock:
+                entrada = entradas.get(clave)
+                if entrada is not None:
+                    entradas.move_to_end(clave)
+                    vuelo, propio = None, False
+                else:
+                    vuelo = en_vuelo.get(clave)
+                    propio = vuelo is None
+                    if propio:
+                        vuelo = en_vuelo[clave] = _Vuelo()
+
+            if entrada is None:
+                if propio:
+                    metricas.contar_cache(nombre, "miss")
+                    return _volar(clave, vuelo, args, kwargs)
+                # Otra sesión ya la está pidiendo: esperamos su resultado
+                metricas.contar_cache(nombre, "coalesced")
+                vuelo.listo.wait()
+                if vuelo.error is not None:
+                    raise vuelo.error
+                return vuelo.valor
+
+            valor, guardado = entrada
+            if time.time() - guardado > _ttl(args, kwargs):
+                metricas.contar_cache(nombre, "stale")
+                with lock:
+                    lanzar = clave not in en_vuelo
+                    if lanzar:
+                        vuelo = en_vuelo[clave] = _Vuelo()
+                if lanzar:
+                    threading.Thread(
+                        target=_refrescar, args=(clave, vuelo, args, kwargs), daemon=True
+                    ).start()
+            else:
+                metricas.contar_cache(nombre, "hit")
+            return valor
+
+        def cache_clear():
+            with lock:
+                entradas.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorador
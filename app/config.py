@@ -0,0 +1,36 @@
+"""
+Configuración por variables de entorno.
+
+El archivo .env de la raíz del proyecto se carga una sola vez por proceso y
+sólo cuando algún módulo pide su primera variable (antes cada fuente de datos
+llamaba a load_dotenv al importarse). Las variables ya definidas en el
+entorno tienen prioridad sobre las del .env.
+"""
+import os
+import threading
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]   # Economic_Dashboard/
+ENV_PATH = ROOT_DIR / ".env"
+
+_cargado = False
+_lock = threading.Lock()
+
+
+def cargar_env() -> None:
+    global _cargado
+    if _cargado:
+        return
+    with _lock:
+        if _cargado:
+            return
+        if ENV_PATH.exists():
+            from dotenv import load_dotenv
+            load_dotenv(dotenv_path=ENV_PATH)
+        _cargado = True
+
+
+def getenv(nombre: str, default: str | None = None) -> str | None:
+    """os.getenv, habiendo cargado antes el .env del proyecto."""
+    cargar_env()
+    return os.getenv(nombre, default)
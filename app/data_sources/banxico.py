@@ -1,30 +1,102 @@
-import os
-from pathlib import Path
+import csv
 import datetime as dt
+from pathlib import Path
 
-import requests
+import numpy as np
 import pandas as pd
-from dotenv import load_dotenv
-
-# Ruta explícita al .env en la raíz del proyecto
-ROOT_DIR = Path(__file__).resolve().parents[2]   # Economic_Dashboard/
-ENV_PATH = ROOT_DIR / ".env"
-load_dotenv(dotenv_path=ENV_PATH)
-
-BASE_URL = "https://www.banxico.org.mx/SieAPIRest/service/v1/series"
-BANXICO_TOKEN = os.getenv("BANXICO_TOKEN")
-
-SERIES_IDS = {
-    "tasa_objetivo": "SF61745",
-    "tiie_fondeo": "SF331451",
-    "tiie_28": "SF43783",
-    "cetes_28": "SF60633",
-    "fix": "SF43718",
-    "reservas": "SF43707",
-    # OJO: aquí deben estar tus quincenales correctas:
-    "inflacion_general": "SP74833",
-    "inflacion_subyacente": "SP74834",
-    "udis": "SP68257",
+
+from app import config, metricas
+from app.data_sources import http_client, lector_sie, paralelo, parseo, store
+
+# Se puede apuntar a otro servidor (p. ej. el de réplica de benchmarks/)
+BASE_URL = config.getenv("BANXICO_BASE_URL", "https://www.banxico.org.mx/SieAPIRest/service/v1/series")
+BANXICO_TOKEN = config.getenv("BANXICO_TOKEN")
+
+# Catálogo de series (clave, serie_id, frecuencia): por defecto el CSV junto a
+# este módulo; BANXICO_CATALOGO apunta a otro (p. ej. con cientos de series).
+CATALOGO = Path(config.getenv("BANXICO_CATALOGO") or Path(__file__).with_name("catalogo_banxico.csv"))
+
+# SIE acepta hasta 20 series por consulta: los ids se parten en lotes de
+# LOTE_MAX que se piden a la vez (a lo más LOTES_SIMULTANEOS); el limitador
+# de peticiones reparte entre ellos la cuota del token.
+LOTE_MAX = int(config.getenv("BANXICO_LOTE_MAX", "20"))
+LOTES_SIMULTANEOS = int(config.getenv("BANXICO_LOTES_SIMULTANEOS", "8"))
+
+# Rangos de historia: la respuesta se lee en flujo (lector_sie.py) directo a
+# arreglos por serie, sin resp.json(); BANXICO_FLUJO=0 vuelve a resp.json().
+FLUJO = (config.getenv("BANXICO_FLUJO", "1") or "").strip().lower() not in ("0", "false", "no")
+
+# Series de inflación: SIE las publica como decimal y se pintan en %
+_INFLACION = ("inflacion_general", "inflacion_subyacente")
+
+# Días finales de cada rango guardado que se vuelven a pedir (una vez vencido
+# REFRESCO_SEG de su frecuencia) para recoger datos publicados tarde o revisados.
+RELECTURA_DIAS = 7
+
+# Días hacia atrás suficientes para encontrar al menos un dato publicado
+_VENTANA_DIAS = {
+    "diaria": 15,
+    "semanal": 35,
+    "quincenal": 60,
+    "mensual": 100,
+    "trimestral": 200,
+}
+
+# Días (naturales) entre dos publicaciones; 'diaria' cuenta fines de semana
+_PERIODO_DIAS = {
+    "diaria": 2,
+    "semanal": 7,
+    "quincenal": 16,
+    "mensual": 31,
+    "trimestral": 92,
+}
+
+# Cada cuánto se refresca la cola de una serie según su frecuencia (segundos).
+# Lo usan el almacén local (TTL de relectura) y el worker de ingesta.
+REFRESCO_SEG = {
+    "diaria": 3600,
+    "semanal": 3 * 3600,
+    "quincenal": 3 * 3600,
+    "mensual": 6 * 3600,
+    "trimestral": 12 * 3600,
+}
+
+
+
+def _leer_catalogo(ruta: Path) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    CSV con columnas clave, serie_id, frecuencia (las líneas con '#' son
+    comentarios) -> (SERIES_IDS, FRECUENCIAS).
+    """
+    with open(ruta, encoding="utf-8", newline="") as f:
+        filas = list(csv.DictReader(l for l in f if l.strip() and not l.lstrip().startswith("#")))
+
+    ids, frecuencias = {}, {}
+    for fila in filas:
+        clave = (fila.get("clave") or "").strip()
+        serie_id = (fila.get("serie_id") or "").strip()
+        frecuencia = (fila.get("frecuencia") or "mensual").strip()
+        if not clave or not serie_id:
+            raise ValueError(f"{ruta}: fila sin clave o serie_id: {fila}")
+        if clave in ids:
+            raise ValueError(f"{ruta}: clave repetida: {clave}")
+        if frecuencia not in _PERIODO_DIAS:
+            raise ValueError(f"{ruta}: frecuencia no válida para {clave}: {frecuencia}")
+        ids[clave] = serie_id
+        frecuencias[clave] = frecuencia
+    return ids, frecuencias
+
+
+# clave -> id de SIE, y frecuencia de publicación (define la ventana del fallback)
+SERIES_IDS, FRECUENCIAS = _leer_catalogo(CATALOGO)
+
+# Observaciones por año de cada frecuencia (reserva de arreglos al leer en flujo)
+_OBS_POR_ANIO = {
+    "diaria": 261,
+    "semanal": 52,
+    "quincenal": 24,
+    "mensual": 12,
+    "trimestral": 4,
 }
 
 _MESES = {
@@ -33,21 +105,54 @@ _MESES = {
 }
 
 
-def _banxico_request(url: str):
+def _headers() -> dict:
     if not BANXICO_TOKEN:
         raise RuntimeError("No se encontró BANXICO_TOKEN. Revisa tu archivo .env.")
-    headers = {"Bmx-Token": BANXICO_TOKEN}
-    resp = requests.get(url, headers=headers, timeout=15)
+    return {"Bmx-Token": BANXICO_TOKEN}
+
+
+def _banxico_request(url: str):
+    resp = http_client.get("banxico", url, headers=_headers())
+    resp.raise_for_status()
+    data = resp.json()
+    return data["bmx"]["series"]
+
+
+async def _banxico_request_async(url: str):
+    resp = await http_client.aget("banxico", url, headers=_headers())
     resp.raise_for_status()
     data = resp.json()
     return data["bmx"]["series"]
 
 
-def _parse_fecha_ddmmyyyy(fecha_str: str) -> dt.date | None:
-    try:
-        return dt.datetime.strptime(fecha_str, "%d/%m/%Y").date()
-    except Exception:
-        return None
+def _datos_a_frame(clave: str, datos: list[dict]) -> pd.DataFrame:
+    """
+    Convierte serie_dict['datos'] a DataFrame (fecha, valor) en bloque:
+    fechas y números se convierten vectorizados y 'N/E' / vacíos quedan fuera.
+    """
+    with metricas.medir("parseo.banxico"):
+        fechas = parseo.fechas_ddmmyyyy([obs.get("fecha") or "" for obs in datos])
+        valores = parseo.valores_a_float([obs.get("dato") or "" for obs in datos], nulos=("N/E",))
+        return _arreglos_a_frame(clave, fechas, valores)
+
+
+def _arreglos_a_frame(clave: str, fechas: np.ndarray, valores: np.ndarray) -> pd.DataFrame:
+    """
+    Arreglos ya convertidos (datetime64[ns], float64) -> DataFrame (fecha, valor)
+    sin NaN / NaT y ordenado. Trabaja sobre los mismos arreglos: a lo más una
+    copia al quitar faltantes y otra si vienen desordenados.
+    """
+    # Inflación quincenal: decimal -> porcentaje
+    if clave in _INFLACION:
+        np.multiply(valores, 100.0, out=valores, where=valores < 1.0)
+
+    validos = ~np.isnat(fechas) & ~np.isnan(valores)
+    if not validos.all():
+        fechas, valores = fechas[validos], valores[validos]
+    if len(fechas) > 1 and (fechas[1:] < fechas[:-1]).any():
+        orden = np.argsort(fechas, kind="stable")
+        fechas, valores = fechas[orden], valores[orden]
+    return pd.DataFrame({"fecha": fechas, "valor": valores}, copy=False)
 
 
 def _format_fecha_portal(fecha: dt.date) -> str:
@@ -62,151 +167,403 @@ def _format_rango_inflacion_portal(fecha: dt.date) -> str:
     return f"{q} {mes} - {fecha.year - 1} a {q} {mes} - {fecha.year}"
 
 
+def _ventana_dias(clave: str, n: int = 1) -> int:
+    """Días hacia atrás para cubrir los últimos 'n' datos publicados de la serie."""
+    frecuencia = FRECUENCIAS.get(clave, "mensual")
+    return _VENTANA_DIAS[frecuencia] + (n - 1) * _PERIODO_DIAS[frecuencia]
+
+
+def refresco_seg(clave: str) -> int:
+    return REFRESCO_SEG[FRECUENCIAS.get(clave, "mensual")]
+
+
+def _hoy_mx() -> dt.date:
+    from zoneinfo import ZoneInfo
+
+    return dt.datetime.now(ZoneInfo("America/Mexico_City")).date()
+
+
+# ---------- Lotes de series ----------
+
+def _lotes(claves: dict[str, str]) -> list[dict[str, str]]:
+    """Parte {clave: serie_id} en lotes de a lo más LOTE_MAX series (una consulta cada uno)."""
+    items = list(claves.items())
+    return [dict(items[i:i + LOTE_MAX]) for i in range(0, len(items), LOTE_MAX)]
+
+
+def _url_lote(lote: dict[str, str], tramo: str) -> str:
+    return f"{BASE_URL}/{','.join(lote.values())}/datos/{tramo}"
+
+
+def _pedir_lotes(urls: list[str]) -> list:
+    """Una consulta por URL, a la vez: la lista de series de cada respuesta o la excepción."""
+    return paralelo.a_la_vez([lambda u=u: _banxico_request(u) for u in urls], LOTES_SIMULTANEOS)
+
+
+async def _pedir_lotes_async(urls: list[str]) -> list:
+    """Igual que _pedir_lotes, en el event loop (a lo más LOTES_SIMULTANEOS a la vez)."""
+    return await paralelo.a_la_vez_async(
+        [lambda u=u: _banxico_request_async(u) for u in urls], LOTES_SIMULTANEOS,
+    )
+
+
+def _propagar_error(respuestas: list) -> None:
+    for r in respuestas:
+        if isinstance(r, BaseException):
+            raise r
+
+
+def _sin_errores(respuestas: list) -> list[dict]:
+    """Series de todas las respuestas en una lista; propaga el primer error."""
+    _propagar_error(respuestas)
+    return [s for r in respuestas for s in r or []]
+
+
+# ---------- Último dato de todo el catálogo ----------
+
+def _urls_oportuno() -> list[str]:
+    return [_url_lote(lote, "oportuno") for lote in _lotes(SERIES_IDS)]
+
+
+def _arreglos_latest() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(fecha, valor, titulo) vacíos, una posición por serie en el orden de SERIES_IDS."""
+    n = len(SERIES_IDS)
+    return (
+        np.full(n, np.datetime64("NaT"), dtype="datetime64[D]"),
+        np.full(n, np.nan, dtype=np.float64),
+        np.array(list(SERIES_IDS), dtype=object),
+    )
+
+
+def _llenar_ultimos(raw_series: list[dict], hoy: dt.date, fecha: np.ndarray, valor: np.ndarray, titulo: np.ndarray) -> None:
+    """
+    Último dato válido (<= hoy) de cada serie de la respuesta, en su posición
+    de fecha / valor / titulo. Las observaciones de todas las series se
+    parsean juntas y el último por serie se toma con un solo ordenamiento.
+    """
+    posicion = {serie_id: i for i, serie_id in enumerate(SERIES_IDS.values())}
+    textos_fecha, textos_dato, conteos, indices = [], [], [], []
+    for s in raw_series or []:
+        i = posicion.get(s.get("idSerie"))
+        if i is None:
+            continue
+        if s.get("titulo"):
+            titulo[i] = s["titulo"]
+        datos = s.get("datos") or []
+        textos_fecha.extend(obs.get("fecha") or "" for obs in datos)
+        textos_dato.extend(obs.get("dato") or "" for obs in datos)
+        indices.append(i)
+        conteos.append(len(datos))
+    if not textos_fecha:
+        return
+
+    with metricas.medir("parseo.banxico"):
+        idx = np.repeat(np.array(indices), conteos)
+        f = parseo.fechas_ddmmyyyy(textos_fecha).astype("datetime64[D]")
+        v = parseo.valores_a_float(textos_dato, nulos=("N/E",))
+
+        # Inflación quincenal: decimal -> porcentaje
+        inflacion = np.array([c in _INFLACION for c in SERIES_IDS])[idx]
+        v = np.where(inflacion & (v < 1.0), v * 100.0, v)
+
+        ok = ~np.isnat(f) & ~np.isnan(v) & (f <= np.datetime64(hoy, "D"))
+        idx, f, v = idx[ok], f[ok], v[ok]
+        orden = np.lexsort((f, idx))            # por serie y, dentro, por fecha (estable)
+        idx, f, v = idx[orden], f[orden], v[orden]
+        ultimo = np.r_[idx[1:] != idx[:-1], True] if len(idx) else np.zeros(0, dtype=bool)
+        fecha[idx[ultimo]] = f[ultimo]
+        valor[idx[ultimo]] = v[ultimo]
+
+
+def _urls_fallback(pendientes: dict[str, str], hoy: dt.date) -> list[str]:
+    """
+    Si 'oportuno' no trae dato, intentamos con rango: las series pendientes,
+    ordenadas por ventana, van en lotes de LOTE_MAX (ids separados por coma,
+    igual que oportuno) con la ventana de publicación más larga del lote.
+    """
+    ordenadas = dict(sorted(pendientes.items(), key=lambda kv: _ventana_dias(kv[0])))
+    end = hoy.strftime("%Y-%m-%d")
+    urls = []
+    for lote in _lotes(ordenadas):
+        dias = max(_ventana_dias(clave) for clave in lote)
+        start = (hoy - dt.timedelta(days=dias)).strftime("%Y-%m-%d")
+        urls.append(_url_lote(lote, f"{start}/{end}"))
+    return urls
+
+
+def _pendientes(fecha: np.ndarray) -> dict[str, str]:
+    return {
+        clave: serie_id
+        for (clave, serie_id), falta in zip(SERIES_IDS.items(), np.isnat(fecha))
+        if falta
+    }
+
+
+def _filas_latest(fecha: np.ndarray, valor: np.ndarray, titulo: np.ndarray) -> pd.DataFrame:
+    """Tabla de tarjetas armada por columnas desde los arreglos de _llenar_ultimos."""
+    claves = list(SERIES_IDS)
+    fechas = fecha.tolist()      # datetime.date, o None si la serie no tuvo dato
+    etiquetas = [
+        "" if f is None
+        else _format_rango_inflacion_portal(f) if clave in _INFLACION
+        else _format_fecha_portal(f)
+        for clave, f in zip(claves, fechas)
+    ]
+    return pd.DataFrame({
+        "clave": claves,
+        "serie_id": list(SERIES_IDS.values()),
+        "nombre": titulo,
+        "fecha": pd.Series(fechas, dtype=object),
+        "valor": valor,
+        "fecha_label": etiquetas,
+    })
+
+
 def get_latest_all() -> pd.DataFrame:
     """
     Trae el último dato DISPONIBLE (<= hoy) de todas las series en SERIES_IDS.
     Además devuelve 'fecha_label' para pintar debajo de la tarjeta (estilo portal).
+
+    Las series van en lotes de LOTE_MAX ids pedidos a la vez: el tiempo crece
+    con el número de lotes, no con el de series.
     """
+    hoy = _hoy_mx()
+    fecha, valor, titulo = _arreglos_latest()
 
-    from zoneinfo import ZoneInfo
+    # 1) Primero: oportuno para todas
+    _llenar_ultimos(_sin_errores(_pedir_lotes(_urls_oportuno())), hoy, fecha, valor, titulo)
 
-    hoy = dt.datetime.now(ZoneInfo("America/Mexico_City")).date()
-
-    def _ultimo_valido_desde_lista_datos(clave: str, datos: list[dict]) -> tuple[dt.date, float] | None:
-        """Recibe serie_dict['datos'] y regresa (fecha, valor) del último dato válido <= hoy."""
-        obs_validas = []
-        for obs in datos or []:
-            f = _parse_fecha_ddmmyyyy(obs.get("fecha", ""))
-            if f is None or f > hoy:
-                continue
-
-            vraw = obs.get("dato", "")
-            if vraw in ("N/E", "", None):
-                continue
-
-            try:
-                v = float(str(vraw).replace(",", ""))
-            except Exception:
-                continue
-
-            # Inflación quincenal: decimal -> porcentaje
-            if clave in ("inflacion_general", "inflacion_subyacente") and v < 1.0:
-                v = v * 100.0
-
-            obs_validas.append((f, v))
-
-        if not obs_validas:
-            return None
-
-        obs_validas.sort(key=lambda x: x[0])
-        return obs_validas[-1]
-
-    def _fallback_rango(clave: str, serie_id: str) -> tuple[dt.date, float] | None:
-        """
-        Si 'oportuno' no trae dato, intentamos con rango:
-        tomamos el último dato disponible de los últimos 2 años.
-        """
-        start = (hoy.replace(year=hoy.year - 2)).strftime("%Y-%m-%d")
-        end = hoy.strftime("%Y-%m-%d")
-        url_rango = f"{BASE_URL}/{serie_id}/datos/{start}/{end}"
-        raw = _banxico_request(url_rango)
-        if not raw:
-            return None
-        return _ultimo_valido_desde_lista_datos(clave, raw[0].get("datos", []))
+    # 2) Fallback (en lotes) para las que no tuvieron nada válido
+    pendientes = _pendientes(fecha)
+    if pendientes:
+        raw = _sin_errores(_pedir_lotes(_urls_fallback(pendientes, hoy)))
+        _llenar_ultimos(raw, hoy, fecha, valor, titulo)
 
-    # 1) Primero: oportuno para todas
-    ids = ",".join(SERIES_IDS.values())
-    url = f"{BASE_URL}/{ids}/datos/oportuno"
-    raw_series = _banxico_request(url)
-    series_by_id = {s["idSerie"]: s for s in raw_series}
-
-    rows = []
-
-    for clave, serie_id in SERIES_IDS.items():
-        serie_dict = series_by_id.get(serie_id)
-
-        nombre = (serie_dict or {}).get("titulo", clave)
-
-        ultimo = None
-        if serie_dict is not None:
-            ultimo = _ultimo_valido_desde_lista_datos(clave, serie_dict.get("datos", []))
-
-        # 2) Fallback si no hubo nada válido
-        if ultimo is None:
-            ultimo = _fallback_rango(clave, serie_id)
-
-        if ultimo is None:
-            rows.append(
-                {
-                    "clave": clave,
-                    "serie_id": serie_id,
-                    "nombre": nombre,
-                    "fecha": None,
-                    "valor": None,
-                    "fecha_label": "",
-                }
-            )
-            continue
+    return _filas_latest(fecha, valor, titulo)
 
-        fecha_ult, valor_ult = ultimo
 
-        if clave in ("inflacion_general", "inflacion_subyacente"):
-            fecha_label = _format_rango_inflacion_portal(fecha_ult)
-        else:
-            fecha_label = _format_fecha_portal(fecha_ult)
+async def get_latest_all_async() -> pd.DataFrame:
+    """Igual que get_latest_all, con el cliente HTTP asíncrono."""
+    hoy = _hoy_mx()
+    fecha, valor, titulo = _arreglos_latest()
 
-        rows.append(
-            {
-                "clave": clave,
-                "serie_id": serie_id,
-                "nombre": nombre,
-                "fecha": fecha_ult,
-                "valor": valor_ult,
-                "fecha_label": fecha_label,
-            }
-        )
+    _llenar_ultimos(_sin_errores(await _pedir_lotes_async(_urls_oportuno())), hoy, fecha, valor, titulo)
 
-    return pd.DataFrame(rows)
+    pendientes = _pendientes(fecha)
+    if pendientes:
+        raw = _sin_errores(await _pedir_lotes_async(_urls_fallback(pendientes, hoy)))
+        _llenar_ultimos(raw, hoy, fecha, valor, titulo)
 
+    return _filas_latest(fecha, valor, titulo)
 
-def get_series_history(clave: str, start: str = "2015-01-01", end: str | None = None) -> pd.DataFrame:
+
+def _url_latest_n(clave: str, n: int) -> tuple[str, dt.date]:
+    if clave not in SERIES_IDS:
+        raise KeyError(f"Clave no válida: {clave}")
+    hoy = _hoy_mx()
+    start = hoy - dt.timedelta(days=_ventana_dias(clave, n))
+    return _url_lote({clave: SERIES_IDS[clave]}, f"{start.isoformat()}/{hoy.isoformat()}"), hoy
+
+
+def _ultimos_n(clave: str, raw_series: list, hoy: dt.date, n: int) -> pd.DataFrame:
+    df = _datos_a_frame(clave, (raw_series or [{}])[0].get("datos") or [])
+    df = df[df["fecha"] <= pd.Timestamp(hoy)]
+    return df.tail(n).reset_index(drop=True)
+
+
+def get_latest_n(clave: str, n: int) -> pd.DataFrame:
     """
-    Devuelve serie de tiempo para una clave de SERIES_IDS entre start y end.
+    Sólo los últimos 'n' datos (<= hoy en Ciudad de México) de una clave de
+    SERIES_IDS, pidiendo a SIE una ventana del tamaño de su frecuencia en
+    lugar de la historia.
     Regresa DataFrame con columnas: fecha (datetime), valor (float)
     """
+    url, hoy = _url_latest_n(clave, n)
+    return _ultimos_n(clave, _banxico_request(url), hoy, n)
+
+
+async def get_latest_n_async(clave: str, n: int) -> pd.DataFrame:
+    url, hoy = _url_latest_n(clave, n)
+    return _ultimos_n(clave, await _banxico_request_async(url), hoy, n)
+
+
+def _huecos(clave: str, start: str, end: str | None) -> tuple[dt.date, dt.date, list]:
     if clave not in SERIES_IDS:
         raise KeyError(f"Clave no válida: {clave}")
+    if end is None:
+        end = dt.date.today().strftime("%Y-%m-%d")
+
+    inicio = dt.date.fromisoformat(start)
+    fin = dt.date.fromisoformat(end)
+
+    huecos = store.rangos_faltantes(
+        "banxico", clave, inicio, fin,
+        relectura_dias=RELECTURA_DIAS, ttl_seg=refresco_seg(clave),
+    )
+    return inicio, fin, huecos
 
-    serie_id = SERIES_IDS[clave]
+
+def _planear(claves: list[str], start: str, end: str | None) -> tuple[dt.date, dt.date, list]:
+    """
+    Huecos de todas las claves agrupados: las que tienen el mismo hueco (lo
+    normal: toda la historia en frío, la misma cola al refrescar) comparten
+    consultas de hasta LOTE_MAX ids. Regresa (inicio, fin, [(a, b, lote)]).
+    """
     if end is None:
         end = dt.date.today().strftime("%Y-%m-%d")
+    inicio, fin = dt.date.fromisoformat(start), dt.date.fromisoformat(end)
 
-    url = f"{BASE_URL}/{serie_id}/datos/{start}/{end}"
-    raw_series = _banxico_request(url)
+    por_hueco: dict[tuple, dict[str, str]] = {}
+    for clave in claves:
+        _, _, huecos = _huecos(clave, start, end)
+        for a, b in huecos:
+            por_hueco.setdefault((a, b), {})[clave] = SERIES_IDS[clave]
 
-    if not raw_series:
-        return pd.DataFrame(columns=["fecha", "valor"])
+    pedidos = [(a, b, lote) for (a, b), pendientes in por_hueco.items() for lote in _lotes(pendientes)]
+    return inicio, fin, pedidos
 
-    serie_dict = raw_series[0]
-    rows = []
 
-    for obs in serie_dict.get("datos", []):
-        vraw = obs.get("dato", "")
-        if vraw in ("N/E", "", None):
-            continue
+def _guardar_lote(raw_series: list[dict], lote: dict[str, str], a: dt.date, b: dt.date) -> None:
+    por_id = {s.get("idSerie"): s for s in raw_series or []}
+    for clave, serie_id in lote.items():
+        df = _datos_a_frame(clave, (por_id.get(serie_id) or {}).get("datos", []))
+        store.guardar("banxico", clave, df, a, b)
 
-        try:
-            v = float(str(vraw).replace(",", ""))
-        except Exception:
-            continue
 
-        # inflación: decimal -> porcentaje
-        if clave in ("inflacion_general", "inflacion_subyacente") and v < 1.0:
-            v = v * 100.0
+def _guardar_respuestas(pedidos: list, respuestas: list) -> None:
+    """Guarda los lotes que respondieron y después propaga el primer error."""
+    for (a, b, lote), raw in zip(pedidos, respuestas):
+        if not isinstance(raw, BaseException):
+            _guardar_lote(raw, lote, a, b)
+    _propagar_error(respuestas)
+
+
+def _urls_historia(pedidos: list) -> list[str]:
+    return [_url_lote(lote, f"{a.isoformat()}/{b.isoformat()}") for a, b, lote in pedidos]
+
+
+def _capacidades(lote: dict[str, str], a: dt.date, b: dt.date) -> dict[str, int]:
+    """Observaciones esperadas de cada serie en [a, b], para reservar sus arreglos."""
+    dias = (b - a).days + 1
+    return {
+        serie_id: dias * _OBS_POR_ANIO[FRECUENCIAS.get(clave, "mensual")] // 365 + 2
+        for clave, serie_id in lote.items()
+    }
+
+
+def _guardar_leida(a: dt.date, b: dt.date, faltan: dict[str, str], claves: dict[str, str], serie: tuple) -> None:
+    """Guarda una serie (idSerie, titulo, fechas, valores) leída en flujo y la quita de 'faltan'."""
+    serie_id, _, fechas, valores = serie
+    clave = claves.get(serie_id)
+    if clave is not None:
+        store.guardar("banxico", clave, _arreglos_a_frame(clave, fechas, valores), a, b)
+        faltan.pop(clave, None)
+
+
+def _cubrir_faltantes(a: dt.date, b: dt.date, faltan: dict[str, str]) -> None:
+    # Sólo se llama con la respuesta ya cerrada completa (lector_sie lanza si
+    # se corta): las series que no vinieron no tienen datos en el rango y éste
+    # queda cubierto (vacío), igual que antes
+    for clave in faltan:
+        store.guardar("banxico", clave, _datos_a_frame(clave, []), a, b)
+
+
+def _descargar_lote_flujo(a: dt.date, b: dt.date, lote: dict[str, str]) -> None:
+    """
+    Rango [a, b] de un lote leyendo la respuesta en flujo (lector_sie.py):
+    cada serie se convierte y se guarda en cuanto termina de llegar, así que
+    en memoria no hay más que sus arreglos.
+    """
+    claves = {serie_id: clave for clave, serie_id in lote.items()}
+    faltan = dict(lote)
+    url = _url_lote(lote, f"{a.isoformat()}/{b.isoformat()}")
+    # 'flujo.banxico': tiempo y bytes de la lectura (http.banxico no los ve con stream=True)
+    with metricas.medir("flujo.banxico") as m, http_client.get("banxico", url, headers=_headers(), stream=True) as resp:
+        resp.raise_for_status()
+
+        def _pedazos():
+            for pedazo in resp.iter_content(lector_sie.PEDAZO_BYTES):
+                m["bytes"] += len(pedazo)
+                yield pedazo
+
+        for serie in lector_sie.leer_series(_pedazos(), _capacidades(lote, a, b)):
+            _guardar_leida(a, b, faltan, claves, serie)
+    _cubrir_faltantes(a, b, faltan)
+
+
+async def _descargar_lote_flujo_async(a: dt.date, b: dt.date, lote: dict[str, str]) -> None:
+    """Igual que _descargar_lote_flujo con el cliente asíncrono (httpx, resp.aiter_bytes)."""
+    claves = {serie_id: clave for clave, serie_id in lote.items()}
+    faltan = dict(lote)
+    url = _url_lote(lote, f"{a.isoformat()}/{b.isoformat()}")
+    with metricas.medir("flujo.banxico") as m:
+        async with http_client.astream("banxico", url, headers=_headers()) as resp:
+            resp.raise_for_status()
+
+            async def _pedazos():
+                async for pedazo in resp.aiter_bytes(lector_sie.PEDAZO_BYTES):
+                    m["bytes"] += len(pedazo)
+                    yield pedazo
+
+            async for serie in lector_sie.aleer_series(_pedazos(), _capacidades(lote, a, b)):
+                _guardar_leida(a, b, faltan, claves, serie)
+    _cubrir_faltantes(a, b, faltan)
+
+
+def _descargar(pedidos: list) -> None:
+    """Baja y guarda los pedidos (a, b, lote) a la vez; después propaga el primer error."""
+    if FLUJO:
+        _propagar_error(paralelo.a_la_vez(
+            [lambda p=p: _descargar_lote_flujo(*p) for p in pedidos], LOTES_SIMULTANEOS,
+        ))
+    else:
+        _guardar_respuestas(pedidos, _pedir_lotes(_urls_historia(pedidos)))
+
+
+async def _descargar_async(pedidos: list) -> None:
+    if FLUJO:
+        fabricas = [lambda p=p: _descargar_lote_flujo_async(*p) for p in pedidos]
+        _propagar_error(await paralelo.a_la_vez_async(fabricas, LOTES_SIMULTANEOS))
+    else:
+        _guardar_respuestas(pedidos, await _pedir_lotes_async(_urls_historia(pedidos)))
+
+
+def actualizar_lote(claves: list[str], start: str = "2015-01-01", end: str | None = None) -> None:
+    """
+    Descarga al almacén local los huecos (o la cola vencida) de varias claves:
+    en lotes de hasta LOTE_MAX series, todos a la vez. Lo usa el worker.
+    """
+    _, _, pedidos = _planear(list(dict.fromkeys(claves)), start, end)
+    _descargar(pedidos)
+
+
+def get_series_history_lote(claves: list[str], start: str = "2015-01-01", end: str | None = None) -> dict[str, pd.DataFrame]:
+    """get_series_history de varias claves a la vez: {clave: DataFrame(fecha, valor)}."""
+    claves = list(dict.fromkeys(claves))
+    inicio, fin, pedidos = _planear(claves, start, end)
+    _descargar(pedidos)
+    return {clave: store.leer("banxico", clave, inicio, fin) for clave in claves}
+
+
+async def get_series_history_lote_async(claves: list[str], start: str = "2015-01-01", end: str | None = None) -> dict[str, pd.DataFrame]:
+    """Igual que get_series_history_lote, con el cliente HTTP asíncrono."""
+    claves = list(dict.fromkeys(claves))
+    inicio, fin, pedidos = _planear(claves, start, end)
+    await _descargar_async(pedidos)
+    return {clave: store.leer("banxico", clave, inicio, fin) for clave in claves}
+
+
+def get_series_history(clave: str, start: str = "2015-01-01", end: str | None = None) -> pd.DataFrame:
+    """
+    Devuelve serie de tiempo para una clave de SERIES_IDS entre start y end.
+    Regresa DataFrame con columnas: fecha (datetime), valor (float)
+
+    Las observaciones se guardan en el almacén local (store.py): a SIE sólo se
+    le piden los huecos o la cola que falten y el rango se lee desde disco.
+    """
+    return get_series_history_lote([clave], start, end)[clave]
 
-        rows.append((obs.get("fecha", ""), v))
 
-    df = pd.DataFrame(rows, columns=["fecha", "valor"])
-    df["fecha"] = pd.to_datetime(df["fecha"], dayfirst=True, errors="coerce")
-    df = df.dropna(subset=["fecha"]).sort_values("fecha")
-    return df
+async def get_series_history_async(clave: str, start: str = "2015-01-01", end: str | None = None) -> pd.DataFrame:
+    """Igual que get_series_history; los huecos se piden a SIE al mismo tiempo."""
+    return (await get_series_history_lote_async([clave], start, end))[clave]
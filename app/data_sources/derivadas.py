@@ -0,0 +1,356 @@
+"""
+Series derivadas (indicadores calculados) sobre las series guardadas.
+
+Cada derivada se declara en DERIVADAS con una operación sobre una serie base
+de Banxico o FRED (y, para diferenciales, una segunda serie):
+- "yoy":         variación % contra el dato de hace 12 meses (as-of),
+- "mom":         variación % contra el dato del mes anterior (as-of),
+- "anualizada":  variación de 'meses' meses llevada a tasa anual compuesta,
+- "media_movil": media de las últimas 'ventana' observaciones,
+- "diferencial": base − 'menos', con 'menos' tomada as-of en cada fecha de la base.
+
+Las bases y las derivadas viven en memoria como arreglos de numpy (fecha en
+datetime64[D], valor float64). Cada base se revisa a lo más una vez por su
+REFRESCO_SEG pidiendo sólo la cola (la ventana de relectura / revisiones de
+su fuente) al almacén local; si cambió algo, cada derivada que depende de ella
+se recalcula vectorizada sólo desde la primera fecha que cambió. Entre
+revisiones, serie() / ultimas() son una búsqueda en los arreglos.
+"""
+import datetime as dt
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from app import config
+from app.data_sources import banxico, fred_api, instantanea
+
+DESDE = config.getenv("DERIVADAS_DESDE", "2015-01-01")
+
+DERIVADAS = {
+    "inflation_pce_yoy": {
+        "nombre": "Inflación PCE (% a/a)",
+        "op": "yoy",
+        "base": ("fred", "inflation_pce"),
+    },
+    "inflation_pce_mom": {
+        "nombre": "Inflación PCE (% m/m)",
+        "op": "mom",
+        "base": ("fred", "inflation_pce"),
+    },
+    "inflation_pce_3m_anualizada": {
+        "nombre": "Inflación PCE (3 meses anualizada)",
+        "op": "anualizada",
+        "base": ("fred", "inflation_pce"),
+        "meses": 3,
+    },
+    "fix_media_20": {
+        "nombre": "Tipo de cambio FIX (media móvil 20 días)",
+        "op": "media_movil",
+        "base": ("banxico", "fix"),
+        "ventana": 20,
+    },
+    "tasa_real_mx": {
+        "nombre": "Tasa real México (objetivo − inflación)",
+        "op": "diferencial",
+        "base": ("banxico", "tasa_objetivo"),
+        "menos": ("banxico", "inflacion_general"),
+    },
+    "diferencial_mx_eua": {
+        "nombre": "Diferencial de tasas Banxico − Fed",
+        "op": "diferencial",
+        "base": ("banxico", "tasa_objetivo"),
+        "menos": ("fred", "policy_rate"),
+    },
+}
+
+_VACIO = (np.array([], dtype="datetime64[D]"), np.array([], dtype=np.float64))
+
+
+# ---------- Operaciones (vectorizadas sobre las posiciones 'idx' de la base) ----------
+
+def _asof(fechas: np.ndarray, objetivo: np.ndarray) -> np.ndarray:
+    """Posición del último dato en o antes de cada fecha objetivo (-1 si no hay)."""
+    return np.searchsorted(fechas, objetivo, side="right") - 1
+
+
+def _hace_meses(fechas: np.ndarray, meses: int) -> np.ndarray:
+    return (pd.DatetimeIndex(fechas) - pd.DateOffset(months=meses)).to_numpy().astype("datetime64[D]")
+
+
+def _razon(base, idx, meses: int) -> np.ndarray:
+    f, v = base
+    j = _asof(f, _hace_meses(f[idx], meses))
+    previo = np.where(j >= 0, v[np.maximum(j, 0)], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return v[idx] / previo
+
+
+def _yoy(spec, base, menos, idx):
+    return (_razon(base, idx, 12) - 1.0) * 100.0
+
+
+def _mom(spec, base, menos, idx):
+    return (_razon(base, idx, 1) - 1.0) * 100.0
+
+
+def _anualizada(spec, base, menos, idx):
+    meses = spec.get("meses", 1)
+    with np.errstate(invalid="ignore"):
+        return (_razon(base, idx, meses) ** (12.0 / meses) - 1.0) * 100.0
+
+
+def _media_movil(spec, base, menos, idx):
+    w = spec["ventana"]
+    v = base[1]
+    if not len(idx):
+        return np.array([], dtype=np.float64)
+    # Suma acumulada sólo del tramo que hace falta (w - 1 datos antes del primero)
+    ini = max(int(idx[0]) - w + 1, 0)
+    acum = np.concatenate(([0.0], np.cumsum(v[ini:int(idx[-1]) + 1])))
+    fin = idx - ini + 1
+    desde = np.maximum(fin - w, 0)
+    media = (acum[fin] - acum[desde]) / w
+    return np.where(idx >= w - 1, media, np.nan)
+
+
+def _diferencial(spec, base, menos, idx):
+    f, v = base
+    fm, vm = menos
+    j = _asof(fm, f[idx])
+    return np.where(j >= 0, v[idx] - vm[np.maximum(j, 0)], np.nan)
+
+
+_OPERACIONES = {
+    "yoy": _yoy,
+    "mom": _mom,
+    "anualizada": _anualizada,
+    "media_movil": _media_movil,
+    "diferencial": _diferencial,
+}
+
+
+# ---------- Bases ----------
+
+def _relectura_dias(fuente: str) -> int:
+    return banxico.RELECTURA_DIAS if fuente == "banxico" else fred_api.REVISION_DIAS
+
+
+def _refresco_base(fuente: str, clave: str) -> int:
+    if fuente == "banxico":
+        return banxico.refresco_seg(clave)
+    return fred_api.refresco_seg(fred_api.FRED_SERIES[clave])
+
+
+def _leer_base(fuente: str, clave: str, start: str) -> pd.DataFrame:
+    """Serie base desde 'start' (almacén local + huecos; copia guardada si la fuente falla)."""
+    if fuente == "banxico":
+        return instantanea.con_respaldo(
+            "banxico", clave, start, None,
+            lambda: banxico.get_series_history(clave, start=start),
+        )
+    return instantanea.con_respaldo(
+        "fred", fred_api.FRED_SERIES[clave], start, None,
+        lambda: fred_api.get_time_series(clave, start=start),
+    )
+
+
+def _a_arreglos(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    df = df.dropna(subset=["valor"]).sort_values("fecha")
+    return (
+        df["fecha"].to_numpy().astype("datetime64[D]"),
+        df["valor"].to_numpy(dtype=np.float64),
+    )
+
+
+_lock = threading.RLock()
+_bases: dict[tuple, dict] = {}       # (fuente, clave) -> {fechas, valores, desde, revisado}
+_derivadas: dict[str, dict] = {}     # clave -> {fechas, valores, sucio_desde}
+
+
+def _dependientes(base: tuple) -> list[str]:
+    return [k for k, spec in DERIVADAS.items() if base in (spec["base"], spec.get("menos"))]
+
+
+def _marcar_sucias(base: tuple, desde: np.datetime64) -> None:
+    for k in _dependientes(base):
+        estado = _derivadas.setdefault(k, {"fechas": _VACIO[0], "valores": _VACIO[1], "sucio_desde": None})
+        previo = estado["sucio_desde"]
+        estado["sucio_desde"] = desde if previo is None else min(previo, desde)
+
+
+def _lectura_pendiente(base: tuple, desde: str) -> tuple[str, bool] | None:
+    """
+    Con _lock tomado: (fecha desde la que hay que leer la base, si es completa)
+    o None si está al día. Se trae completa si no está cargada (o se pide desde
+    antes de lo cargado); si ya venció su REFRESCO_SEG, sólo la cola.
+    """
+    fuente, clave = base
+    estado = _bases.get(base)
+    if estado is None or desde < estado["desde"]:
+        return desde, True
+
+    ahora = time.time()
+    if ahora - estado["revisado"] < _refresco_base(fuente, clave):
+        return None
+    estado["revisado"] = ahora     # otra llamada mientras tanto no la vuelve a pedir
+
+    f = estado["fechas"]
+    if not len(f):
+        return estado["desde"], False
+    return str(f[-1] - np.timedelta64(_relectura_dias(fuente), "D")), False
+
+
+def _empalmar_base(base: tuple, desde: str, inicio: str, completa: bool, df: pd.DataFrame) -> None:
+    """
+    Con _lock tomado: incorpora la lectura de la base y marca las derivadas
+    desde la primera fecha que cambió.
+    """
+    nf, nv = _a_arreglos(df)
+    estado = _bases.get(base)
+
+    if completa:
+        if estado is not None and estado["desde"] <= desde:
+            return      # otra llamada ya la trajo desde antes
+        _bases[base] = {"fechas": nf, "valores": nv, "desde": desde, "revisado": time.time()}
+        _marcar_sucias(base, np.datetime64(desde, "D"))
+        return
+    if estado is None:
+        return          # reiniciar() mientras se leía
+
+    f, v = estado["fechas"], estado["valores"]
+    corte = int(np.searchsorted(f, np.datetime64(inicio, "D")))
+    vf, vv = f[corte:], v[corte:]
+    n = min(len(vf), len(nf))
+    distintos = np.flatnonzero((vf[:n] != nf[:n]) | (vv[:n] != nv[:n]))
+    if len(distintos):
+        primero = int(distintos[0])
+    elif len(vf) != len(nf):
+        primero = n
+    else:
+        return      # sin cambios: las derivadas siguen valiendo
+
+    estado["fechas"] = np.concatenate((f[:corte], nf))
+    estado["valores"] = np.concatenate((v[:corte], nv))
+    cambio = nf[primero] if primero < len(nf) else vf[primero]
+    _marcar_sucias(base, cambio)
+
+
+def _recalcular(clave: str) -> None:
+    """Recalcula la derivada sólo desde 'sucio_desde' y la empalma con lo ya calculado."""
+    estado = _derivadas[clave]
+    desde = estado["sucio_desde"]
+    if desde is None:
+        return
+
+    spec = DERIVADAS[clave]
+    base = _bases[spec["base"]]
+    arreglos_base = (base["fechas"], base["valores"])
+    menos = spec.get("menos")
+    arreglos_menos = (_bases[menos]["fechas"], _bases[menos]["valores"]) if menos else _VACIO
+
+    idx = np.arange(int(np.searchsorted(arreglos_base[0], desde)), len(arreglos_base[0]))
+    nuevos = _OPERACIONES[spec["op"]](spec, arreglos_base, arreglos_menos, idx)
+    ok = np.isfinite(nuevos)
+
+    conservar = estado["fechas"] < desde
+    estado["fechas"] = np.concatenate((estado["fechas"][conservar], arreglos_base[0][idx][ok]))
+    estado["valores"] = np.concatenate((estado["valores"][conservar], nuevos[ok]))
+    estado["sucio_desde"] = None
+
+
+def _al_dia(clave: str, desde: str) -> dict:
+    spec = DERIVADAS[clave]
+    bases = [b for b in (spec["base"], spec.get("menos")) if b]
+    with _lock:
+        pendientes = {b: _lectura_pendiente(b, desde) for b in bases}
+
+    # Las lecturas (almacén y, si hay huecos, la fuente) van fuera del candado:
+    # las demás derivadas no esperan a esta descarga.
+    leidas = {b: _leer_base(*b, p[0]) for b, p in pendientes.items() if p is not None}
+
+    with _lock:
+        for b, df in leidas.items():
+            _empalmar_base(b, desde, *pendientes[b], df)
+        _derivadas.setdefault(clave, {"fechas": _VACIO[0], "valores": _VACIO[1], "sucio_desde": None})
+        _recalcular(clave)
+        estado = _derivadas[clave]
+        return {"fechas": estado["fechas"], "valores": estado["valores"]}
+
+
+# ---------- API ----------
+
+def _frecuencia_base(base: tuple) -> str:
+    fuente, clave = base
+    if fuente == "banxico":
+        return banxico.FRECUENCIAS.get(clave, "diaria")
+    return fred_api.FRECUENCIAS.get(fred_api.FRED_SERIES[clave], "mensual")
+
+
+def frecuencia(clave: str) -> str:
+    """Frecuencia de la derivada (la de su serie base)."""
+    return _frecuencia_base(DERIVADAS[clave]["base"])
+
+
+def _ventana_dias(clave: str, n: int) -> int:
+    """Días hacia atrás que cubren las últimas 'n' observaciones y lo que su operación mira antes."""
+    spec = DERIVADAS[clave]
+    # Días naturales entre observaciones por frecuencia (los de banxico)
+    periodo = banxico._PERIODO_DIAS.get(frecuencia(clave), 31)
+    antes = {
+        "yoy": 366,
+        "mom": 31,
+        "anualizada": 31 * spec.get("meses", 1),
+        "media_movil": periodo * spec.get("ventana", 1),
+        "diferencial": 2 * banxico._PERIODO_DIAS.get(_frecuencia_base(spec["menos"]), 31) if spec.get("menos") else 0,
+    }[spec["op"]]
+    # Dos periodos más por el rezago de publicación del último dato
+    return (n + 2) * periodo + antes
+
+
+def refresco_seg(clave: str) -> int:
+    spec = DERIVADAS[clave]
+    return min(_refresco_base(*b) for b in (spec["base"], spec.get("menos")) if b)
+
+
+def serie(clave: str, start: str | None = None, end: str | None = None) -> pd.DataFrame:
+    """
+    Derivada 'clave' entre start y end (YYYY-MM-DD).
+    Regresa DataFrame con columnas: fecha (datetime), valor (float)
+    """
+    if clave not in DERIVADAS:
+        raise KeyError(f"Derivada no válida: {clave}")
+    # Se carga un año antes para que yoy / medias tengan valor desde 'start'
+    desde = DESDE
+    if start is not None:
+        desde = min(desde, (dt.date.fromisoformat(start) - dt.timedelta(days=400)).isoformat())
+    estado = _al_dia(clave, desde)
+
+    f, v = estado["fechas"], estado["valores"]
+    i = int(np.searchsorted(f, np.datetime64(start, "D"))) if start else 0
+    j = int(np.searchsorted(f, np.datetime64(end, "D"), side="right")) if end else len(f)
+    return pd.DataFrame({"fecha": f[i:j].astype("datetime64[ns]"), "valor": v[i:j]})
+
+
+def ultimas(clave: str, n: int = 1) -> pd.DataFrame:
+    """
+    Últimas 'n' observaciones de la derivada, con índice 'fecha' (como
+    get_latest_n). Sólo se carga la ventana que hace falta de la base
+    (_ventana_dias), no la historia desde DESDE.
+    """
+    if clave not in DERIVADAS:
+        raise KeyError(f"Derivada no válida: {clave}")
+    desde = (dt.date.today() - dt.timedelta(days=_ventana_dias(clave, n))).isoformat()
+    estado = _al_dia(clave, desde)
+    f, v = estado["fechas"][-n:], estado["valores"][-n:]
+    if len(f) < n:
+        # Serie con datos más viejos que la ventana: se busca en toda la historia
+        return serie(clave).tail(n).set_index("fecha")
+    return pd.DataFrame({"fecha": f.astype("datetime64[ns]"), "valor": v}).set_index("fecha")
+
+
+def reiniciar() -> None:
+    with _lock:
+        _bases.clear()
+        _derivadas.clear()
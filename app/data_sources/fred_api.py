@@ -1,18 +1,18 @@
-import os
+import asyncio
 import datetime as dt
-from pathlib import Path
 
 import pandas as pd
-import requests
-from dotenv import load_dotenv
 
-# Cargamos .env desde la raíz del proyecto
-ROOT_DIR = Path(__file__).resolve().parents[2]
-ENV_PATH = ROOT_DIR / ".env"
-load_dotenv(dotenv_path=ENV_PATH)
+from app import config, metricas
+from app.data_sources import http_client, paralelo, parseo, store
 
-FRED_API_KEY = os.getenv("FRED_API_KEY")
-FRED_BASE_URL = "https://api.stlouisfed.org/fred/series/observations"
+FRED_API_KEY = config.getenv("FRED_API_KEY")
+# Se puede apuntar a otro servidor (p. ej. el de réplica de benchmarks/)
+FRED_BASE_URL = config.getenv("FRED_BASE_URL", "https://api.stlouisfed.org/fred/series/observations")
+
+# Ventana final que se vuelve a pedir (vencido REFRESCO_SEG de su frecuencia)
+# para recoger revisiones
+REVISION_DIAS = 120
 
 FRED_SERIES = {
     # Para gráficos / series de tiempo:
@@ -22,38 +22,161 @@ FRED_SERIES = {
     "gdp_growth": "A191RL1Q225SBEA",        # Real GDP, % change from preceding period (quarterly, SAAR)
 }
 
+# Frecuencia de publicación por id de FRED (incluye las del rango objetivo)
+FRECUENCIAS = {
+    "FEDFUNDS": "mensual",
+    "PCEPI": "mensual",
+    "UNRATE": "mensual",
+    "A191RL1Q225SBEA": "trimestral",
+    "DFEDTARL": "diaria",
+    "DFEDTARU": "diaria",
+}
+
+# Cada cuánto se refresca la cola de una serie según su frecuencia (segundos).
+# Lo usan el caché de observaciones y el worker de ingesta.
+REFRESCO_SEG = {
+    "diaria": 3600,
+    "mensual": 6 * 3600,
+    "trimestral": 12 * 3600,
+}
+
 
-def _fred_series(serie_id: str, start: str = "2015-01-01") -> pd.DataFrame:
+def refresco_seg(serie_id: str) -> int:
+    return REFRESCO_SEG[FRECUENCIAS.get(serie_id, "mensual")]
+
+
+def _descargar_fred(serie_id: str, start: str, end: str | None = None) -> pd.DataFrame:
     """
-    Descarga una serie de FRED desde 'start' hasta hoy.
-    Devuelve un DataFrame con índice fecha y columna 'valor'.
+    Descarga observaciones de FRED entre 'start' y 'end' (YYYY-MM-DD).
+    Devuelve un DataFrame con columnas fecha (datetime) y valor (float).
     """
+    params = {"observation_start": start}
+    if end is not None:
+        params["observation_end"] = end
+    return _pedir_observaciones(serie_id, params)
+
+
+def _params(serie_id: str, params: dict) -> dict:
     if not FRED_API_KEY:
         raise RuntimeError("No se encontró FRED_API_KEY. Revisa tu archivo .env.")
 
-    params = {
+    return {
         "series_id": serie_id,
         "api_key": FRED_API_KEY,
         "file_type": "json",
-        "observation_start": start,
+        **params,
     }
 
-    resp = requests.get(FRED_BASE_URL, params=params, timeout=15)
-    resp.raise_for_status()
-    data = resp.json().get("observations", [])
+
+def _respuesta_a_frame(payload: dict) -> pd.DataFrame:
+    data = payload.get("observations", [])
 
     if not data:
-        return pd.DataFrame(columns=["fecha", "valor"]).set_index("fecha")
+        return pd.DataFrame(columns=["fecha", "valor"])
+
+    return _observaciones_a_frame(data)
+
+
+def _pedir_observaciones(serie_id: str, params: dict) -> pd.DataFrame:
+    resp = http_client.get("fred", FRED_BASE_URL, params=_params(serie_id, params))
+    resp.raise_for_status()
+    return _respuesta_a_frame(resp.json())
+
+
+async def _pedir_observaciones_async(serie_id: str, params: dict) -> pd.DataFrame:
+    resp = await http_client.aget("fred", FRED_BASE_URL, params=_params(serie_id, params))
+    resp.raise_for_status()
+    return _respuesta_a_frame(resp.json())
 
-    df = pd.DataFrame(
-        [(row["date"], row["value"]) for row in data],
-        columns=["fecha", "valor"],
+
+def _params_latest_n(n: int) -> dict:
+    # Pedimos algunas de más por si las últimas vienen como "." (sin dato)
+    return {"sort_order": "desc", "limit": n + 2}
+
+
+def _ultimas_n(df: pd.DataFrame, n: int) -> pd.DataFrame:
+    df = df.dropna().sort_values("fecha").tail(n)
+    return df.set_index("fecha")
+
+
+def get_latest_n(serie_id: str, n: int) -> pd.DataFrame:
+    """
+    Sólo las 'n' observaciones más recientes de una serie (sort_order=desc +
+    limit), sin descargar la historia. Acepta claves de FRED_SERIES o ids.
+    Devuelve un DataFrame con índice fecha (ascendente) y columna 'valor'.
+    """
+    serie_id = FRED_SERIES.get(serie_id, serie_id)
+    return _ultimas_n(_pedir_observaciones(serie_id, _params_latest_n(n)), n)
+
+
+async def get_latest_n_async(serie_id: str, n: int) -> pd.DataFrame:
+    serie_id = FRED_SERIES.get(serie_id, serie_id)
+    return _ultimas_n(await _pedir_observaciones_async(serie_id, _params_latest_n(n)), n)
+
+
+def _observaciones_a_frame(data: list[dict]) -> pd.DataFrame:
+    """
+    Convierte la lista 'observations' de FRED a DataFrame (fecha, valor)
+    con conversión vectorizada de fechas y números.
+    """
+    with metricas.medir("parseo.fred"):
+        return pd.DataFrame({
+            "fecha": parseo.fechas_iso([row["date"] for row in data]),
+            # Algunos valores pueden ser "." cuando no hay dato
+            "valor": parseo.valores_a_float([row["value"] for row in data], nulos=(".",)),
+        })
+
+
+def _huecos(serie_id: str, start: str, end: str | None) -> tuple[dt.date, dt.date, list]:
+    inicio = dt.date.fromisoformat(start)
+    fin = dt.date.fromisoformat(end) if end is not None else dt.date.today()
+
+    huecos = store.rangos_faltantes(
+        "fred", serie_id, inicio, fin,
+        relectura_dias=REVISION_DIAS, ttl_seg=refresco_seg(serie_id),
     )
-    df["fecha"] = pd.to_datetime(df["fecha"])
-    # Algunos valores pueden ser "." cuando no hay dato
-    df["valor"] = pd.to_numeric(df["valor"], errors="coerce")
-    df.set_index("fecha", inplace=True)
-    return df.sort_index()
+    return inicio, fin, huecos
+
+
+def _observaciones(serie_id: str, start: str, end: str | None = None) -> pd.DataFrame:
+    """
+    Observaciones de 'serie_id' entre start y end servidas desde el almacén local.
+
+    Sólo se piden a FRED los huecos: normalmente la cola posterior a la última
+    fecha guardada (observation_start). Los últimos REVISION_DIAS se vuelven a
+    pedir una vez vencido el TTL para incorporar revisiones.
+    """
+    inicio, fin, huecos = _huecos(serie_id, start, end)
+    for a, b in huecos:
+        df = _descargar_fred(serie_id, a.isoformat(), b.isoformat())
+        store.guardar("fred", serie_id, df, a, b)
+
+    return store.leer("fred", serie_id, inicio, fin)
+
+
+async def _observaciones_async(serie_id: str, start: str, end: str | None = None) -> pd.DataFrame:
+    inicio, fin, huecos = _huecos(serie_id, start, end)
+    frames = await asyncio.gather(*(
+        _pedir_observaciones_async(
+            serie_id, {"observation_start": a.isoformat(), "observation_end": b.isoformat()}
+        )
+        for a, b in huecos
+    ))
+    for (a, b), df in zip(huecos, frames):
+        store.guardar("fred", serie_id, df, a, b)
+
+    return store.leer("fred", serie_id, inicio, fin)
+
+
+# Pedido -> (serie, últimas n observaciones) de las tarjetas de get_latest_all.
+# La inflación PCE a/a sale de la derivada 'inflation_pce_yoy' (derivadas.py).
+_PEDIDOS_LATEST = {
+    "low": ("DFEDTARL", 5),
+    "up": ("DFEDTARU", 5),
+    "unemp": ("unemployment", 1),
+    "gdp": ("gdp_growth", 1),
+}
+_DERIVADA_PCE = "inflation_pce_yoy"
 
 
 def get_latest_all() -> pd.DataFrame:
@@ -63,13 +186,50 @@ def get_latest_all() -> pd.DataFrame:
     - Inflación PCE (% anual)
     - Tasa de desempleo (%)
     - PIB real (% variación trimestral anualizada)
+
+    Todas las series se piden al mismo tiempo; si alguna falla sólo se omite
+    su tarjeta (la latencia total es la de la serie más lenta). De cada una
+    sólo se piden las últimas observaciones necesarias; PCE a/a se lee de la
+    derivada incremental sobre la historia guardada de PCEPI.
     """
+    from app.data_sources import derivadas
 
+    pedidos = {
+        nombre: (lambda s=serie_id, n=n: get_latest_n(s, n))
+        for nombre, (serie_id, n) in _PEDIDOS_LATEST.items()
+    }
+    pedidos["pce"] = lambda: derivadas.ultimas(_DERIVADA_PCE, 1)
+    series, errores = paralelo.en_paralelo(pedidos)
+    return _filas_latest(series, errores)
+
+
+async def get_latest_all_async() -> pd.DataFrame:
+    """Igual que get_latest_all, con todas las peticiones en el mismo event loop."""
+    from app.data_sources import derivadas
+
+    nombres = list(_PEDIDOS_LATEST) + ["pce"]
+    resultados = await asyncio.gather(
+        *(get_latest_n_async(*_PEDIDOS_LATEST[nombre]) for nombre in _PEDIDOS_LATEST),
+        asyncio.to_thread(derivadas.ultimas, _DERIVADA_PCE, 1),
+        return_exceptions=True,
+    )
+    series = {n: r for n, r in zip(nombres, resultados) if not isinstance(r, BaseException)}
+    errores = {n: r for n, r in zip(nombres, resultados) if isinstance(r, BaseException)}
+    return _filas_latest(series, errores)
+
+
+def _filas_latest(series: dict, errores: dict) -> pd.DataFrame:
+    """Tarjetas a partir de las últimas observaciones de cada pedido de _PEDIDOS_LATEST."""
+    if errores and not series:
+        # Si no llegó nada, propagamos el primer error (como antes)
+        raise next(iter(errores.values()))
+
+    vacio = pd.DataFrame(columns=["valor"])
     rows = []
 
     # 1) Fed funds target range (DFEDTARL / DFEDTARU)
-    low = _fred_series("DFEDTARL", "2015-01-01")
-    up = _fred_series("DFEDTARU", "2015-01-01")
+    low = series.get("low", vacio)
+    up = series.get("up", vacio)
     if not low.empty and not up.empty:
         date = min(low.index.max(), up.index.max())
         low_val = float(low.loc[date, "valor"])
@@ -84,28 +244,23 @@ def get_latest_all() -> pd.DataFrame:
             }
         )
 
-    # 2) Inflación PCE (% anual, calculada desde el índice PCEPI)
-    pce = _fred_series(FRED_SERIES["inflation_pce"], "2010-01-01")
-    if len(pce) >= 13:
-        pce = pce.sort_index()
+    # 2) Inflación PCE (% anual): derivada 'inflation_pce_yoy' del índice PCEPI
+    pce = series.get("pce", vacio)
+    if not pce.empty:
         last_date = pce.index.max()
-        last_val = pce.loc[last_date, "valor"]
-        prev_series = pce[pce.index <= (last_date - pd.DateOffset(years=1))]
-        if not prev_series.empty:
-            prev_val = prev_series.iloc[-1]["valor"]
-            yoy = (last_val / prev_val - 1.0) * 100.0
-            rows.append(
-                {
-                    "clave": "inflation_pce",
-                    "nombre": "Inflation (PCE)",
-                    "fecha": last_date.date(),
-                    "valor": float(yoy),
-                    "valor_str": f"{yoy:.1f}%",
-                }
-            )
+        yoy = float(pce.loc[last_date, "valor"])
+        rows.append(
+            {
+                "clave": "inflation_pce",
+                "nombre": "Inflation (PCE)",
+                "fecha": last_date.date(),
+                "valor": yoy,
+                "valor_str": f"{yoy:.1f}%",
+            }
+        )
 
     # 3) Desempleo (%)
-    unemp = _fred_series(FRED_SERIES["unemployment"], "2010-01-01")
+    unemp = series.get("unemp", vacio)
     if not unemp.empty:
         last_date = unemp.index.max()
         val = float(unemp.loc[last_date, "valor"])
@@ -120,11 +275,10 @@ def get_latest_all() -> pd.DataFrame:
         )
 
     # 4) PIB real – % cambio trimestral anualizado (Real GDP, q/q SAAR)
-    gdp = get_time_series("gdp_growth", start="2015-01-01")
+    gdp = series.get("gdp", vacio)
     if not gdp.empty:
-        last_row = gdp.iloc[-1]
-        last_date = last_row["fecha"]
-        val = float(last_row["valor"])
+        last_date = gdp.index.max()
+        val = float(gdp.loc[last_date, "valor"])
 
         rows.append(
             {
@@ -152,35 +306,17 @@ def get_time_series(
     """
     series_id = FRED_SERIES[clave]
 
-    params = {
-        "series_id": series_id,
-        "api_key": FRED_API_KEY,
-        "file_type": "json",
-        "observation_start": start,
-    }
-    if end is not None:
-        params["observation_end"] = end
-
-    resp = requests.get(
-        "https://api.stlouisfed.org/fred/series/observations",
-        params=params,
-        timeout=15,
-    )
-    resp.raise_for_status()
-    data = resp.json()["observations"]
-
-    rows = []
-    for obs in data:
-        val_raw = obs["value"]
-        if val_raw in (".", ""):
-            continue
-        rows.append((obs["date"], float(val_raw)))
-
-    df = pd.DataFrame(rows, columns=["fecha", "valor"])
-
     # IMPORTANTÍSIMO: NO poner set_index("fecha") aquí;
     # dejamos 'fecha' como columna para poder usar x="fecha".
-    df["fecha"] = pd.to_datetime(df["fecha"])
-    df = df.sort_values("fecha")
+    df = _observaciones(series_id, start, end)
+    return df.sort_values("fecha")
 
-    return df
+
+async def get_time_series_async(
+    clave: str,
+    start: str = "2015-01-01",
+    end: str | None = None,
+) -> pd.DataFrame:
+    """Igual que get_time_series, con el cliente HTTP asíncrono."""
+    df = await _observaciones_async(FRED_SERIES[clave], start, end)
+    return df.sort_values("fecha")
@@ -0,0 +1,132 @@
+"""
+Interfaz común (asíncrona) de las fuentes de datos.
+
+Cada fuente expone los mismos tres métodos y las mismas formas de retorno:
+- latest()                  -> DataFrame con al menos: fuente, clave, nombre,
+                               fecha (datetime64), valor (float); las columnas
+                               propias de cada fuente (fecha_label, valor_str,
+                               change_pct, session...) se conservan.
+- history(key, start, end)  -> DataFrame con columnas fecha (datetime64), valor.
+- batch(keys, start, end)   -> {key: DataFrame(fecha, valor)}
+
+Banxico y FRED usan el cliente HTTP asíncrono (http_client.aget) y el mismo
+parseo / almacén local que las funciones síncronas. yfinance sólo es
+bloqueante, así que Mercados corre en hilos (asyncio.to_thread).
+
+Para pedir todo lo que necesita una página en un solo event loop:
+    resultados, errores = fuentes.ejecutar({
+        "banxico": FUENTES["banxico"].latest(),
+        "fix": FUENTES["banxico"].history("fix", "2020-01-01"),
+        "fred": FUENTES["fred"].batch(["policy_rate", "unemployment"], "2020-01-01"),
+    })
+"""
+import asyncio
+from typing import Protocol
+
+import pandas as pd
+
+from app.data_sources import banxico, fred_api, http_client, markets
+
+COLUMNAS_LATEST = ["fuente", "clave", "nombre", "fecha", "valor"]
+
+
+class DataSource(Protocol):
+    nombre: str
+
+    async def latest(self) -> pd.DataFrame: ...
+
+    async def history(self, key: str, start: str, end: str | None = None) -> pd.DataFrame: ...
+
+    async def batch(self, keys: list[str], start: str, end: str | None = None) -> dict[str, pd.DataFrame]: ...
+
+
+def _normalizar_latest(fuente: str, df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.insert(0, "fuente", fuente)
+    for col in COLUMNAS_LATEST:
+        if col not in df.columns:
+            df[col] = None
+    df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
+    df["valor"] = pd.to_numeric(df["valor"], errors="coerce")
+    extra = [c for c in df.columns if c not in COLUMNAS_LATEST]
+    return df[COLUMNAS_LATEST + extra]
+
+
+async def _batch(fuente: DataSource, keys: list[str], start: str, end: str | None) -> dict[str, pd.DataFrame]:
+    keys = list(dict.fromkeys(keys))
+    frames = await asyncio.gather(*(fuente.history(k, start, end) for k in keys))
+    return dict(zip(keys, frames))
+
+
+class BanxicoSource:
+    """SIE de Banxico; claves de banxico.SERIES_IDS."""
+    nombre = "banxico"
+
+    async def latest(self) -> pd.DataFrame:
+        return _normalizar_latest(self.nombre, await banxico.get_latest_all_async())
+
+    async def history(self, key: str, start: str, end: str | None = None) -> pd.DataFrame:
+        return await banxico.get_series_history_async(key, start=start, end=end)
+
+    async def batch(self, keys: list[str], start: str, end: str | None = None) -> dict[str, pd.DataFrame]:
+        # Las claves comparten consultas de hasta banxico.LOTE_MAX series
+        return await banxico.get_series_history_lote_async(keys, start=start, end=end)
+
+
+class FredSource:
+    """FRED (St. Louis Fed); claves de fred_api.FRED_SERIES."""
+    nombre = "fred"
+
+    async def latest(self) -> pd.DataFrame:
+        return _normalizar_latest(self.nombre, await fred_api.get_latest_all_async())
+
+    async def history(self, key: str, start: str, end: str | None = None) -> pd.DataFrame:
+        return (await fred_api.get_time_series_async(key, start=start, end=end)).reset_index(drop=True)
+
+    async def batch(self, keys: list[str], start: str, end: str | None = None) -> dict[str, pd.DataFrame]:
+        return await _batch(self, keys, start, end)
+
+
+class MarketsSource:
+    """Yahoo Finance vía yfinance (bloqueante: corre en hilos); claves = tickers."""
+    nombre = "markets"
+
+    async def latest(self) -> pd.DataFrame:
+        df = await asyncio.to_thread(markets._latest_price, markets.ALL_TICKERS)
+        df = df.rename(columns={"ticker": "clave", "name": "nombre", "price": "valor"})
+        df["fecha"] = pd.Timestamp.now().floor("s")
+        return _normalizar_latest(self.nombre, df)
+
+    async def history(self, key: str, start: str, end: str | None = None) -> pd.DataFrame:
+        return await asyncio.to_thread(markets.get_history, key, start, end)
+
+    async def batch(self, keys: list[str], start: str, end: str | None = None) -> dict[str, pd.DataFrame]:
+        return await _batch(self, keys, start, end)
+
+
+FUENTES: dict[str, DataSource] = {
+    "banxico": BanxicoSource(),
+    "fred": FredSource(),
+    "markets": MarketsSource(),
+}
+
+
+async def reunir(corutinas: dict) -> tuple[dict, dict]:
+    """
+    Espera todas las corutinas a la vez.
+    Regresa ({nombre: resultado}, {nombre: excepción}) aislando los errores.
+    """
+    nombres = list(corutinas)
+    resultados = await asyncio.gather(*corutinas.values(), return_exceptions=True)
+    ok, errores = {}, {}
+    for nombre, r in zip(nombres, resultados):
+        if isinstance(r, BaseException):
+            errores[nombre] = r
+        else:
+            ok[nombre] = r
+    return ok, errores
+
+
+def ejecutar(corutinas: dict) -> tuple[dict, dict]:
+    """Versión síncrona de reunir(): un event loop para todas las peticiones."""
+    return http_client.ejecutar(reunir(corutinas))
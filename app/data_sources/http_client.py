@@ -0,0 +1,255 @@
+"""
+Cliente HTTP compartido por las fuentes de datos (Banxico, FRED).
+
+Una sesión de requests por proveedor con pools keep-alive por host (sin
+handshake TCP+TLS en cada llamada), reintentos con backoff exponencial y
+jitter en 429/5xx, y timeout por proveedor. Todo configurable por variables
+de entorno. Cada GET queda registrado en app.metricas como 'http.<proveedor>'
+(tiempo, bytes y reintentos).
+
+Antes de salir, cada petición (y cada reintento) espera turno en el límite
+de su proveedor (app/data_sources/limitador.py: token bucket + cola de
+prioridad): un reintento también consume cuota del proveedor.
+
+aget() es la versión asíncrona (httpx) con la misma política de pool,
+reintentos y timeouts, para las fuentes de app/data_sources/fuentes.py;
+astream() igual, con el cuerpo leído en flujo. Los
+clientes asíncronos viven en su event loop; ejecutar() corre una corutina en
+un loop nuevo y los cierra al terminar.
+"""
+import asyncio
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app import config, metricas
+from app.data_sources import limitador
+
+# Conexiones keep-alive por host (varias sesiones de Streamlit a la vez)
+POOL_SIZE = int(config.getenv("HTTP_POOL_SIZE", "10"))
+
+# Reintentos: espera = BACKOFF_FACTOR * 2**(n-1) + uniforme(0, BACKOFF_JITTER)
+MAX_RETRIES = int(config.getenv("HTTP_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = float(config.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+BACKOFF_JITTER = float(config.getenv("HTTP_BACKOFF_JITTER", "0.5"))
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# Una petición interactiva (una página esperando) no duerme más que esto antes
+# de reintentar: si el servidor pide más (Retry-After) se regresa la última
+# respuesta. Los rellenos de fondo sí esperan, hasta el timeout del proveedor.
+ESPERA_MAX_INTERACTIVA = float(config.getenv("HTTP_ESPERA_MAX_INTERACTIVA", "3"))
+
+# Timeout (segundos) por proveedor; p. ej. HTTP_TIMEOUT_BANXICO=20
+TIMEOUTS = {
+    "banxico": float(config.getenv("HTTP_TIMEOUT_BANXICO", "15")),
+    "fred": float(config.getenv("HTTP_TIMEOUT_FRED", "15")),
+}
+DEFAULT_TIMEOUT = float(config.getenv("HTTP_TIMEOUT", "15"))
+
+_sesiones: dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+def _crear_sesion() -> requests.Session:
+    # Sin reintentos en el adaptador: get() reintenta pasando por el limitador
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=0,
+    )
+    sesion = requests.Session()
+    sesion.mount("https://", adapter)
+    sesion.mount("http://", adapter)
+    sesion.headers["Accept-Encoding"] = "gzip, deflate"
+    return sesion
+
+
+def get_session(proveedor: str) -> requests.Session:
+    """Sesión (y pool de conexiones) compartida de un proveedor."""
+    sesion = _sesiones.get(proveedor)
+    if sesion is None:
+        with _lock:
+            sesion = _sesiones.get(proveedor)
+            if sesion is None:
+                sesion = _crear_sesion()
+                _sesiones[proveedor] = sesion
+    return sesion
+
+
+def _espera_reintento(proveedor: str, intento: int, retry_after: str | None) -> float | None:
+    """
+    Segundos antes del reintento: Retry-After del servidor (a lo más el
+    timeout del proveedor) o backoff exponencial + jitter. None si quien
+    pide es interactivo y tendría que esperar más de ESPERA_MAX_INTERACTIVA.
+    """
+    espera = None
+    if retry_after:
+        try:
+            espera = min(max(float(retry_after), 0.0), TIMEOUTS.get(proveedor, DEFAULT_TIMEOUT))
+        except ValueError:
+            pass
+    if espera is None:
+        espera = BACKOFF_FACTOR * (2 ** (intento - 1)) + random.uniform(0, BACKOFF_JITTER)
+    if limitador.prioridad_actual() < limitador.PRIORIDAD_FONDO and espera > ESPERA_MAX_INTERACTIVA:
+        return None
+    return espera
+
+
+def get(proveedor: str, url: str, **kwargs) -> requests.Response:
+    """
+    GET con la sesión del proveedor y su timeout por defecto.
+    Reintenta en 429/5xx y errores de conexión; si se agotan los reintentos
+    (o la espera pedida es demasiado larga para una página, ver
+    ESPERA_MAX_INTERACTIVA) regresa la última respuesta (el llamador decide
+    con raise_for_status()).
+    """
+    kwargs.setdefault("timeout", TIMEOUTS.get(proveedor, DEFAULT_TIMEOUT))
+    sesion = get_session(proveedor)
+    limitador.esperar_turno(proveedor)
+    with metricas.medir(f"http.{proveedor}") as m:
+        intento = 0
+        while True:
+            error = None
+            try:
+                resp = sesion.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if intento >= MAX_RETRIES:
+                    raise
+                resp, error = None, e
+
+            if resp is not None and (resp.status_code not in RETRY_STATUS or intento >= MAX_RETRIES):
+                break
+
+            retry_after = resp.headers.get("Retry-After") if resp is not None else None
+            espera = _espera_reintento(proveedor, intento + 1, retry_after)
+            if espera is None:
+                # Una página no se queda esperando: se regresa el último resultado
+                if resp is None:
+                    raise error
+                break
+
+            intento += 1
+            m["reintentos"] = intento
+            if resp is not None:
+                resp.close()        # devuelve la conexión al pool
+            time.sleep(espera)
+            limitador.esperar_turno(proveedor)
+
+        if not kwargs.get("stream"):
+            m["bytes"] = len(resp.content)
+    return resp
+
+
+# ---------- Cliente asíncrono (httpx) ----------
+
+# event loop -> {proveedor: httpx.AsyncClient}; un cliente no puede cambiar de loop
+_clientes_async: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _cliente_async(proveedor: str):
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    por_proveedor = _clientes_async.setdefault(loop, {})
+    cliente = por_proveedor.get(proveedor)
+    if cliente is None:
+        cliente = httpx.AsyncClient(
+            timeout=TIMEOUTS.get(proveedor, DEFAULT_TIMEOUT),
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+        por_proveedor[proveedor] = cliente
+    return cliente
+
+
+async def _apedir(proveedor: str, url: str, m: dict, stream: bool, **kwargs):
+    """Envía el GET asíncrono con los reintentos (y turnos del limitador) de aget()."""
+    import httpx
+
+    cliente = _cliente_async(proveedor)
+    intento = 0
+    while True:
+        error = None
+        try:
+            resp = await cliente.send(cliente.build_request("GET", url, **kwargs), stream=stream)
+        except httpx.TransportError as e:
+            if intento >= MAX_RETRIES:
+                raise
+            resp, error = None, e
+
+        if resp is not None and (resp.status_code not in RETRY_STATUS or intento >= MAX_RETRIES):
+            return resp
+
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        espera = _espera_reintento(proveedor, intento + 1, retry_after)
+        if espera is None:
+            if resp is None:
+                raise error
+            return resp
+
+        intento += 1
+        m["reintentos"] = intento
+        if resp is not None:
+            await resp.aclose()     # devuelve la conexión al pool
+        await asyncio.sleep(espera)
+        await limitador.esperar_turno_async(proveedor)
+
+
+async def aget(proveedor: str, url: str, **kwargs):
+    """
+    GET asíncrono con el cliente del proveedor en el loop actual.
+    Reintenta en 429/5xx y errores de conexión; si se agotan los reintentos
+    regresa la última respuesta (el llamador decide con raise_for_status()).
+    """
+    await limitador.esperar_turno_async(proveedor)
+    with metricas.medir(f"http.{proveedor}") as m:
+        resp = await _apedir(proveedor, url, m, False, **kwargs)
+        m["bytes"] = len(resp.content)
+    return resp
+
+
+@asynccontextmanager
+async def astream(proveedor: str, url: str, **kwargs):
+    """
+    Igual que aget(), pero el cuerpo no se descarga: dentro del bloque se lee
+    en flujo con resp.aiter_bytes() y al salir se cierra la respuesta.
+    """
+    await limitador.esperar_turno_async(proveedor)
+    with metricas.medir(f"http.{proveedor}") as m:
+        resp = await _apedir(proveedor, url, m, True, **kwargs)
+    try:
+        yield resp
+    finally:
+        await resp.aclose()
+
+
+async def cerrar_async() -> None:
+    """Cierra los clientes asíncronos del loop actual."""
+    loop = asyncio.get_running_loop()
+    for cliente in _clientes_async.pop(loop, {}).values():
+        await cliente.aclose()
+
+
+def ejecutar(corutina):
+    """Corre 'corutina' en un event loop nuevo y cierra sus clientes al final."""
+    async def _correr():
+        try:
+            return await corutina
+        finally:
+            await cerrar_async()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_correr())
+
+    # Ya hay un loop corriendo en este hilo: se usa uno nuevo en otro hilo
+    # (con el mismo contexto, p. ej. la prioridad del limitador)
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(contextvars.copy_context().run, asyncio.run, _correr()).result()
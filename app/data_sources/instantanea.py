@@ -0,0 +1,285 @@
+"""
+Instantánea del último estado conocido (arranque en frío y modo sin conexión).
+
+Una carpeta (data/instantanea/) con un parquet por tabla y por serie y un
+manifest.json que los describe:
+- las tablas guardadas (tarjetas de Banxico / FRED y tablas de mercados),
+- las series de las gráficas usadas recientemente (hasta SERIES_MAX), con
+  sus rangos consultados.
+Cada escritura va a una subcarpeta nueva y sólo se publica al reemplazar el
+manifiesto (os.replace): quien lee ve la instantánea anterior o la nueva
+completa. La app y el worker publican con el candado entre procesos del
+almacén (store.exclusivo) y el manifiesto sólo avanza a generaciones más
+nuevas, así que nunca apunta a una subcarpeta borrada. Sólo se leen datos (JSON y parquet), nunca objetos serializados.
+
+Se reescribe en segundo plano cada INSTANTANEA_INTERVALO_SEG cuando llegan
+datos nuevos (y al final de cada vuelta del worker). Al arrancar, cargar()
+siembra con ella el almacén local si está vacío o es más viejo, así que la
+primera visita se sirve de disco (etiquetada con la fecha de los datos)
+mientras se refresca en segundo plano.
+
+Con DASHBOARD_OFFLINE=1 nunca se llama a las fuentes: todo sale del almacén
+sembrado por la instantánea. Sin ese modo, si una fuente falla se sirve la
+última copia guardada en lugar de un error.
+"""
+import datetime as dt
+import json
+import logging
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from app import config
+from app.data_sources import store
+
+log = logging.getLogger(__name__)
+
+RUTA = store.DATA_DIR / config.getenv("DASHBOARD_INSTANTANEA", "instantanea")
+MANIFIESTO = "manifest.json"
+OFFLINE = (config.getenv("DASHBOARD_OFFLINE", "0") or "").strip().lower() in ("1", "true", "si", "sí")
+INTERVALO_SEG = float(config.getenv("INSTANTANEA_INTERVALO_SEG", "300"))
+SERIES_MAX = int(config.getenv("INSTANTANEA_SERIES_MAX", "32"))
+
+# Por qué se sirve una copia guardada (df.attrs["respaldo"])
+VENCIDA = "vencida"            # refrescando en segundo plano
+SIN_CONEXION = "sin conexión"  # la fuente falló
+FUERA_DE_LINEA = "offline"     # DASHBOARD_OFFLINE
+
+_lock = threading.Lock()
+_cargada = False
+_ultima_escritura = 0.0
+_escribiendo = False
+_usadas: OrderedDict = OrderedDict()     # (fuente, clave) -> None, más reciente al final
+
+
+def marcar(df: pd.DataFrame, actualizado: float, motivo: str) -> pd.DataFrame:
+    """Etiqueta un resultado servido desde copia: df.attrs['actualizado'] y ['respaldo']."""
+    df.attrs["actualizado"] = actualizado
+    df.attrs["respaldo"] = motivo
+    return df
+
+
+def registrar_serie(fuente: str, clave: str) -> None:
+    """Anota la serie (clave del almacén) entre las usadas recientemente."""
+    with _lock:
+        _usadas[(fuente, clave)] = None
+        _usadas.move_to_end((fuente, clave))
+        while len(_usadas) > SERIES_MAX:
+            _usadas.popitem(last=False)
+
+
+def actualizado(fuente: str, clave: str) -> float:
+    """Epoch de la descarga más reciente de la serie en el almacén (0 si no hay)."""
+    return max((a for _, _, a in store.rangos(fuente, clave)), default=0.0)
+
+
+def respaldo(fuente: str, clave: str, start: str, end: str | None, motivo: str = SIN_CONEXION) -> pd.DataFrame:
+    """Observaciones guardadas de [start, end], etiquetadas con su fecha de descarga."""
+    inicio = dt.date.fromisoformat(start)
+    fin = dt.date.fromisoformat(end) if end else dt.date.today()
+    df = store.leer(fuente, clave, inicio, fin)
+    return marcar(df, actualizado(fuente, clave), motivo)
+
+
+def con_respaldo(fuente: str, clave: str, start: str, end: str | None, fn):
+    """
+    fn() normalmente; en modo offline o si la fuente falla, la copia guardada
+    de la serie (si no hay nada guardado se propaga el error).
+    """
+    cargar()
+    registrar_serie(fuente, clave)
+    if OFFLINE:
+        return respaldo(fuente, clave, start, end, FUERA_DE_LINEA)
+    try:
+        df = fn()
+    except Exception:
+        guardada = respaldo(fuente, clave, start, end)
+        if guardada.empty:
+            raise
+        log.warning("%s:%s no respondió; se sirve la copia guardada", fuente, clave, exc_info=True)
+        return guardada
+    escribir_en_fondo()
+    return df
+
+
+# ---------- Archivo ----------
+
+def _leer_archivo() -> dict | None:
+    """
+    {"generado", "tablas": {nombre: (df, actualizado)},
+     "series": {(fuente, clave): (df, [(inicio, fin, actualizado), ...])}} o None.
+    """
+    manifiesto = RUTA / MANIFIESTO
+    if not manifiesto.exists():
+        return None
+    try:
+        info = json.loads(manifiesto.read_text(encoding="utf-8"))
+        carpeta = RUTA / Path(info["carpeta"]).name
+
+        def _parquet(archivo: str) -> pd.DataFrame:
+            return pd.read_parquet(carpeta / Path(archivo).name)
+
+        tablas = {
+            nombre: (_parquet(t["archivo"]), float(t["actualizado"]))
+            for nombre, t in info["tablas"].items()
+        }
+        series = {
+            (s["fuente"], s["clave"]): (
+                _parquet(s["archivo"]),
+                [(dt.date.fromisoformat(ini), dt.date.fromisoformat(fin), float(act)) for ini, fin, act in s["rangos"]],
+            )
+            for s in info["series"]
+        }
+    except Exception:
+        log.exception("No se pudo leer la instantánea %s", RUTA)
+        return None
+    return {"generado": float(info["generado"]), "tablas": tablas, "series": series}
+
+
+def cargar() -> None:
+    """Una vez por proceso: siembra el almacén con la instantánea (sin pisar datos más nuevos)."""
+    global _cargada
+    if _cargada:
+        return
+    with _lock:
+        if _cargada:
+            return
+        _cargada = True
+        datos = _leer_archivo()
+        if datos is None:
+            return
+
+        guardadas = store.leer_tablas()
+        for nombre, (df, act) in datos["tablas"].items():
+            if nombre not in guardadas or guardadas[nombre][1] < act:
+                store.guardar_tabla(nombre, df, actualizado=act)
+
+        for (fuente, clave), (df, rangos) in datos["series"].items():
+            _usadas[(fuente, clave)] = None
+            if store.rangos(fuente, clave):
+                continue
+            for ini, fin, act in rangos:
+                fechas = df["fecha"].dt.date
+                store.guardar(fuente, clave, df[(fechas >= ini) & (fechas <= fin)], ini, fin, actualizado=act)
+
+    log.info("Instantánea del %s cargada", time.strftime("%Y-%m-%d %H:%M", time.localtime(datos["generado"])))
+
+
+def escribir(forzar: bool = False) -> bool:
+    """
+    Guarda la instantánea (escritura atómica) si pasó INTERVALO_SEG desde la
+    última. Regresa True si se escribió.
+    """
+    global _ultima_escritura
+    with _lock:
+        if not forzar and time.time() - _ultima_escritura < INTERVALO_SEG:
+            return False
+        _ultima_escritura = time.time()
+        usadas = list(_usadas)
+
+    series = {}
+    for fuente, clave in usadas:
+        rangos = store.rangos(fuente, clave)
+        if not rangos:
+            continue
+        inicio = min(r[0] for r in rangos)
+        fin = max(r[1] for r in rangos)
+        series[(fuente, clave)] = (store.leer(fuente, clave, inicio, fin), rangos)
+
+    _escribir_archivo(time.time(), store.leer_tablas(), series)
+    return True
+
+
+def _escribir_archivo(generado: float, tablas: dict, series: dict) -> None:
+    # Subcarpeta nueva con los parquet; el manifiesto la publica al final
+    carpeta = RUTA / f"g{int(generado * 1000)}"
+    carpeta.mkdir(parents=True, exist_ok=True)
+    info = {"generado": generado, "carpeta": carpeta.name, "tablas": {}, "series": []}
+    try:
+        for i, (nombre, (df, act)) in enumerate(tablas.items()):
+            archivo = f"tabla-{i}.parquet"
+            df.to_parquet(carpeta / archivo)
+            info["tablas"][nombre] = {"archivo": archivo, "actualizado": act}
+        for i, ((fuente, clave), (df, rangos)) in enumerate(series.items()):
+            archivo = f"serie-{i}.parquet"
+            df.to_parquet(carpeta / archivo, index=False)
+            info["series"].append({
+                "fuente": fuente,
+                "clave": clave,
+                "archivo": archivo,
+                "rangos": [(ini.isoformat(), fin.isoformat(), act) for ini, fin, act in rangos],
+            })
+    except FileNotFoundError:
+        if carpeta.exists():
+            raise
+        return      # otra escritura publicó algo más nuevo y limpió esta subcarpeta
+
+    tmp = RUTA / f"{MANIFIESTO}.{carpeta.name}.tmp"
+    tmp.write_text(json.dumps(info, ensure_ascii=False), encoding="utf-8")
+
+    # La app y el worker escriben instantáneas: publicar y limpiar va con el
+    # candado entre procesos del almacén, y el manifiesto sólo avanza
+    with store.exclusivo():
+        previa = _generacion_publicada()
+        if previa is not None and previa >= _generacion(carpeta.name):
+            # Otra escritura más nueva ya se publicó: ésta se descarta
+            tmp.unlink(missing_ok=True)
+            shutil.rmtree(carpeta, ignore_errors=True)
+            return
+        tmp.replace(RUTA / MANIFIESTO)
+
+        # Sólo las subcarpetas anteriores a la que estaba publicada: ya no se
+        # pueden publicar (una escritura en curso más nueva que ésa se conserva)
+        if previa is not None:
+            for vieja in RUTA.glob("g*"):
+                g = _generacion(vieja.name)
+                if vieja.is_dir() and g is not None and g < previa:
+                    shutil.rmtree(vieja, ignore_errors=True)
+
+
+def _generacion(nombre: str) -> int | None:
+    """'g<ms>' -> ms (None si no es una subcarpeta de instantánea)."""
+    return int(nombre[1:]) if nombre.startswith("g") and nombre[1:].isdigit() else None
+
+
+def _generacion_publicada() -> int | None:
+    """Generación de la subcarpeta a la que apunta el manifiesto (None si no hay o no se lee)."""
+    try:
+        info = json.loads((RUTA / MANIFIESTO).read_text(encoding="utf-8"))
+        return _generacion(Path(info["carpeta"]).name)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def escribir_en_fondo() -> None:
+    """escribir() en un hilo, sin bloquear el render (a lo más una escritura a la vez)."""
+    global _escribiendo
+    with _lock:
+        if _escribiendo or time.time() - _ultima_escritura < INTERVALO_SEG:
+            return
+        _escribiendo = True
+
+    def _correr():
+        global _escribiendo
+        try:
+            escribir()
+        except Exception:
+            log.exception("No se pudo escribir la instantánea")
+        finally:
+            with _lock:
+                _escribiendo = False
+
+    threading.Thread(target=_correr, daemon=True).start()
+
+
+def reiniciar() -> None:
+    global _cargada, _ultima_escritura, _escribiendo
+    with _lock:
+        _cargada = False
+        _ultima_escritura = 0.0
+        _escribiendo = False
+        _usadas.clear()
@@ -0,0 +1,194 @@
+"""
+Historia intradía reciente por ticker (para las sparklines de Mercados).
+
+Cada ticker de markets.TICKER_LABELS tiene un buffer circular de tamaño fijo
+(CAPACIDAD puntos: dos arreglos float64 de tiempo epoch y precio), así que la
+memoria queda acotada sin importar cuánto tiempo corra el servidor.
+
+- cargar(): una descarga intradía en lote (endpoint spark de Yahoo, hasta
+  SPARK_LOTE símbolos por petición, vía http_client: limitador, reintentos y
+  métricas http.yahoo) rellena los buffers; se repite cuando pasan
+  RECARGA_SEG. Sólo la llaman markets.get_snapshot (worker o cálculo de las
+  tablas), nunca el render de una página.
+- agregar_quotes(): cada sondeo de cotizaciones (snapshot / modo en vivo)
+  agrega el último precio de cada ticker.
+- serie(): lo que se pinta; sólo lee los buffers, nunca pide datos.
+"""
+import threading
+import time
+
+import numpy as np
+
+from app import config
+from app.data_sources import http_client, paralelo
+
+# Endpoint de velas de Yahoo (varios símbolos por petición). Con YAHOO_CHART_URL
+# se puede apuntar a otro servidor (p. ej. el de réplica de benchmarks/).
+YAHOO_CHART_URL = config.getenv("YAHOO_CHART_URL", "https://query1.finance.yahoo.com/v7/finance/spark")
+SPARK_LOTE = 20
+_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+INTERVALO = config.getenv("INTRADIA_INTERVALO", "5m")
+CAPACIDAD = int(config.getenv("INTRADIA_PUNTOS", "300"))      # 5m x 300 ≈ 25 h (cripto 24/7)
+RECARGA_SEG = int(config.getenv("INTRADIA_RECARGA_SEG", "900"))
+
+
+class Anillo:
+    """Buffer circular de (tiempo epoch s, precio) preasignado."""
+    __slots__ = ("ts", "valor", "n", "fin")
+
+    def __init__(self, capacidad: int = CAPACIDAD):
+        self.ts = np.zeros(capacidad, dtype=np.float64)
+        self.valor = np.zeros(capacidad, dtype=np.float64)
+        self.n = 0      # puntos válidos
+        self.fin = 0    # siguiente posición a escribir
+
+    def ultimo_ts(self) -> float | None:
+        return float(self.ts[self.fin - 1]) if self.n else None
+
+    def agregar(self, ts: float, valor: float) -> None:
+        """Agrega un punto; si llega con el mismo tiempo que el último, lo reemplaza."""
+        ultimo = self.ultimo_ts()
+        if ultimo is not None and ts < ultimo:
+            return
+        if ultimo is not None and ts == ultimo:
+            self.valor[self.fin - 1] = valor
+            return
+        cap = len(self.ts)
+        self.ts[self.fin] = ts
+        self.valor[self.fin] = valor
+        self.fin = (self.fin + 1) % cap
+        self.n = min(self.n + 1, cap)
+
+    def reemplazar(self, ts: np.ndarray, valor: np.ndarray) -> None:
+        """Sustituye el contenido por las últimas CAPACIDAD observaciones de (ts, valor)."""
+        cap = len(self.ts)
+        ts, valor = ts[-cap:], valor[-cap:]
+        k = len(ts)
+        self.ts[:k] = ts
+        self.valor[:k] = valor
+        self.n = k
+        self.fin = k % cap
+
+    def valores(self) -> np.ndarray:
+        """Precios en orden cronológico (copia)."""
+        if self.n < len(self.valor):
+            return self.valor[:self.n].copy()
+        return np.concatenate((self.valor[self.fin:], self.valor[:self.fin]))
+
+
+_lock = threading.Lock()
+_anillos: dict[str, Anillo] = {}
+_ultima_carga = 0.0
+
+
+def _anillo(ticker: str) -> Anillo:
+    a = _anillos.get(ticker)
+    if a is None:
+        a = _anillos[ticker] = Anillo()
+    return a
+
+
+def _pedir_velas(tickers: list[str]) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Velas intradía del último día de hasta SPARK_LOTE tickers en una petición."""
+    params = {
+        "symbols": ",".join(tickers),
+        "range": "1d",
+        "interval": INTERVALO,
+        "includePrePost": "true",
+    }
+    resp = http_client.get("yahoo", YAHOO_CHART_URL, params=params, headers=_HEADERS)
+    resp.raise_for_status()
+
+    series = {}
+    for r in (resp.json().get("spark") or {}).get("result") or []:
+        for d in r.get("response") or []:
+            quote = ((d.get("indicators") or {}).get("quote") or [{}])[0]
+            # null (vela sin operaciones) -> NaN
+            ts = np.array(d.get("timestamp") or [], dtype=np.float64)
+            cierre = np.array(quote.get("close") or [], dtype=np.float64)
+            n = min(len(ts), len(cierre))
+            ok = ~np.isnan(cierre[:n])
+            if ok.any():
+                series[r["symbol"]] = (ts[:n][ok], cierre[:n][ok])
+    return series
+
+
+def _descargar(tickers: list[str]) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Velas intradía de todos los tickers, en lotes de SPARK_LOTE pedidos a la vez."""
+    lotes = [tickers[i:i + SPARK_LOTE] for i in range(0, len(tickers), SPARK_LOTE)]
+    series = {}
+    for r in paralelo.a_la_vez([lambda l=l: _pedir_velas(l) for l in lotes]):
+        if not isinstance(r, Exception):
+            series.update(r)
+    return series
+
+
+def cargar(tickers, forzar: bool = False) -> None:
+    """Rellena los buffers con una descarga intradía si ya pasó RECARGA_SEG."""
+    global _ultima_carga
+    tickers = list(tickers)
+    with _lock:
+        if not forzar and time.time() - _ultima_carga < RECARGA_SEG:
+            return
+        _ultima_carga = time.time()
+
+    series = _descargar(tickers)
+    with _lock:
+        for t, (ts, valor) in series.items():
+            a = _anillo(t)
+            # Los puntos de sondeo más nuevos que la última vela se conservan
+            posteriores = [(x, v) for x, v in zip(a.ts[:a.n], a.valor[:a.n]) if x > ts[-1]] if a.n else []
+            a.reemplazar(ts, valor)
+            for x, v in sorted(posteriores):
+                a.agregar(float(x), float(v))
+
+
+def _punto_quote(q: dict, ahora: float) -> tuple[float, float] | None:
+    """
+    (tiempo, precio) más reciente de una cotización v7 (regular, pre o post).
+    Sin *MarketTime se toma la hora del sondeo.
+    """
+    candidatos = []
+    for precio, tiempo in (
+        ("regularMarketPrice", "regularMarketTime"),
+        ("preMarketPrice", "preMarketTime"),
+        ("postMarketPrice", "postMarketTime"),
+    ):
+        p, t = q.get(precio), q.get(tiempo)
+        if p is not None and t is None and precio == "regularMarketPrice":
+            t = ahora
+        if p is not None and t is not None:
+            try:
+                candidatos.append((float(t), float(p)))
+            except (TypeError, ValueError):
+                continue
+    return max(candidatos) if candidatos else None
+
+
+def agregar_quotes(quotes: dict) -> None:
+    """Agrega al buffer de cada ticker el precio de su cotización más reciente."""
+    ahora = time.time()
+    with _lock:
+        for t, q in quotes.items():
+            punto = _punto_quote(q or {}, ahora)
+            if punto is not None:
+                _anillo(t).agregar(*punto)
+
+
+def serie(ticker: str) -> list[float]:
+    """Precios intradía del ticker (lista, lo que espera LineChartColumn)."""
+    with _lock:
+        a = _anillos.get(ticker)
+        return a.valores().tolist() if a is not None else []
+
+
+def series(tickers) -> dict[str, list[float]]:
+    return {t: serie(t) for t in tickers}
+
+
+def reiniciar() -> None:
+    global _ultima_carga
+    with _lock:
+        _anillos.clear()
+        _ultima_carga = 0.0
@@ -0,0 +1,208 @@
+"""
+Lectura en flujo de respuestas de rango del SIE de Banxico.
+
+resp.json() arma en memoria todos los dicts de bmx.series[].datos antes de
+convertirlos a arreglos: con rangos diarios largos de muchas series el pico
+de memoria es varias veces el tamaño de la respuesta. Aquí la respuesta se
+lee por pedazos (resp.iter_content o, en async, aiter_bytes de httpx): el
+tramo del arreglo "datos" con las observaciones completas de cada pedazo se
+decodifica de una vez con json.loads (cualquier orden de llaves, 'dato' como
+texto o número), se convierte (parseo.py) y se copia a arreglos de NumPy
+reservados para su serie. Cada serie se entrega en cuanto
+termina: en memoria sólo están los arreglos de la serie en curso y un
+pedazo de texto.
+
+Supone la forma de las respuestas de SIE:
+    {"bmx": {"series": [{"idSerie": "...", "titulo": "...",
+                         "datos": [{"fecha": "dd/mm/yyyy", "dato": "1,234.5"}, ...]}]}}
+"""
+import codecs
+import json
+import re
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+import numpy as np
+
+from app.data_sources import parseo
+
+PEDAZO_BYTES = 64 * 1024
+
+_SERIE = re.compile(r'"idSerie"\s*:\s*"([^"]*)"')
+_TITULO = re.compile(r'"titulo"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_DATOS = re.compile(r'"datos"\s*:')
+# Fuera de las observaciones sólo puede haber puntuación de JSON
+_NO_ESTRUCTURA = re.compile(r'[^\s,\[\]{}]')
+# Cierre del documento: ...]}} (fin de 'series', de 'bmx' y del objeto raíz)
+_FIN = re.compile(r'\]\s*\}\s*\}\s*$')
+
+
+class Columnas:
+    """Arreglos (fecha, valor) reservados para una serie; crecen al doble si la estimación se queda corta."""
+
+    __slots__ = ("fechas", "valores", "n")
+
+    def __init__(self, capacidad: int):
+        capacidad = max(int(capacidad), 16)
+        self.fechas = np.empty(capacidad, dtype="datetime64[ns]")
+        self.valores = np.empty(capacidad, dtype=np.float64)
+        self.n = 0
+
+    def agregar(self, textos_fecha, textos_dato) -> None:
+        k = len(textos_fecha)
+        if self.n + k > len(self.fechas):
+            nueva = max(self.n + k, 2 * len(self.fechas))
+            self.fechas.resize(nueva, refcheck=False)
+            self.valores.resize(nueva, refcheck=False)
+        self.fechas[self.n:self.n + k] = parseo.fechas_ddmmyyyy(list(textos_fecha))
+        self.valores[self.n:self.n + k] = parseo.valores_a_float(list(textos_dato), nulos=("N/E",))
+        self.n += k
+
+    def cerrar(self) -> tuple[np.ndarray, np.ndarray]:
+        """Recorta los arreglos a lo ocupado (sin copiar) y los regresa."""
+        self.fechas.resize(self.n, refcheck=False)
+        self.valores.resize(self.n, refcheck=False)
+        return self.fechas, self.valores
+
+
+class _Lector:
+    """
+    Estado de la lectura de una respuesta: alimentar() recibe cada pedazo y
+    regresa las series que terminaron en él; terminar() valida el cierre del
+    documento y regresa la última. Lo comparten leer_series y aleer_series.
+    """
+
+    def __init__(self, capacidad: dict[str, int] | int = 0):
+        self.capacidad = capacidad
+        self.decodificador = codecs.getincrementaldecoder("utf-8")()
+        self.resto = ""
+        self.inicio = ""         # principio de la respuesta, para validar la forma
+        self.cola = ""           # final de lo leído, para confirmar que el documento cerró
+        self.actual = None       # (idSerie, titulo, Columnas)
+        self.datos_cerrados = False   # ya llegó el ']' del arreglo "datos" de la serie en curso
+
+    def _observaciones(self, texto: str, pos: int, corte: int) -> None:
+        """
+        Decodifica con json.loads las observaciones completas de texto[pos:corte]
+        (un tramo del arreglo "datos", hasta su ']') y las agrega a la serie en curso.
+        Cualquier otra forma lanza ValueError: nada se descarta en silencio.
+        """
+        if self.datos_cerrados:
+            _solo_estructura(texto, pos, corte)
+            return
+        fin = texto.find("]", pos, corte)
+        if fin >= 0:
+            self.datos_cerrados = True
+            _solo_estructura(texto, fin + 1, corte)
+        else:
+            fin = corte
+        i = texto.find("{", pos, fin)
+        _solo_estructura(texto, pos, fin if i < 0 else i)
+        if i < 0:
+            return
+        # JSONDecodeError es ValueError
+        obs = json.loads("[" + texto[i:fin].rstrip().rstrip(",") + "]")
+        if texto.count("{", i, fin) != len(obs):
+            raise ValueError(f"Observación de SIE anidada: {texto[i:i + 200]!r}")
+        try:
+            fechas = [o["fecha"] for o in obs]
+            datos = [o["dato"] for o in obs]
+        except (KeyError, TypeError):
+            raise ValueError(f"Observación de SIE sin 'fecha' / 'dato': {texto[i:i + 200]!r}") from None
+        self.actual[2].agregar(fechas, datos)
+
+    def alimentar(self, pedazo: bytes | None) -> list[tuple[str, str, np.ndarray, np.ndarray]]:
+        """Procesa un pedazo (None = fin de la respuesta); regresa las series completas."""
+        final = pedazo is None
+        listas = []
+        nuevo = self.decodificador.decode(pedazo or b"", final=final)
+        if len(self.inicio) < 1024:
+            self.inicio += nuevo[:1024]
+        self.cola = (self.cola + nuevo)[-64:]
+        texto = self.resto + nuevo
+        pos = 0
+        while True:
+            m = _SERIE.search(texto, pos)
+            # Observaciones completas hasta el siguiente encabezado o el último '}'
+            fin = m.start() if m else len(texto)
+            corte = fin if m or final else texto.rfind("}", pos, fin) + 1
+            if self.actual is not None and corte > pos:
+                self._observaciones(texto, pos, corte)
+            elif self.actual is None and texto.find('"datos"', pos, corte) >= 0:
+                raise ValueError(f"Respuesta de SIE con 'datos' antes de 'idSerie': {texto[pos:pos + 200]!r}")
+            if m is None:
+                self.resto = texto[max(corte, pos):]
+                return listas
+
+            # Encabezado nuevo: el título está completo cuando ya llegó "datos"
+            d = _DATOS.search(texto, m.end())
+            cierre = d.start() if d else len(texto)
+            if d is None and not final:
+                self.resto = texto[m.start():]
+                return listas
+            if _SERIE.search(texto, m.end(), cierre):
+                raise ValueError(f"Serie de SIE sin 'datos' después de 'idSerie': {texto[m.start():m.start() + 200]!r}")
+            if self.actual is not None:
+                listas.append((self.actual[0], self.actual[1], *self.actual[2].cerrar()))
+
+            serie_id = m.group(1)
+            t = _TITULO.search(texto, m.end(), cierre)
+            titulo = json.loads(f'"{t.group(1)}"') if t else ""
+            capacidad = self.capacidad
+            n = capacidad.get(serie_id, 0) if isinstance(capacidad, dict) else capacidad
+            self.actual = (serie_id, titulo, Columnas(n))
+            self.datos_cerrados = d is None
+            # Las observaciones empiezan después de "datos" (el título no se revisa como dato)
+            pos = d.end() if d else m.end()
+
+    def terminar(self) -> list[tuple[str, str, np.ndarray, np.ndarray]]:
+        """Fin de la respuesta: valida que cerró completa y regresa lo que quedaba."""
+        listas = self.alimentar(None)
+        if self.actual is None and '"bmx"' not in self.inicio:
+            raise ValueError(f"Respuesta de SIE sin 'bmx': {self.inicio[:200]!r}")
+        if not _FIN.search(self.cola):
+            raise ValueError(f"Respuesta de SIE incompleta (termina en {self.cola[-40:]!r})")
+        if self.actual is not None:
+            listas.append((self.actual[0], self.actual[1], *self.actual[2].cerrar()))
+        return listas
+
+
+def _solo_estructura(texto: str, a: int, b: int) -> None:
+    """Lanza ValueError si texto[a:b] trae algo más que puntuación (otra llave, datos en otra forma)."""
+    m = _NO_ESTRUCTURA.search(texto, a, b)
+    if m:
+        raise ValueError(f"Respuesta de SIE con forma inesperada: {texto[m.start():m.start() + 200]!r}")
+
+
+def leer_series(
+    pedazos: Iterable[bytes], capacidad: dict[str, int] | int = 0,
+) -> Iterator[tuple[str, str, np.ndarray, np.ndarray]]:
+    """
+    Recorre una respuesta de SIE (pedazos de bytes) y entrega, serie por serie,
+    (idSerie, titulo, fechas datetime64[ns], valores float64) en el orden de la
+    respuesta; 'N/E' y fechas inválidas quedan como NaN / NaT.
+
+    'capacidad' es la estimación de observaciones ({idSerie: n} o una para
+    todas) con la que se reservan los arreglos de cada serie.
+
+    Una serie se entrega cuando empieza la siguiente; la última, sólo si la
+    respuesta cerró completa. Si el cuerpo se corta antes (conexión caída),
+    lanza ValueError sin entregarla: sus datos parciales no deben guardarse
+    como si cubrieran todo el rango. También lanza ValueError si una
+    observación no trae 'fecha' y 'dato'.
+    """
+    lector = _Lector(capacidad)
+    for pedazo in pedazos:
+        yield from lector.alimentar(pedazo)
+    yield from lector.terminar()
+
+
+async def aleer_series(
+    pedazos: AsyncIterable[bytes], capacidad: dict[str, int] | int = 0,
+) -> AsyncIterator[tuple[str, str, np.ndarray, np.ndarray]]:
+    """Igual que leer_series sobre pedazos asíncronos (resp.aiter_bytes() de httpx)."""
+    lector = _Lector(capacidad)
+    async for pedazo in pedazos:
+        for serie in lector.alimentar(pedazo):
+            yield serie
+    for serie in lector.terminar():
+        yield serie
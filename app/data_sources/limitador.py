@@ -0,0 +1,212 @@
+"""
+Límite de peticiones por proveedor (token bucket) con cola de prioridad.
+
+FRED limita las peticiones por minuto por API key y el SIE de Banxico las
+consultas por token. Cada proveedor tiene una cubeta con capacidad RÁFAGA que
+se rellena a (N - RÁFAGA) / VENTANA tokens por segundo: en cualquier ventana
+de VENTANA segundos salen a lo más N peticiones, repartidas en el tiempo en
+lugar de agotarse de golpe y recibir 429.
+
+La cubeta vive en el almacén local (tabla 'cubetas' de store.py, ajustada en
+una transacción BEGIN IMMEDIATE): la app de Streamlit y el worker
+(python -m app.worker) son procesos distintos y comparten la misma cuota en
+lugar de tener una cada uno.
+
+Dentro de un proceso, cuando no hay token las peticiones esperan en una cola
+ordenada por prioridad (menor = antes) y, a igual prioridad, por llegada: las
+tarjetas y gráficas de las páginas (PRIORIDAD_INTERACTIVA) pasan antes que
+los rellenos de fondo del caché (PRIORIDAD_FONDO). Entre procesos no hay cola
+común; en su lugar, una petición de fondo (todas las del worker) sólo toma
+token si quedan más de la mitad de la ráfaga: esa reserva queda para las
+páginas, que así no esperan detrás de un relleno del worker.
+
+Límites configurables como "N/VENTANA_SEG", p. ej. HTTP_LIMITE_FRED=120/60,
+y ráfaga con HTTP_RAFAGA_FRED=12 (por defecto el 10 % de N, lo que pide una
+página en frío). El tiempo en cola queda en app.metricas como
+'cola.<proveedor>' junto con la profundidad de la cola.
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from app import config, metricas
+from app.data_sources import store
+
+PRIORIDAD_INTERACTIVA = 0
+PRIORIDAD_FONDO = 10
+
+# Cuotas publicadas (FRED: 120/min por key; SIE: 200 consultas / 5 min por token)
+_LIMITES_DEFECTO = {
+    "banxico": "200/300",
+    "fred": "120/60",
+    "yahoo": "60/60",
+}
+
+# Prioridad de las peticiones del contexto actual (hilo / tarea asyncio)
+_prioridad: contextvars.ContextVar[int | None] = contextvars.ContextVar("prioridad_http", default=None)
+_prioridad_defecto = PRIORIDAD_INTERACTIVA
+
+
+@contextmanager
+def prioridad(nivel: int):
+    """Las peticiones hechas dentro del bloque usan esta prioridad."""
+    token = _prioridad.set(nivel)
+    try:
+        yield
+    finally:
+        _prioridad.reset(token)
+
+
+def fijar_prioridad_defecto(nivel: int) -> None:
+    """Prioridad del proceso fuera de un bloque prioridad() (el worker usa PRIORIDAD_FONDO)."""
+    global _prioridad_defecto
+    _prioridad_defecto = nivel
+
+
+def prioridad_actual() -> int:
+    nivel = _prioridad.get()
+    return _prioridad_defecto if nivel is None else nivel
+
+
+class Cubeta:
+    """Token bucket compartido entre procesos, con cola de prioridad dentro del proceso."""
+
+    def __init__(self, nombre: str, limite: int, ventana_seg: float, rafaga: int | None = None):
+        if rafaga is None:
+            rafaga = limite // 10
+        rafaga = max(1, min(rafaga, limite - 1)) if limite > 1 else 1
+        self.nombre = nombre
+        self.capacidad = float(rafaga)
+        self.tasa = max(limite - rafaga, 1) / ventana_seg      # tokens por segundo
+        self.reserva = float(rafaga // 2)                       # sólo para PRIORIDAD_INTERACTIVA
+        self._cond = threading.Condition()
+        self._cola: list = []          # heap de (prioridad, llegada)
+        self._llegada = itertools.count()
+
+    def _tomar(self, prioridad: int) -> float:
+        """
+        Recarga la cubeta compartida y toma un token si alcanza: 0 si lo tomó,
+        si no los segundos que faltan. Una petición de fondo deja la reserva.
+        """
+        minimo = 1 + (self.reserva if prioridad >= PRIORIDAD_FONDO else 0)
+        with store.exclusivo() as con:
+            fila = con.execute("SELECT tokens, t FROM cubetas WHERE proveedor = ?", (self.nombre,)).fetchone()
+            ahora = time.time()
+            tokens, t = fila if fila else (self.capacidad, ahora)
+            tokens = min(self.capacidad, tokens + max(ahora - t, 0.0) * self.tasa)
+            espera = 0.0
+            if tokens >= minimo:
+                tokens -= 1
+            else:
+                espera = (minimo - tokens) / self.tasa
+            con.execute(
+                "INSERT OR REPLACE INTO cubetas (proveedor, tokens, t) VALUES (?, ?, ?)",
+                (self.nombre, tokens, ahora),
+            )
+        return espera
+
+    def intentar(self, prioridad: int = PRIORIDAD_INTERACTIVA) -> bool:
+        """Toma un token sin esperar, sólo si nadie del proceso está formado antes."""
+        with self._cond:
+            return not self._cola and self._tomar(prioridad) == 0
+
+    def adquirir(self, prioridad: int = PRIORIDAD_INTERACTIVA) -> None:
+        """Espera turno (por prioridad y llegada) y un token disponible."""
+        if self.intentar(prioridad):
+            return
+        with metricas.medir(f"cola.{self.nombre}"), self._cond:
+            turno = (prioridad, next(self._llegada))
+            heapq.heappush(self._cola, turno)
+            metricas.fijar_cola(f"cola.{self.nombre}", len(self._cola))
+            try:
+                while True:
+                    if self._cola[0] == turno:
+                        espera = self._tomar(prioridad)
+                        if espera == 0:
+                            heapq.heappop(self._cola)
+                            return
+                        # Primero de la cola: duerme justo lo que falta para el token
+                        self._cond.wait(espera)
+                    else:
+                        self._cond.wait()
+            finally:
+                self._salir(turno)
+
+    async def adquirir_async(self, prioridad: int = PRIORIDAD_INTERACTIVA) -> None:
+        """
+        Igual que adquirir() para corutinas: se forma en la misma cola, pero
+        espera con asyncio.sleep (el tiempo estimado para que le toque un
+        token) en lugar de ocupar un hilo bloqueado en la condición.
+        """
+        if self.intentar(prioridad):
+            return
+        with metricas.medir(f"cola.{self.nombre}"):
+            with self._cond:
+                turno = (prioridad, next(self._llegada))
+                heapq.heappush(self._cola, turno)
+                metricas.fijar_cola(f"cola.{self.nombre}", len(self._cola))
+            try:
+                while True:
+                    with self._cond:
+                        if self._cola[0] == turno:
+                            espera = self._tomar(prioridad)
+                            if espera == 0:
+                                heapq.heappop(self._cola)
+                                return
+                        else:
+                            # Un token por cada uno de los que van antes
+                            espera = sum(1 for t in self._cola if t < turno) / self.tasa
+                    await asyncio.sleep(max(espera, 0.001))
+            finally:
+                with self._cond:
+                    self._salir(turno)
+
+    def _salir(self, turno: tuple) -> None:
+        """Con _cond tomada: deja la cola (con token o por excepción / cancelación) y avisa a los demás."""
+        if turno in self._cola:
+            self._cola.remove(turno)
+            heapq.heapify(self._cola)
+        metricas.fijar_cola(f"cola.{self.nombre}", len(self._cola))
+        self._cond.notify_all()
+
+
+def _leer_limite(proveedor: str) -> tuple[int, float] | None:
+    valor = config.getenv(f"HTTP_LIMITE_{proveedor.upper()}", _LIMITES_DEFECTO.get(proveedor))
+    if not valor or valor.strip() in ("0", "none", "off"):
+        return None
+    n, _, ventana = valor.partition("/")
+    return int(n), float(ventana or 60)
+
+
+_cubetas: dict[str, Cubeta | None] = {}
+_lock = threading.Lock()
+
+
+def cubeta(proveedor: str) -> Cubeta | None:
+    """Cubeta compartida del proveedor (None si no tiene límite)."""
+    if proveedor not in _cubetas:
+        with _lock:
+            if proveedor not in _cubetas:
+                limite = _leer_limite(proveedor)
+                rafaga = config.getenv(f"HTTP_RAFAGA_{proveedor.upper()}")
+                _cubetas[proveedor] = (
+                    Cubeta(proveedor, *limite, rafaga=int(rafaga) if rafaga else None) if limite else None
+                )
+    return _cubetas[proveedor]
+
+
+def esperar_turno(proveedor: str) -> None:
+    c = cubeta(proveedor)
+    if c is not None:
+        c.adquirir(prioridad_actual())
+
+
+async def esperar_turno_async(proveedor: str) -> None:
+    """Igual que esperar_turno sin bloquear el event loop ni ocupar hilos."""
+    c = cubeta(proveedor)
+    if c is not None:
+        await c.adquirir_async(prioridad_actual())
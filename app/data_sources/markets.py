@@ -1,5 +1,11 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
-import yfinance as yf
+
+from app import config, metricas
+from app.data_sources import http_client, intradia
 
 
 # Tickers
@@ -9,7 +15,33 @@ COMMODITY_TICKERS = ["GC=F", "SI=F", "HG=F", "CL=F", "BZ=F", "NG=F"]
 PRIVATE_COMPANY_TICKERS = ["SPAX.PVT", "OPAI.PVT", "ANTH.PVT", "XAAI.PVT", "DATB.PVT"]
 MAG7_TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "TSLA"]
 
-
+# Universo completo: el snapshot se pide una sola vez para todas las tablas
+ALL_TICKERS = list(dict.fromkeys(
+    INDEX_TICKERS + CRYPTO_TICKERS + COMMODITY_TICKERS + PRIVATE_COMPANY_TICKERS + MAG7_TICKERS
+))
+
+# Endpoint de cotizaciones de Yahoo (acepta varios símbolos separados por coma).
+# Con YAHOO_QUOTE_URL se puede apuntar a otro servidor (p. ej. el de réplica de
+# benchmarks/); en ese caso se consulta directo, sin cookie/crumb de Yahoo.
+_YAHOO_QUOTE_URL_DEFAULT = "https://query1.finance.yahoo.com/v7/finance/quote"
+YAHOO_QUOTE_URL = config.getenv("YAHOO_QUOTE_URL", _YAHOO_QUOTE_URL_DEFAULT)
+
+# Vigencia del snapshot compartido entre tablas (segundos)
+SNAPSHOT_TTL_SEG = 30
+
+# Modo en vivo: cada cuánto se vuelve a pedir un ticker según su marketState
+VIVO_SEG = int(config.getenv("MERCADOS_VIVO_SEG", "15"))                  # REGULAR (y cripto 24/7)
+VIVO_EXTENDIDO_SEG = int(config.getenv("MERCADOS_VIVO_EXTENDIDO_SEG", "60"))   # PRE / POST
+VIVO_CERRADO_SEG = int(config.getenv("MERCADOS_CERRADO_SEG", "900"))       # CLOSED
+
+# Tickers de cada tabla (mismos nombres que app.data_sources.tablas)
+GRUPOS = {
+    "markets_mag7": MAG7_TICKERS,
+    "markets_indices": INDEX_TICKERS,
+    "markets_crypto": CRYPTO_TICKERS,
+    "markets_commodities": COMMODITY_TICKERS,
+    "markets_private": PRIVATE_COMPANY_TICKERS,
+}
 
 TICKER_LABELS = {
     "^DJI": "Dow Jones",
@@ -55,25 +87,187 @@ def _safe_float(x):
         return None
 
 
-def _get_daily_close_and_prev(ticker: str):
+def _fetch_quotes(tickers) -> dict:
+    """
+    Cotizaciones de todos los tickers en UNA sola petición (v7/finance/quote).
+    Regresa {ticker: dict con los mismos campos que yf.Ticker(t).info}.
+    """
+    params = {"symbols": ",".join(tickers), "formatted": "false"}
+    try:
+        if YAHOO_QUOTE_URL == _YAHOO_QUOTE_URL_DEFAULT:
+            from yfinance.data import YfData
+            with metricas.medir("yahoo.quote"):
+                data = YfData().get_raw_json(YAHOO_QUOTE_URL, params=params)
+        else:
+            resp = http_client.get("yahoo", YAHOO_QUOTE_URL, params=params)
+            resp.raise_for_status()
+            data = resp.json()
+    except Exception:
+        return {}
+
+    result = (data.get("quoteResponse") or {}).get("result") or []
+    return {q["symbol"]: q for q in result if q.get("symbol")}
+
+
+def _fetch_daily_closes(tickers) -> dict:
     """
-    Fallback robusto: último close diario y el anterior (para change%).
+    Fallback robusto: último close diario y el anterior (para change%),
+    descargados en una sola llamada multi-ticker.
+    Regresa {ticker: (last_close, prev_close)}.
     """
+    tickers = list(tickers)
+    if not tickers:
+        return {}
+
+    # yfinance tarda en importarse: sólo se carga cuando hace falta
+    import yfinance as yf
+
     try:
-        h = yf.Ticker(ticker).history(period="5d", interval="1d", auto_adjust=False)
-        if h is None or h.empty or "Close" not in h.columns:
-            return None, None
-        closes = h["Close"].dropna()
+        with metricas.medir("yahoo.download"):
+            h = yf.download(
+                tickers,
+                period="5d",
+                interval="1d",
+                auto_adjust=False,
+                group_by="ticker",
+                progress=False,
+                threads=True,
+            )
+    except Exception:
+        return {}
+
+    if h is None or h.empty:
+        return {}
+
+    closes_by_ticker = {}
+    for t in tickers:
+        try:
+            closes = h[t]["Close"].dropna()
+        except Exception:
+            continue
         if closes.empty:
-            return None, None
+            continue
         last_close = float(closes.iloc[-1])
         prev_close = float(closes.iloc[-2]) if len(closes) >= 2 else None
-        return last_close, prev_close
-    except Exception:
-        return None, None
+        closes_by_ticker[t] = (last_close, prev_close)
+
+    return closes_by_ticker
+
+
+# _snapshot_lock protege el estado y nunca se toma durante una descarga;
+# _descarga_lock deja una sola descarga a Yahoo a la vez: quien llega mientras
+# tanto espera y lee lo que trajo la otra en lugar de volver a pedirlo.
+_snapshot_lock = threading.Lock()
+_descarga_lock = threading.Lock()
+# 'ts_ticker': cuándo se pidió por última vez cada ticker (modo en vivo)
+_snapshot = {"ts": 0.0, "quotes": {}, "closes": {}, "ts_ticker": {}}
+
+
+def _necesitan_close(tickers, quotes: dict) -> list:
+    """Sólo los que no están en REGULAR (o sin precio) necesitan close diario."""
+    return [
+        t for t in tickers
+        if (quotes.get(t, {}).get("marketState") or "").upper().strip() != "REGULAR"
+        or _safe_float(quotes.get(t, {}).get("regularMarketPrice")) is None
+    ]
 
 
-def _pick_session_price(info: dict, ticker: str):
+def get_snapshot(max_age: float = SNAPSHOT_TTL_SEG) -> dict:
+    """
+    Snapshot compartido de todo ALL_TICKERS: cotizaciones en una petición y,
+    para los que no están en sesión regular, closes diarios en otra.
+    Se reutiliza mientras tenga menos de 'max_age' segundos.
+    """
+    global _snapshot
+    if time.time() - _snapshot["ts"] < max_age:
+        return _snapshot
+    with _descarga_lock:
+        if time.time() - _snapshot["ts"] < max_age:
+            return _snapshot        # lo trajo otra llamada mientras se esperaba
+
+        # La descarga intradía (sparklines) corre a la par de las cotizaciones
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            velas = pool.submit(intradia.cargar, ALL_TICKERS)
+            quotes = _fetch_quotes(ALL_TICKERS)
+            closes = _fetch_daily_closes(_necesitan_close(ALL_TICKERS, quotes))
+            velas.result()
+        intradia.agregar_quotes(quotes)
+
+        ahora = time.time()
+        with _snapshot_lock:
+            _snapshot = {
+                "ts": ahora,
+                "quotes": quotes,
+                "closes": closes,
+                "ts_ticker": dict.fromkeys(ALL_TICKERS, ahora),
+            }
+        return _snapshot
+
+
+def estado_mercado(ticker: str) -> str:
+    """marketState del ticker en el snapshot ('REGULAR', 'PRE', 'POST', 'CLOSED'...) o ''."""
+    return ((_snapshot["quotes"].get(ticker) or {}).get("marketState") or "").upper().strip()
+
+
+def intervalo_vivo(tickers) -> int:
+    """
+    Cada cuánto conviene volver a pedir estos tickers: VIVO_SEG si alguno está
+    en sesión regular (o aún no se conoce su estado), VIVO_EXTENDIDO_SEG en
+    pre/post y VIVO_CERRADO_SEG si todos están cerrados.
+    """
+    estados = {estado_mercado(t) for t in tickers}
+    if "REGULAR" in estados or "" in estados:
+        return VIVO_SEG
+    if any(e.startswith(("PRE", "POST")) for e in estados):
+        return VIVO_EXTENDIDO_SEG
+    return VIVO_CERRADO_SEG
+
+
+def _vencidos(tickers, ahora: float) -> list:
+    """Tickers cuya cotización ya venció según su propio marketState (intervalo_vivo)."""
+    with _snapshot_lock:
+        return [t for t in tickers if ahora - _snapshot["ts_ticker"].get(t, 0.0) >= intervalo_vivo([t])]
+
+
+def refrescar_tickers() -> dict:
+    """
+    Vuelve a pedir, en una sola llamada para todo ALL_TICKERS, sólo los
+    tickers vencidos (los cerrados, cada VIVO_CERRADO_SEG). Las tablas en vivo
+    llaman a la vez: la primera descarga lo de todas y las demás leen el
+    resultado. Regresa el snapshot actualizado.
+    """
+    if not _vencidos(ALL_TICKERS, time.time()):
+        return _snapshot
+    with _descarga_lock:
+        ahora = time.time()
+        vencidos = _vencidos(ALL_TICKERS, ahora)
+        if vencidos:
+            quotes = _fetch_quotes(vencidos)
+            closes = _fetch_daily_closes(_necesitan_close(vencidos, quotes))
+            intradia.agregar_quotes(quotes)
+            with _snapshot_lock:
+                _snapshot["quotes"].update(quotes)
+                _snapshot["closes"].update(closes)
+                for t in vencidos:
+                    _snapshot["ts_ticker"][t] = ahora
+    return _snapshot
+
+
+def tabla_vivo(nombre: str) -> pd.DataFrame:
+    """Tabla 'nombre' (ver GRUPOS) con los tickers vencidos del universo ya refrescados."""
+    return _latest_price(GRUPOS[nombre], refrescar_tickers())
+
+
+def sparklines(tickers) -> dict[str, list[float]]:
+    """
+    Precios intradía recientes por ticker para las sparklines de las tablas.
+    Sólo lee los buffers de app.data_sources.intradia (los llena get_snapshot
+    y cada sondeo en vivo); nunca pide datos.
+    """
+    return intradia.series(tickers)
+
+
+def _pick_session_price(info: dict, ticker: str, closes: tuple | None = None):
     """
     Regla A:
     - Si mercado abierto: regularMarketPrice y % vs regularMarketPreviousClose
@@ -98,7 +292,7 @@ def _pick_session_price(info: dict, ticker: str):
         session = "Regular"
     else:
         # Cerrado (o Yahoo no dio regularMarketPrice): usamos close diario real
-        last_close, prev_close = _get_daily_close_and_prev(ticker)
+        last_close, prev_close = closes if closes is not None else (None, None)
         price = last_close if last_close is not None else reg_price
         base = prev_close if prev_close is not None else reg_prev_close
         session = "Close"
@@ -128,18 +322,19 @@ def _pick_session_price(info: dict, ticker: str):
     return price, change_pct, session, after_row
 
 
-def _latest_price(tickers):
+def _latest_price(tickers, snapshot: dict | None = None):
+    if snapshot is None:
+        snapshot = get_snapshot()
     rows = []
+    spark = sparklines(tickers)
 
     for t in tickers:
         name = TICKER_LABELS.get(t, t)
-        try:
-            tk = yf.Ticker(t)
-            info = tk.info or {}
-        except Exception:
-            info = {}
+        info = snapshot["quotes"].get(t) or {}
 
-        price, change_pct, session, after_row = _pick_session_price(info, t)
+        price, change_pct, session, after_row = _pick_session_price(
+            info, t, snapshot["closes"].get(t)
+        )
 
         if price is None:
             # Si no pudimos obtener nada, lo omitimos para no romper tablas
@@ -151,6 +346,7 @@ def _latest_price(tickers):
                 "ticker": t,
                 "price": float(price),
                 "change_pct": float(change_pct) if change_pct is not None else None,
+                "tendencia": spark.get(t, []),
                 "session": session,
             }
         )
@@ -163,6 +359,7 @@ def _latest_price(tickers):
                     "ticker": t,
                     "price": float(after_row["price"]),
                     "change_pct": float(after_row["change_pct"]) if after_row["change_pct"] is not None else None,
+                    "tendencia": spark.get(t, []),
                     "session": after_row["session"],
                 }
             )
@@ -171,10 +368,10 @@ def _latest_price(tickers):
 
     # Si quedó vacío, regresa columnas esperadas (evita errores en Streamlit)
     if df.empty:
-        return pd.DataFrame(columns=["name", "ticker", "price", "change_pct", "session"])
+        return pd.DataFrame(columns=["name", "ticker", "price", "change_pct", "tendencia", "session"])
 
-    # Orden de columnas
-    return df[["name", "ticker", "price", "change_pct", "session"]]
+    # Orden de columnas ('tendencia': precios intradía para la sparkline)
+    return df[["name", "ticker", "price", "change_pct", "tendencia", "session"]]
 
 
 # -----------------------
@@ -194,3 +391,33 @@ def get_commodities_table():
 def get_mag7_table():
     return _latest_price(MAG7_TICKERS)
 
+
+
+def get_history(ticker: str, start: str, end: str | None = None) -> pd.DataFrame:
+    """
+    Cierres diarios de 'ticker' entre start y end (YYYY-MM-DD).
+    Regresa DataFrame con columnas: fecha (datetime), valor (float)
+    """
+    import yfinance as yf
+
+    with metricas.medir("yahoo.download"):
+        h = yf.download(
+            ticker,
+            start=start,
+            end=end,
+            interval="1d",
+            auto_adjust=False,
+            progress=False,
+            multi_level_index=False,
+        )
+    if h is None or h.empty or "Close" not in h.columns:
+        return pd.DataFrame({
+            "fecha": pd.Series(dtype="datetime64[ns]"),
+            "valor": pd.Series(dtype="float64"),
+        })
+
+    closes = h["Close"].dropna()
+    return pd.DataFrame({
+        "fecha": pd.to_datetime(closes.index).tz_localize(None),
+        "valor": closes.to_numpy(dtype=float),
+    })
@@ -0,0 +1,137 @@
+"""
+Panel de varias series (Banxico, FRED y derivadas) alineadas por fecha.
+
+get_panel(["fix", "policy_rate"], "2015-01-01", None, freq="M") regresa un
+DataFrame ancho: índice 'fecha' y una columna por clave. Las series se leen
+del almacén local de forma concurrente (sólo se descargan los huecos) y se
+alinean en bloque con pandas:
+- freq=None / "D": unión de fechas,
+- "W", "M", "Q": remuestreo de todas las columnas a la vez con 'last' o 'mean'
+  (diaria -> mensual, quincenal -> mensual, ...),
+- asof=True: cada fecha toma el último dato publicado en o antes de ella
+  (forward-fill), útil para comparar series de distinta frecuencia.
+"""
+import asyncio
+import datetime as dt
+
+import pandas as pd
+
+from app.data_sources import banxico, derivadas, fred_api, fuentes, paralelo
+
+# freq de get_panel -> regla de pandas
+FRECUENCIAS_PANEL = {
+    "D": "D",
+    "W": "W-FRI",
+    "M": "ME",
+    "Q": "QE",
+}
+
+AGREGACIONES = ("last", "mean")
+
+
+def fuente_de(clave: str) -> str:
+    """'banxico', 'fred' o 'derivada' según el catálogo donde está la clave."""
+    if clave in banxico.SERIES_IDS:
+        return "banxico"
+    if clave in fred_api.FRED_SERIES:
+        return "fred"
+    if clave in derivadas.DERIVADAS:
+        return "derivada"
+    raise KeyError(f"Clave no válida: {clave}")
+
+
+def frecuencia_de(clave: str) -> str:
+    fuente = fuente_de(clave)
+    if fuente == "banxico":
+        return banxico.FRECUENCIAS.get(clave, "diaria")
+    if fuente == "derivada":
+        return derivadas.frecuencia(clave)
+    return fred_api.FRECUENCIAS.get(fred_api.FRED_SERIES[clave], "mensual")
+
+
+def _leer_fuentes(keys: list[str], start: str, end: str) -> tuple[dict, dict]:
+    """
+    Lee todas las series con las fuentes asíncronas, en un solo event loop
+    (las derivadas, que son síncronas, en hilos del mismo loop).
+    """
+    por_fuente: dict[str, list[str]] = {}
+    for k in keys:
+        por_fuente.setdefault(fuente_de(k), []).append(k)
+    calculadas = por_fuente.pop("derivada", [])
+
+    corutinas = {f: fuentes.FUENTES[f].batch(claves, start, end) for f, claves in por_fuente.items()}
+    corutinas.update({k: asyncio.to_thread(derivadas.serie, k, start, end) for k in calculadas})
+    lotes, errores = fuentes.ejecutar(corutinas)
+
+    resultados = {k: df for f in por_fuente if f in lotes for k, df in lotes[f].items()}
+    resultados.update({k: lotes[k] for k in calculadas if k in lotes})
+    errores_clave = {k: errores[f] for f, claves in por_fuente.items() if f in errores for k in claves}
+    errores_clave.update({k: errores[k] for k in calculadas if k in errores})
+    return resultados, errores_clave
+
+
+def get_panel(
+    keys: list[str],
+    start: str = "2015-01-01",
+    end: str | None = None,
+    freq: str | None = "M",
+    how: str = "last",
+    asof: bool = True,
+    lectores: dict | None = None,
+) -> pd.DataFrame:
+    """
+    DataFrame ancho (índice 'fecha', una columna por clave) entre start y end.
+
+    Por defecto las series se leen con las fuentes asíncronas de fuentes.py
+    (todas en un mismo event loop). 'lectores' permite inyectar funciones
+    síncronas ({fuente: fn(clave, start=..., end=...) -> DataFrame(fecha, valor)}),
+    que se corren en hilos; las derivadas usan derivadas.serie si no se da
+    un lector "derivada".
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="fecha"))
+    if freq is not None and freq not in FRECUENCIAS_PANEL:
+        raise ValueError(f"freq no válida: {freq} (usa {', '.join(FRECUENCIAS_PANEL)} o None)")
+    if how not in AGREGACIONES:
+        raise ValueError(f"how no válido: {how} (usa {', '.join(AGREGACIONES)})")
+
+    if end is None:
+        end = dt.date.today().isoformat()
+
+    # Con as-of se pide un poco antes de 'start' para tener valor desde el inicio
+    # (la ventana con la que banxico asegura al menos un dato publicado)
+    margen = max(banxico._VENTANA_DIAS.get(frecuencia_de(k), 100) for k in keys) if asof else 0
+    desde = (dt.date.fromisoformat(start) - dt.timedelta(days=margen)).isoformat()
+
+    if lectores is None:
+        resultados, errores = _leer_fuentes(keys, desde, end)
+    else:
+        lectores = {"derivada": derivadas.serie, **lectores}
+        pedidos = {k: (lambda k=k: lectores[fuente_de(k)](k, start=desde, end=end)) for k in keys}
+        resultados, errores = paralelo.en_paralelo(pedidos)
+    if errores and not resultados:
+        raise next(iter(errores.values()))
+
+    # Formato largo -> ancho en una sola operación
+    partes = [df[["fecha", "valor"]].assign(clave=k) for k, df in resultados.items() if df is not None]
+    if not partes:
+        return pd.DataFrame(columns=keys, index=pd.DatetimeIndex([], name="fecha"), dtype=float)
+    largo = pd.concat(partes, ignore_index=True)
+    ancho = (
+        largo.pivot_table(index="fecha", columns="clave", values="valor", aggfunc="last")
+        .reindex(columns=keys)
+        .sort_index()
+    )
+    ancho.columns.name = None
+
+    if freq is not None:
+        ancho = getattr(ancho.resample(FRECUENCIAS_PANEL[freq]), how)()
+    if asof:
+        ancho = ancho.ffill()
+
+    # Con remuestreo la etiqueta es el fin del periodo: el periodo que contiene
+    # 'start' queda incluido y el que contiene 'end' también
+    ancho = ancho.loc[pd.Timestamp(start):]
+    ancho.index.name = "fecha"
+    return ancho.dropna(how="all")
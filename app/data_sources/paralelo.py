@@ -0,0 +1,63 @@
+"""
+Ejecución de consultas a la vez (hilos o corutinas), con el contexto del llamador.
+
+Cada hilo corre con una copia de los contextvars de quien llama (p. ej. la
+prioridad del limitador de peticiones): lo que pida una página sale con
+PRIORIDAD_INTERACTIVA aunque se haga desde el pool. Los errores no se
+propagan aquí; cada llamador decide si un fallo parcial es aceptable.
+"""
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+
+def en_paralelo(pedidos: dict) -> tuple[dict, dict]:
+    """
+    Ejecuta cada función de 'pedidos' en un hilo propio.
+    Regresa ({nombre: resultado}, {nombre: excepción}) aislando los errores.
+    """
+    resultados, errores = {}, {}
+    with ThreadPoolExecutor(max_workers=len(pedidos) or 1) as pool:
+        futuros = {
+            nombre: pool.submit(contextvars.copy_context().run, fn)
+            for nombre, fn in pedidos.items()
+        }
+        for nombre, fut in futuros.items():
+            try:
+                resultados[nombre] = fut.result()
+            except Exception as e:
+                errores[nombre] = e
+    return resultados, errores
+
+
+def a_la_vez(fabricas: list, max_hilos: int | None = None) -> list:
+    """
+    Corre las funciones a la vez (hasta 'max_hilos' hilos; sin límite, uno
+    por función). Regresa, en el mismo orden, el resultado de cada una o su
+    excepción.
+    """
+    def _una(fn):
+        try:
+            return fn()
+        except Exception as e:
+            return e
+
+    if len(fabricas) <= 1:
+        return [_una(f) for f in fabricas]
+    with ThreadPoolExecutor(max_workers=min(max_hilos or len(fabricas), len(fabricas))) as pool:
+        futuros = [pool.submit(contextvars.copy_context().run, _una, f) for f in fabricas]
+        return [f.result() for f in futuros]
+
+
+async def a_la_vez_async(fabricas: list, max_simultaneas: int | None = None) -> list:
+    """
+    Igual que a_la_vez para corutinas: 'fabricas' regresa cada una y se
+    esperan a lo más 'max_simultaneas' a la vez.
+    """
+    limite = asyncio.Semaphore(max_simultaneas or len(fabricas) or 1)
+
+    async def _una(fabrica):
+        async with limite:
+            return await fabrica()
+
+    return await asyncio.gather(*(_una(f) for f in fabricas), return_exceptions=True)
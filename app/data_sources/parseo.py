@@ -0,0 +1,89 @@
+"""
+Conversión vectorizada de observaciones (texto JSON -> arreglos NumPy).
+
+Las APIs regresan fechas y valores como texto, con centinelas de "sin dato"
+('N/E' en SIE, '.' en FRED). Aquí se convierten columnas completas de una vez
+en lugar de hacer strptime / float() observación por observación.
+"""
+import numpy as np
+import pandas as pd
+
+
+def valores_a_float(textos: list, nulos: tuple = ("N/E",)) -> np.ndarray:
+    """
+    Lista de textos ('1,234.5', 'N/E', ...) -> arreglo float64 con NaN en los
+    centinelas 'nulos' y en los vacíos. Las comas de miles se eliminan; los
+    números que ya vienen como número JSON también se aceptan.
+    """
+    if not textos:
+        return np.empty(0, dtype=np.float64)
+
+    nulos = set(nulos) | {""}
+    try:
+        valores = np.array(
+            ["nan" if t is None or t in nulos else t.replace(",", "") for t in textos],
+            dtype=np.float64,
+        )
+    except (ValueError, TypeError, AttributeError):
+        # AttributeError: un número JSON (float / int) no tiene .replace
+        valores = None
+
+    if valores is None:
+        # Algún valor no numérico: camino lento pero tolerante
+        serie = pd.Series(textos, dtype=object).astype(str).str.replace(",", "", regex=False)
+        valores = pd.to_numeric(serie, errors="coerce").to_numpy(dtype=np.float64)
+
+    return valores
+
+
+def fechas_ddmmyyyy(textos: list) -> np.ndarray:
+    """
+    Lista de fechas 'dd/mm/yyyy' -> arreglo datetime64[ns] (NaT si no es válida),
+    calculado con aritmética sobre los bytes en lugar de strptime.
+    """
+    if not textos:
+        return np.empty(0, dtype="datetime64[ns]")
+
+    # Un byte de más (S11) para distinguir 'dd/mm/yyyy' de textos más largos
+    try:
+        b = np.array(textos, dtype="S11")
+    except UnicodeEncodeError:
+        # Texto no ASCII: nunca es una fecha válida, pero no debe romper el lote
+        b = np.char.encode(np.array(textos, dtype=str), "ascii", "replace").astype("S11")
+    largo = np.char.str_len(b)
+    d = b.view(np.uint8).reshape(-1, 11)[:, :10].astype(np.int64) - ord("0")
+
+    dia = d[:, 0] * 10 + d[:, 1]
+    mes = d[:, 3] * 10 + d[:, 4]
+    anio = d[:, 6] * 1000 + d[:, 7] * 100 + d[:, 8] * 10 + d[:, 9]
+
+    digitos = d[:, [0, 1, 3, 4, 6, 7, 8, 9]]
+    validas = (
+        (largo == 10)
+        & ((digitos >= 0) & (digitos <= 9)).all(axis=1)
+        & (d[:, 2] == ord("/") - ord("0"))
+        & (d[:, 5] == ord("/") - ord("0"))
+        & (mes >= 1) & (mes <= 12) & (dia >= 1) & (dia <= 31)
+        & (anio >= 1000) & (anio <= 9999)
+    )
+    mes = np.where(validas, mes, 1)
+    dia = np.where(validas, dia, 1)
+    anio = np.where(validas, anio, 1970)
+
+    meses = (anio - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (mes - 1)
+    fechas = meses.astype("datetime64[D]") + (dia - 1)
+    # Un día que no existe en el mes (31/02) se pasaría al mes siguiente
+    validas &= fechas.astype("datetime64[M]") == meses
+    fechas = fechas.astype("datetime64[ns]")
+    fechas[~validas] = np.datetime64("NaT")
+    return fechas
+
+
+def fechas_iso(textos: list) -> np.ndarray:
+    """Lista de fechas 'YYYY-MM-DD' -> arreglo datetime64[ns]."""
+    if not textos:
+        return np.empty(0, dtype="datetime64[ns]")
+    try:
+        return np.array(textos, dtype="datetime64[D]").astype("datetime64[ns]")
+    except ValueError:
+        return pd.to_datetime(pd.Series(textos), errors="coerce").to_numpy()
@@ -0,0 +1,294 @@
+"""
+Almacén local (SQLite) de series de tiempo.
+
+Guarda las observaciones por (fuente, clave) y los rangos de fechas que ya se
+consultaron a la API, para que sólo se pidan los huecos que faltan y las
+consultas por rango se resuelvan desde disco.
+"""
+import io
+import sqlite3
+import threading
+import time
+import datetime as dt
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from app import config
+
+ROOT_DIR = Path(__file__).resolve().parents[2]   # Economic_Dashboard/
+DATA_DIR = Path(config.getenv("DASHBOARD_DATA_DIR", str(ROOT_DIR / "data")))
+DB_PATH = DATA_DIR / "series.sqlite"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS observaciones (
+    fuente TEXT NOT NULL,
+    clave  TEXT NOT NULL,
+    fecha  TEXT NOT NULL,          -- YYYY-MM-DD
+    valor  REAL,
+    PRIMARY KEY (fuente, clave, fecha)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rangos (
+    fuente      TEXT NOT NULL,
+    clave       TEXT NOT NULL,
+    inicio      TEXT NOT NULL,     -- YYYY-MM-DD (inclusive)
+    fin         TEXT NOT NULL,     -- YYYY-MM-DD (inclusive)
+    actualizado REAL NOT NULL      -- epoch de la última descarga
+);
+CREATE INDEX IF NOT EXISTS idx_rangos ON rangos (fuente, clave);
+
+CREATE TABLE IF NOT EXISTS cubetas (
+    proveedor TEXT PRIMARY KEY,    -- límite de peticiones (limitador.py)
+    tokens    REAL NOT NULL,
+    t         REAL NOT NULL        -- epoch del último ajuste
+);
+
+CREATE TABLE IF NOT EXISTS tablas (
+    nombre      TEXT PRIMARY KEY,  -- p. ej. 'banxico_latest'
+    datos       BLOB NOT NULL,     -- DataFrame serializado (parquet)
+    actualizado REAL NOT NULL
+);
+"""
+
+_init_lock = threading.Lock()
+_inicializado = False
+
+_UN_DIA = dt.timedelta(days=1)
+
+
+def _conectar() -> sqlite3.Connection:
+    global _inicializado
+    if not _inicializado:
+        with _init_lock:
+            if not _inicializado:
+                DATA_DIR.mkdir(parents=True, exist_ok=True)
+                con = sqlite3.connect(DB_PATH, timeout=30)
+                con.execute("PRAGMA journal_mode=WAL")
+                con.executescript(_ESQUEMA)
+                con.close()
+                _inicializado = True
+
+    return sqlite3.connect(DB_PATH, timeout=30)
+
+
+@contextmanager
+def _conexion():
+    # Una conexión por llamada: sqlite3 no comparte conexiones entre hilos
+    # y Streamlit atiende cada sesión en un hilo distinto.
+    con = _conectar()
+    try:
+        with con:
+            yield con
+    finally:
+        con.close()
+
+
+@contextmanager
+def exclusivo():
+    """
+    Candado entre procesos (la app y el worker comparten este archivo): una
+    transacción de escritura (BEGIN IMMEDIATE) que nadie más puede abrir
+    mientras dura. Para operaciones cortas; regresa la conexión.
+    """
+    con = _conectar()
+    con.isolation_level = None
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            yield con
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        con.execute("COMMIT")
+    finally:
+        con.close()
+
+
+def _leer_rangos(con, fuente: str, clave: str) -> list[tuple[dt.date, dt.date, float]]:
+    cur = con.execute(
+        "SELECT inicio, fin, actualizado FROM rangos WHERE fuente = ? AND clave = ?",
+        (fuente, clave),
+    )
+    return [
+        (dt.date.fromisoformat(ini), dt.date.fromisoformat(fin), float(act))
+        for ini, fin, act in cur.fetchall()
+    ]
+
+
+def rangos_faltantes(
+    fuente: str,
+    clave: str,
+    start: dt.date,
+    end: dt.date,
+    relectura_dias: int = 0,
+    ttl_seg: float = 3600.0,
+) -> list[tuple[dt.date, dt.date]]:
+    """
+    Regresa los huecos [(inicio, fin), ...] de [start, end] que no están en disco.
+
+    Los últimos 'relectura_dias' de un rango guardado se consideran vencidos
+    cuando la descarga tiene más de 'ttl_seg' segundos: así se recogen datos
+    publicados más tarde en el día y revisiones recientes.
+    """
+    hoy = dt.date.today()
+    end = min(end, hoy)
+    if end < start:
+        return []
+
+    with _conexion() as con:
+        guardados = _leer_rangos(con, fuente, clave)
+
+    ahora = time.time()
+    limite_relectura = hoy - dt.timedelta(days=relectura_dias)
+
+    cubiertos = []
+    for ini, fin, act in guardados:
+        if relectura_dias and fin >= limite_relectura and ahora - act > ttl_seg:
+            fin = min(fin, limite_relectura - _UN_DIA)
+        if fin >= ini:
+            cubiertos.append((ini, fin))
+    cubiertos.sort()
+
+    huecos = []
+    cursor = start
+    for ini, fin in cubiertos:
+        if fin < cursor:
+            continue
+        if ini > end:
+            break
+        if ini > cursor:
+            huecos.append((cursor, min(ini - _UN_DIA, end)))
+        cursor = max(cursor, fin + _UN_DIA)
+        if cursor > end:
+            break
+
+    if cursor <= end:
+        huecos.append((cursor, end))
+
+    return huecos
+
+
+def rangos(fuente: str, clave: str) -> list[tuple[dt.date, dt.date, float]]:
+    """Rangos ya consultados de una serie: [(inicio, fin, actualizado), ...]."""
+    with _conexion() as con:
+        return _leer_rangos(con, fuente, clave)
+
+
+def guardar(
+    fuente: str,
+    clave: str,
+    df: pd.DataFrame,
+    start: dt.date,
+    end: dt.date,
+    actualizado: float | None = None,
+) -> None:
+    """
+    Reemplaza en disco las observaciones de [start, end] con las de 'df'
+    (columnas fecha, valor) y marca ese rango como consultado (ahora, o en
+    'actualizado' si los datos vienen de una copia guardada).
+    """
+    end = min(end, dt.date.today())
+    if end < start:
+        return
+
+    filas = []
+    if df is not None and not df.empty:
+        fechas = pd.to_datetime(df["fecha"]).dt.strftime("%Y-%m-%d")
+        valores = pd.to_numeric(df["valor"], errors="coerce")
+        filas = [
+            (fuente, clave, f, None if pd.isna(v) else float(v))
+            for f, v in zip(fechas, valores)
+        ]
+
+    ahora = time.time() if actualizado is None else actualizado
+    with _conexion() as con:
+        con.execute(
+            "DELETE FROM observaciones WHERE fuente = ? AND clave = ? AND fecha BETWEEN ? AND ?",
+            (fuente, clave, start.isoformat(), end.isoformat()),
+        )
+        con.executemany(
+            "INSERT OR REPLACE INTO observaciones (fuente, clave, fecha, valor) VALUES (?, ?, ?, ?)",
+            filas,
+        )
+
+        # Unimos el rango nuevo con los existentes que se traslapan o tocan
+        rangos = _leer_rangos(con, fuente, clave) + [(start, end, ahora)]
+        rangos.sort()
+        unidos: list[list] = []
+        for ini, fin, act in rangos:
+            if unidos and ini <= unidos[-1][1] + _UN_DIA:
+                ultimo = unidos[-1]
+                # La fecha de actualización es la del rango que aporta el final
+                if fin > ultimo[1] or (fin == ultimo[1] and act > ultimo[2]):
+                    ultimo[1], ultimo[2] = fin, act
+            else:
+                unidos.append([ini, fin, act])
+
+        con.execute("DELETE FROM rangos WHERE fuente = ? AND clave = ?", (fuente, clave))
+        con.executemany(
+            "INSERT INTO rangos (fuente, clave, inicio, fin, actualizado) VALUES (?, ?, ?, ?, ?)",
+            [(fuente, clave, ini.isoformat(), fin.isoformat(), act) for ini, fin, act in unidos],
+        )
+
+
+def leer(fuente: str, clave: str, start: dt.date, end: dt.date) -> pd.DataFrame:
+    """
+    Lee de disco las observaciones de [start, end].
+    Regresa DataFrame con columnas: fecha (datetime), valor (float)
+    """
+    with _conexion() as con:
+        df = pd.read_sql_query(
+            "SELECT fecha, valor FROM observaciones "
+            "WHERE fuente = ? AND clave = ? AND fecha BETWEEN ? AND ? AND valor IS NOT NULL "
+            "ORDER BY fecha",
+            con,
+            params=(fuente, clave, start.isoformat(), end.isoformat()),
+        )
+    df["fecha"] = pd.to_datetime(df["fecha"])
+    df["valor"] = df["valor"].astype(float)
+    return df
+
+
+def guardar_tabla(nombre: str, df: pd.DataFrame, actualizado: float | None = None) -> None:
+    """Guarda un resultado ya calculado (tarjetas, tablas de mercados...)."""
+    datos = df.to_parquet()
+    with _conexion() as con:
+        con.execute(
+            "INSERT OR REPLACE INTO tablas (nombre, datos, actualizado) VALUES (?, ?, ?)",
+            (nombre, datos, time.time() if actualizado is None else actualizado),
+        )
+
+
+def leer_tabla(nombre: str) -> tuple[pd.DataFrame, float] | None:
+    """Regresa (df, actualizado) de una tabla guardada, o None si no existe."""
+    with _conexion() as con:
+        fila = con.execute(
+            "SELECT datos, actualizado FROM tablas WHERE nombre = ?", (nombre,)
+        ).fetchone()
+    df = _a_frame(fila[0]) if fila is not None else None
+    if df is None:
+        return None
+    return df, float(fila[1])
+
+
+def leer_tablas() -> dict[str, tuple[pd.DataFrame, float]]:
+    """Todas las tablas guardadas: {nombre: (df, actualizado)}."""
+    with _conexion() as con:
+        filas = con.execute("SELECT nombre, datos, actualizado FROM tablas").fetchall()
+    tablas = {}
+    for nombre, datos, act in filas:
+        df = _a_frame(datos)
+        if df is not None:
+            tablas[nombre] = (df, float(act))
+    return tablas
+
+
+def _a_frame(datos: bytes) -> pd.DataFrame | None:
+    # Filas de versiones anteriores (pickle) no se leen: cuentan como ausentes
+    # y la tabla se vuelve a calcular.
+    try:
+        return pd.read_parquet(io.BytesIO(datos))
+    except ValueError:
+        return None
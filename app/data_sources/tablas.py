@@ -0,0 +1,109 @@
+"""
+Resultados listos para pintar (tarjetas y tablas de mercados).
+
+El worker de ingesta (app/worker.py) los calcula según su frecuencia y los
+guarda en el almacén local; las páginas sólo los leen. Si el worker no está
+corriendo y la tabla no existe, se calcula en línea y se guarda; si existe
+pero está vencida se sirve la última conocida (etiquetada con su fecha) y se
+refresca en segundo plano. Ver app/data_sources/instantanea.py.
+"""
+import importlib
+import logging
+import threading
+import time
+
+import pandas as pd
+
+from app import config
+from app.data_sources import instantanea, store
+
+log = logging.getLogger(__name__)
+
+# Mercados: cada N segundos en sesión; mucho menos seguido con mercado cerrado
+MERCADOS_INTERVALO_SEG = int(config.getenv("MERCADOS_INTERVALO_SEG", "60"))
+MERCADOS_CERRADO_SEG = int(config.getenv("MERCADOS_CERRADO_SEG", "900"))
+
+# 'fn': "módulo.función" dentro de app.data_sources; se importa al primer uso
+# para que leer una tabla de Banxico no cargue yfinance.
+# 'sesion': la tabla sigue el horario de mercado (cripto opera 24/7)
+TABLAS = {
+    "banxico_latest": {"fn": "banxico.get_latest_all", "intervalo_seg": 3600},
+    "fred_latest": {"fn": "fred_api.get_latest_all", "intervalo_seg": 3600},
+    "markets_mag7": {"fn": "markets.get_mag7_table", "intervalo_seg": MERCADOS_INTERVALO_SEG, "sesion": True},
+    "markets_indices": {"fn": "markets.get_indices_table", "intervalo_seg": MERCADOS_INTERVALO_SEG, "sesion": True},
+    "markets_crypto": {"fn": "markets.get_crypto_table", "intervalo_seg": MERCADOS_INTERVALO_SEG},
+    "markets_commodities": {"fn": "markets.get_commodities_table", "intervalo_seg": MERCADOS_INTERVALO_SEG, "sesion": True},
+    "markets_private": {"fn": "markets.get_private_companies_table", "intervalo_seg": MERCADOS_INTERVALO_SEG, "sesion": True},
+}
+
+
+def _funcion(nombre: str):
+    modulo, fn = TABLAS[nombre]["fn"].rsplit(".", 1)
+    return getattr(importlib.import_module(f"app.data_sources.{modulo}"), fn)
+
+
+def intervalo_seg(nombre: str, df: pd.DataFrame | None = None) -> int:
+    """Intervalo de refresco de una tabla; se alarga si su mercado está cerrado."""
+    tabla = TABLAS[nombre]
+    if tabla.get("sesion") and df is not None and "session" in df.columns and not df.empty:
+        if (df["session"] != "Regular").all():
+            return max(tabla["intervalo_seg"], MERCADOS_CERRADO_SEG)
+    return tabla["intervalo_seg"]
+
+
+def refrescar(nombre: str) -> pd.DataFrame:
+    """Calcula la tabla en línea y la guarda en el almacén local."""
+    df = _funcion(nombre)()
+    store.guardar_tabla(nombre, df)
+    instantanea.escribir_en_fondo()
+    return df
+
+
+_en_fondo: set = set()
+_fallas: dict[str, float] = {}     # nombre -> cuándo falló el último refresco
+_lock = threading.Lock()
+
+
+def _refrescar_en_fondo(nombre: str) -> None:
+    with _lock:
+        if nombre in _en_fondo:
+            return
+        _en_fondo.add(nombre)
+
+    def _correr():
+        try:
+            refrescar(nombre)
+            with _lock:
+                _fallas.pop(nombre, None)
+        except Exception:
+            with _lock:
+                _fallas[nombre] = time.time()
+            log.warning("No se pudo refrescar %s; se sigue sirviendo la copia guardada", nombre, exc_info=True)
+        finally:
+            with _lock:
+                _en_fondo.discard(nombre)
+
+    threading.Thread(target=_correr, daemon=True).start()
+
+
+def leer(nombre: str) -> pd.DataFrame:
+    """
+    Lee la tabla guardada. Si tiene más del doble de su intervalo (arranque
+    en frío, worker detenido, fuente caída) se regresa de inmediato con
+    df.attrs['respaldo'] / ['actualizado'] y se refresca en segundo plano.
+    Sólo si no hay nada guardado se calcula en línea.
+    """
+    instantanea.cargar()
+    guardada = store.leer_tabla(nombre)
+    if guardada is not None:
+        df, actualizado = guardada
+        if instantanea.OFFLINE:
+            return instantanea.marcar(df, actualizado, instantanea.FUERA_DE_LINEA)
+        if time.time() - actualizado <= 2 * intervalo_seg(nombre, df):
+            return df
+        _refrescar_en_fondo(nombre)
+        motivo = instantanea.SIN_CONEXION if nombre in _fallas else instantanea.VENCIDA
+        return instantanea.marcar(df, actualizado, motivo)
+    if instantanea.OFFLINE:
+        raise RuntimeError(f"Modo sin conexión y sin copia guardada de '{nombre}'.")
+    return refrescar(nombre)
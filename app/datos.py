@@ -0,0 +1,100 @@
+"""
+Punto de acceso del dashboard a los datos, con caché en memoria.
+
+Vive en un módulo aparte (y no en main.py) porque Streamlit vuelve a ejecutar
+el script principal en cada interacción: aquí el caché sobrevive a los reruns
+y lo comparten todas las sesiones del proceso.
+"""
+import pandas as pd
+
+from app import cache
+from app.data_sources import banxico, derivadas, fred_api, instantanea, panel, tablas
+
+# TTL (segundos) de las tablas; las de mercados usan MERCADOS_INTERVALO_SEG
+_TTL_TABLAS = {
+    "banxico_latest": 15 * 60,
+    "fred_latest": 30 * 60,
+    "markets_crypto": 15,
+}
+
+
+@cache.cached(lambda nombre: _TTL_TABLAS.get(nombre, tablas.MERCADOS_INTERVALO_SEG), maxsize=16)
+def leer_tabla(nombre: str) -> pd.DataFrame:
+    return tablas.leer(nombre)
+
+
+# Series: el TTL sigue la frecuencia de publicación (largo para el PIB trimestral)
+@cache.cached(lambda clave, *a, **kw: banxico.refresco_seg(clave), maxsize=32)
+def get_series_history(clave: str, start: str, end: str) -> pd.DataFrame:
+    return instantanea.con_respaldo(
+        "banxico", clave, start, end,
+        lambda: banxico.get_series_history(clave, start=start, end=end),
+    )
+
+
+@cache.cached(lambda clave, *a, **kw: fred_api.refresco_seg(fred_api.FRED_SERIES[clave]), maxsize=32)
+def get_time_series(clave: str, start: str, end: str) -> pd.DataFrame:
+    return instantanea.con_respaldo(
+        "fred", fred_api.FRED_SERIES[clave], start, end,
+        lambda: fred_api.get_time_series(clave, start=start, end=end),
+    )
+
+
+_REFRESCO = {
+    "banxico": banxico.refresco_seg,
+    "fred": lambda k: fred_api.refresco_seg(fred_api.FRED_SERIES[k]),
+    "derivada": derivadas.refresco_seg,
+}
+
+
+def _ttl_panel(keys, *args, **kw) -> int:
+    return min(_REFRESCO[panel.fuente_de(k)](k) for k in keys)
+
+
+def _serie_guardada(clave: str) -> tuple[str, str]:
+    """(fuente, clave en el almacén local) de una clave de Banxico o FRED."""
+    fuente = panel.fuente_de(clave)
+    return fuente, clave if fuente == "banxico" else fred_api.FRED_SERIES[clave]
+
+
+def _series_guardadas(keys) -> list[tuple[str, str]]:
+    """Series del almacén detrás de las claves (una derivada aporta sus bases)."""
+    guardadas = []
+    for k in keys:
+        if panel.fuente_de(k) != "derivada":
+            guardadas.append(_serie_guardada(k))
+            continue
+        spec = derivadas.DERIVADAS[k]
+        for fuente, base in filter(None, (spec["base"], spec.get("menos"))):
+            guardadas.append(_serie_guardada(base))
+    return list(dict.fromkeys(guardadas))
+
+
+def _leer_guardada(clave: str, start: str, end: str | None = None) -> pd.DataFrame:
+    return instantanea.respaldo(*_serie_guardada(clave), start, end)
+
+
+# 'keys' como tupla para que sirva de llave del caché
+@cache.cached(_ttl_panel, maxsize=16)
+def get_panel(keys: tuple, start: str, end: str, freq: str | None = "M", how: str = "last") -> pd.DataFrame:
+    instantanea.cargar()
+    guardadas = _series_guardadas(keys)
+    for fuente, clave in guardadas:
+        instantanea.registrar_serie(fuente, clave)
+
+    motivo = instantanea.FUERA_DE_LINEA
+    if not instantanea.OFFLINE:
+        try:
+            df = panel.get_panel(list(keys), start, end, freq=freq, how=how)
+            instantanea.escribir_en_fondo()
+            return df
+        except Exception:
+            motivo = instantanea.SIN_CONEXION
+
+    # Sin conexión: el panel se arma con las copias guardadas de cada serie
+    df = panel.get_panel(
+        list(keys), start, end, freq=freq, how=how,
+        lectores={"banxico": _leer_guardada, "fred": _leer_guardada},
+    )
+    actualizado = min(instantanea.actualizado(*g) for g in guardadas)
+    return instantanea.marcar(df, actualizado, motivo)
@@ -0,0 +1,172 @@
+"""
+Gráficas de series de tiempo largas ("Serie seleccionada").
+
+Una serie diaria de 1991 a hoy tiene decenas de miles de puntos; mandarlos
+todos al navegador en cada rerun es lento y no se distinguen en pantalla.
+Aquí:
+- se reduce la serie a ~PUNTOS_MAX puntos con LTTB (Largest-Triangle-Three-
+  Buckets), que conserva picos, valles y la forma de la curva,
+- se dibuja con trazos WebGL (Scattergl),
+- las fechas viajan como milisegundos epoch en float64, de modo que plotly
+  serializa x e y como arreglos binarios (base64) y no como texto,
+- al seleccionar un rango con la herramienta de caja se vuelve a graficar
+  sólo esa ventana, con resolución completa si cabe en PUNTOS_MAX.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from app import config, metricas
+
+# ~ ancho en pixeles de la gráfica en layout "wide" (pantallas hi-dpi incluidas)
+PUNTOS_MAX = int(config.getenv("GRAFICAS_PUNTOS_MAX", "2000"))
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """
+    Índices de los 'n' puntos que elige Largest-Triangle-Three-Buckets.
+    Siempre incluye el primero y el último; x debe venir ordenado.
+    """
+    m = len(x)
+    if n >= m or n < 3:
+        return np.arange(m)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # n-2 cubetas entre el primer y el último punto
+    bordes = np.linspace(1, m - 1, n - 1).astype(np.int64)
+
+    # Promedio de la cubeta siguiente a cada cubeta (la última mira al punto final)
+    cuenta = np.diff(bordes)
+    prom_x = np.append((np.add.reduceat(x[:m - 1], bordes[:-1]) / cuenta)[1:], x[-1])
+    prom_y = np.append((np.add.reduceat(y[:m - 1], bordes[:-1]) / cuenta)[1:], y[-1])
+
+    # El punto elegido depende del anterior: el recorrido es secuencial y en
+    # listas de Python es ~10x más rápido que rebanar arreglos por cubeta
+    xl, yl, bl = x.tolist(), y.tolist(), bordes.tolist()
+    pxl, pyl = prom_x.tolist(), prom_y.tolist()
+
+    idx = [0]
+    a = 0
+    for i in range(n - 2):
+        ax, ay = xl[a], yl[a]
+        dx, dy = ax - pxl[i], pyl[i] - ay
+        mejor, area_max = bl[i], -1.0
+        for k in range(bl[i], bl[i + 1]):
+            # Área (x2) del triángulo: punto anterior, candidato, promedio siguiente
+            area = abs(dx * (yl[k] - ay) - (ax - xl[k]) * dy)
+            if area > area_max:
+                area_max, mejor = area, k
+        a = mejor
+        idx.append(a)
+    idx.append(m - 1)
+
+    return np.array(idx, dtype=np.int64)
+
+
+def reducir(ts: pd.DataFrame, n: int = PUNTOS_MAX) -> tuple[np.ndarray, np.ndarray]:
+    """
+    DataFrame (fecha, valor) -> (x en ms epoch, y) con a lo más 'n' puntos.
+    """
+    ts = ts.dropna(subset=["fecha", "valor"])
+    x = ts["fecha"].to_numpy(dtype="datetime64[ms]").astype(np.int64).astype(np.float64)
+    y = ts["valor"].to_numpy(dtype=np.float64)
+    idx = lttb(x, y, n)
+    return x[idx], y[idx]
+
+
+def figura_serie(ts: pd.DataFrame, titulo: str, n: int = PUNTOS_MAX) -> go.Figure:
+    """Figura WebGL de la serie reducida a 'n' puntos."""
+    x, y = reducir(ts, n)
+    fig = go.Figure(
+        go.Scattergl(
+            x=x,
+            y=y,
+            mode="lines",
+            name=titulo,
+            hovertemplate="%{x|%Y-%m-%d}<br>%{y}<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        title=titulo,
+        xaxis=dict(type="date", title="Fecha"),
+        yaxis=dict(title="Valor"),
+        showlegend=False,
+    )
+    return fig
+
+
+def figura_panel(panel: pd.DataFrame, titulo: str, n: int = PUNTOS_MAX) -> go.Figure:
+    """Una línea WebGL por columna del panel (índice fecha), cada una reducida a 'n' puntos."""
+    fig = go.Figure()
+    for col in panel.columns:
+        serie = panel[col].dropna()
+        x, y = reducir(pd.DataFrame({"fecha": serie.index, "valor": serie.to_numpy()}), n)
+        fig.add_trace(
+            go.Scattergl(
+                x=x,
+                y=y,
+                mode="lines",
+                name=str(col),
+                hovertemplate="%{x|%Y-%m-%d}<br>%{y}<extra>%{fullData.name}</extra>",
+            )
+        )
+    fig.update_layout(
+        title=titulo,
+        xaxis=dict(type="date", title="Fecha"),
+        yaxis=dict(title="Valor"),
+        legend=dict(orientation="h", y=-0.2),
+    )
+    return fig
+
+
+def _ventana_seleccionada(key: str) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+    """Rango x de la caja seleccionada en la gráfica 'key' (si hay una)."""
+    estado = st.session_state.get(key)
+    try:
+        cajas = estado["selection"]["box"]
+    except (KeyError, TypeError):
+        return None
+    if not cajas:
+        return None
+
+    x0, x1 = cajas[-1]["x"][:2]
+    # Según la versión de plotly.js el rango llega como texto o como ms epoch
+    if isinstance(x0, (int, float)):
+        x0, x1 = pd.to_datetime(x0, unit="ms"), pd.to_datetime(x1, unit="ms")
+    else:
+        x0, x1 = pd.to_datetime(x0), pd.to_datetime(x1)
+    return min(x0, x1), max(x0, x1)
+
+
+def mostrar_serie(ts: pd.DataFrame, titulo: str, key: str, nombre_metrica: str = "plotly") -> None:
+    """
+    Dibuja la serie en Streamlit. Si el usuario seleccionó un rango con la
+    caja, se grafica sólo esa ventana (a resolución completa si es angosta);
+    doble clic sobre la gráfica quita la selección y regresa a la serie completa.
+    """
+    ventana = _ventana_seleccionada(key)
+    if ventana is not None:
+        sub = ts[(ts["fecha"] >= ventana[0]) & (ts["fecha"] <= ventana[1])]
+        if len(sub) >= 2:
+            ts = sub
+            titulo = f"{titulo} ({ventana[0]:%Y-%m-%d} a {ventana[1]:%Y-%m-%d})"
+
+    with metricas.medir(nombre_metrica):
+        fig = figura_serie(ts, titulo)
+        st.plotly_chart(
+            fig,
+            use_container_width=True,
+            key=key,
+            on_select="rerun",
+            selection_mode="box",
+        )
+
+    if len(ts) > PUNTOS_MAX:
+        st.caption(
+            f"Mostrando {PUNTOS_MAX:,} de {len(ts):,} observaciones. "
+            "Selecciona un rango con la herramienta de caja para verlo a resolución completa."
+        )
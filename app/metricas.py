@@ -0,0 +1,208 @@
+"""
+Instrumentación ligera del dashboard.
+
+Cada llamada a una fuente de datos, parseo, caché o sección de página se
+registra por nombre de operación ('http.banxico', 'layout.fed', ...) con:
+tiempo de pared, bytes, reintentos, errores, aciertos/fallos de caché y
+profundidad de las colas del límite de peticiones ('cola.fred').
+
+Los agregados se muestran en el panel de diagnóstico de la barra lateral y
+se exportan en formato texto de Prometheus y JSON:
+- archivos data/metrics.prom y data/metrics.json (p. ej. para el textfile
+  collector de node_exporter),
+- opcionalmente un endpoint HTTP (/metrics y /metrics.json) si se define
+  METRICAS_PUERTO; escucha sólo en 127.0.0.1 salvo que METRICAS_HOST diga
+  otra cosa (p. ej. 0.0.0.0 dentro de un contenedor).
+"""
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from app import config
+
+ROOT_DIR = Path(__file__).resolve().parents[1]   # Economic_Dashboard/
+DATA_DIR = Path(config.getenv("DASHBOARD_DATA_DIR", str(ROOT_DIR / "data")))
+
+# Interfaz del endpoint /metrics (por defecto sólo local)
+HOST = config.getenv("METRICAS_HOST", "127.0.0.1")
+
+# Cada cuánto (como mínimo) se reescriben los archivos de métricas
+ESCRITURA_INTERVALO_SEG = float(config.getenv("METRICAS_INTERVALO_SEG", "15"))
+
+_CAMPOS = (
+    "llamadas", "errores", "seg_total", "seg_max", "seg_ultimo",
+    "bytes", "reintentos", "cache_hit", "cache_miss", "cache_stale", "cache_coalesced",
+    "en_cola", "en_cola_max",
+)
+
+_lock = threading.Lock()
+_stats: dict[str, dict] = defaultdict(lambda: dict.fromkeys(_CAMPOS, 0))
+_ultima_escritura = 0.0
+_servidor = None
+
+
+@contextmanager
+def medir(nombre: str):
+    """
+    Mide el bloque y lo registra bajo 'nombre'. El dict que entrega permite
+    reportar 'bytes' y 'reintentos' desde dentro del bloque.
+    """
+    info = {"bytes": 0, "reintentos": 0}
+    error = False
+    t0 = time.perf_counter()
+    try:
+        yield info
+    except BaseException:
+        error = True
+        raise
+    finally:
+        seg = time.perf_counter() - t0
+        with _lock:
+            s = _stats[nombre]
+            s["llamadas"] += 1
+            s["errores"] += int(error)
+            s["seg_total"] += seg
+            s["seg_max"] = max(s["seg_max"], seg)
+            s["seg_ultimo"] = seg
+            s["bytes"] += int(info.get("bytes") or 0)
+            s["reintentos"] += int(info.get("reintentos") or 0)
+
+
+def contar_cache(nombre: str, resultado: str) -> None:
+    """
+    resultado: 'hit', 'miss', 'stale' (valor vencido servido mientras se
+    refresca) o 'coalesced' (esperó la petición que otra sesión ya tenía en curso).
+    """
+    with _lock:
+        _stats[nombre][f"cache_{resultado}"] += 1
+
+
+def fijar_cola(nombre: str, profundidad: int) -> None:
+    """Profundidad actual de una cola de espera (y su máximo observado)."""
+    with _lock:
+        s = _stats[nombre]
+        s["en_cola"] = profundidad
+        s["en_cola_max"] = max(s["en_cola_max"], profundidad)
+
+
+def resumen() -> list[dict]:
+    """Copia de los agregados: una fila por operación."""
+    with _lock:
+        filas = [{"operacion": nombre, **s} for nombre, s in sorted(_stats.items())]
+    for f in filas:
+        f["seg_prom"] = f["seg_total"] / f["llamadas"] if f["llamadas"] else 0.0
+    return filas
+
+
+def reiniciar() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def prometheus() -> str:
+    """Agregados en formato texto de Prometheus."""
+    metricas = [
+        ("dashboard_llamadas_total", "counter", "Llamadas por operación", "llamadas"),
+        ("dashboard_errores_total", "counter", "Llamadas que terminaron en excepción", "errores"),
+        ("dashboard_segundos_total", "counter", "Tiempo de pared acumulado (s)", "seg_total"),
+        ("dashboard_segundos_max", "gauge", "Llamada más lenta (s)", "seg_max"),
+        ("dashboard_bytes_total", "counter", "Bytes de payload recibidos", "bytes"),
+        ("dashboard_reintentos_total", "counter", "Reintentos HTTP", "reintentos"),
+    ]
+    filas = resumen()
+    lineas = []
+    for nombre, tipo, ayuda, campo in metricas:
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} {tipo}")
+        for f in filas:
+            if f["llamadas"]:   # las entradas sólo de caché no tienen tiempos
+                lineas.append(f'{nombre}{{op="{f["operacion"]}"}} {f[campo]}')
+
+    lineas.append("# HELP dashboard_cache_total Consultas al caché por resultado")
+    lineas.append("# TYPE dashboard_cache_total counter")
+    for f in filas:
+        for resultado in ("hit", "miss", "stale", "coalesced"):
+            if f[f"cache_{resultado}"]:
+                lineas.append(
+                    f'dashboard_cache_total{{op="{f["operacion"]}",resultado="{resultado}"}} '
+                    f'{f[f"cache_{resultado}"]}'
+                )
+
+    colas = [f for f in filas if f["en_cola_max"]]
+    for nombre, ayuda, campo in (
+        ("dashboard_cola", "Peticiones esperando turno del límite por proveedor", "en_cola"),
+        ("dashboard_cola_max", "Máxima profundidad de cola observada", "en_cola_max"),
+    ):
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} gauge")
+        for f in colas:
+            lineas.append(f'{nombre}{{op="{f["operacion"]}"}} {f[campo]}')
+    return "\n".join(lineas) + "\n"
+
+
+def a_json() -> str:
+    return json.dumps({"generado": time.time(), "operaciones": resumen()}, indent=2)
+
+
+def escribir(forzar: bool = False) -> None:
+    """Escribe data/metrics.prom y data/metrics.json (como mucho cada ESCRITURA_INTERVALO_SEG)."""
+    global _ultima_escritura
+    ahora = time.time()
+    if not forzar and ahora - _ultima_escritura < ESCRITURA_INTERVALO_SEG:
+        return
+    _ultima_escritura = ahora
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    for nombre, contenido in (("metrics.prom", prometheus()), ("metrics.json", a_json())):
+        tmp = DATA_DIR / f".{nombre}.tmp"
+        tmp.write_text(contenido, encoding="utf-8")
+        tmp.replace(DATA_DIR / nombre)   # reemplazo atómico para el scraper
+
+
+def _crear_handler():
+    from http.server import BaseHTTPRequestHandler
+
+    class _Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.startswith("/metrics.json"):
+                cuerpo, tipo = a_json(), "application/json"
+            elif self.path.startswith("/metrics"):
+                cuerpo, tipo = prometheus(), "text/plain; version=0.0.4"
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            data = cuerpo.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return _Handler
+
+
+def iniciar_servidor(puerto: int | None = None) -> None:
+    """Levanta (una vez por proceso) el endpoint /metrics si hay METRICAS_PUERTO."""
+    global _servidor
+    puerto = puerto or int(config.getenv("METRICAS_PUERTO", "0"))
+    if not puerto or _servidor is not None:
+        return
+    with _lock:
+        if _servidor is not None:
+            return
+        # http.server sólo se importa si de verdad se expone el endpoint
+        from http.server import ThreadingHTTPServer
+        try:
+            _servidor = ThreadingHTTPServer((HOST, puerto), _crear_handler())
+        except OSError:
+            # Puerto ocupado (p. ej. otro proceso ya lo expone)
+            _servidor = False
+            return
+    threading.Thread(target=_servidor.serve_forever, daemon=True).start()
@@ -0,0 +1,25 @@
+"""
+Avisos comunes a las páginas.
+"""
+import datetime as dt
+
+import streamlit as st
+
+_MOTIVOS = {
+    "vencida": "actualizando en segundo plano",
+    "sin conexión": "la fuente no respondió",
+    "offline": "modo sin conexión",
+}
+
+
+def aviso_respaldo(df) -> None:
+    """
+    Si 'df' es una copia guardada (df.attrs['respaldo'], ver
+    app/data_sources/instantanea.py) indica de cuándo son los datos.
+    """
+    attrs = getattr(df, "attrs", None) or {}
+    motivo = attrs.get("respaldo")
+    if not motivo:
+        return
+    fecha = dt.datetime.fromtimestamp(attrs.get("actualizado") or 0)
+    st.caption(f"🕒 Datos guardados al {fecha:%d/%m/%Y %H:%M} ({_MOTIVOS.get(motivo, motivo)}).")
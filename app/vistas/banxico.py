@@ -0,0 +1,209 @@
+"""
+Página Banxico: tarjetas con el dato oportuno de SIE y serie seleccionada.
+"""
+import pandas as pd
+import streamlit as st
+
+from app import assets
+from app.datos import leer_tabla, get_series_history
+from app.graficas import mostrar_serie
+from app.vistas.avisos import aviso_respaldo
+
+
+def layout_banxico():
+    # CSS banner Banxico
+    st.markdown(
+        """
+        <style>
+        /* Reduce el espacio superior del contenido principal */
+        section.main > div.block-container{
+            padding-top: 0.25rem;
+        }
+
+        /* Banner: estilo tipo "hero" */
+        .banxico-banner{
+            margin-top: -1.25rem;   /* sube el banner */
+            margin-bottom: 1.25rem;
+        }
+        .banxico-banner img{
+            width: 100%;
+            height: 180px;          /* ajusta alto */
+            object-fit: cover;
+            border-radius: 18px;
+            display: block;
+        }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    # Banner (app/museo.jpg optimizado y codificado una sola vez, ver app/assets.py)
+    banner_src = assets.data_uri("banxico")
+
+    if banner_src:
+        st.markdown(
+            f"""
+            <div class="banxico-banner">
+              <img src="{banner_src}" alt="Banxico banner" />
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+    
+    # Contenido principal
+    st.title("México")
+    st.write(
+        "Dato oportuno de los principales indicadores de Banco de México, "
+        "obtenidos vía API SIE."
+    )
+
+    try:
+        df = leer_tabla("banxico_latest")
+        aviso_respaldo(df)
+
+        order = [
+            "tasa_objetivo",
+            "tiie_fondeo",
+            "tiie_28",
+            "cetes_28",
+            "fix",
+            "reservas",
+            "inflacion_general",
+            "inflacion_subyacente",
+            "udis",
+        ]
+
+        labels = {
+            "tasa_objetivo": "Tasa objetivo",
+            "tiie_fondeo": "TIIE Fondeo",
+            "tiie_28": "TIIE 28",
+            "cetes_28": "Cetes 28",
+            "fix": "Tipo de cambio FIX",
+            "reservas": "Reservas intl. (mill. dls.)",
+            "inflacion_general": "Inflación anual (quincenal)",
+            "inflacion_subyacente": "Inflación subyacente anual (quincenal)",
+            "udis": "UDIS",
+        }
+
+        # Validación mínima
+        for c in ["clave", "serie_id", "fecha", "valor"]:
+            if c not in df.columns:
+                raise ValueError(f"Banxico: falta columna requerida '{c}' en el DataFrame.")
+
+        # Ordenar
+        df = df.set_index("clave").reindex(order).reset_index()
+
+        st.subheader("Indicadores")
+        st.caption(
+            "Las cifras de inflación corresponden a variación anual del INPC "
+            "con datos quincenales."
+        )
+
+        # Tarjetas (3 por fila) 
+        cards_per_row = 3
+        for i in range(0, len(df), cards_per_row):
+            cols = st.columns(cards_per_row)
+
+            for j, col in enumerate(cols):
+                idx = i + j
+                if idx >= len(df):
+                    break
+
+                row = df.iloc[idx]
+                clave = row["clave"]
+                serie_id = row.get("serie_id")
+                valor = row.get("valor")
+                fecha_raw = row.get("fecha")
+                fecha_label = row.get("fecha_label", "")  # viene desde banxico.py
+
+                # Valor formateado"
+                if pd.isna(valor):
+                    value_str = "N/E"
+                else:
+                    v = float(valor)
+
+                    if clave in ("inflacion_general", "inflacion_subyacente", "tasa_objetivo", "tiie_fondeo", "cetes_28"):
+                        value_str = f"{v:.2f}"
+                    elif clave == "tiie_28":
+                        value_str = f"{v:.4f}"          
+                    elif clave == "reservas":
+                        value_str = f"{v:,.1f}".replace(",", "")
+                    elif clave == "udis":
+                        value_str = f"{v:.6f}"
+                    else:
+                        value_str = f"{v:.4f}"
+
+                with col:
+                    titulo = labels.get(clave, clave)
+                    sub = row.get("fecha_label", "") or ""
+
+                    st.markdown(
+                  f"""
+                  <div class="metric-card">
+                 <div class="metric-title">{titulo}</div>
+                  <div class="metric-value">{value_str}</div>
+                 <div class="metric-sub">{sub}</div>
+                 </div>
+                  """,
+                 unsafe_allow_html=True,
+                )
+
+        # Gráfica interactiva
+        st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
+
+        st.markdown("### Serie seleccionada")
+
+        opciones = {
+            "Tasa objetivo": "tasa_objetivo",
+            "TIIE Fondeo": "tiie_fondeo",
+            "TIIE 28": "tiie_28",
+            "Cetes 28": "cetes_28",
+            "Tipo de cambio FIX": "fix",
+            "Reservas internacionales": "reservas",
+            "Inflación anual (quincenal)": "inflacion_general",
+            "Inflación subyacente anual (quincenal)": "inflacion_subyacente",
+            "UDIS": "udis",
+        }
+
+        nombre_sel = st.selectbox(
+            "Selecciona un indicador para graficar",
+            list(opciones.keys()),
+            key="banxico_sel_graph",
+        )
+        clave_sel = opciones[nombre_sel]
+
+        col_a, col_b = st.columns(2)
+        with col_a:
+            fecha_inicio = st.date_input(
+                "Fecha inicial",
+                value=pd.to_datetime("2015-01-01").date(),
+                key="banxico_start_graph",
+            )
+        with col_b:
+            fecha_fin = st.date_input(
+                "Fecha final",
+                value=pd.Timestamp.today().date(),
+                key="banxico_end_graph",
+            )
+
+        if fecha_fin < fecha_inicio:
+            st.warning("La fecha final no puede ser menor que la fecha inicial.")
+            return
+
+        ts = get_series_history(
+            clave_sel,
+            start=fecha_inicio.strftime("%Y-%m-%d"),
+            end=fecha_fin.strftime("%Y-%m-%d"),
+        )
+
+        if ts is None or ts.empty:
+            st.info("No hay datos para el periodo seleccionado.")
+        else:
+            if "fecha" not in ts.columns or "valor" not in ts.columns:
+                raise ValueError("Banxico: la serie histórica debe traer columnas ['fecha','valor'].")
+
+            mostrar_serie(ts, nombre_sel, key=f"banxico_chart_{clave_sel}", nombre_metrica="plotly.banxico")
+            aviso_respaldo(ts)
+
+    except Exception as e:
+        st.error(f"Error al cargar datos de Banxico: {e}")
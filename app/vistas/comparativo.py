@@ -0,0 +1,103 @@
+"""
+Página Comparativo: series de Banxico y FRED alineadas en una sola gráfica.
+"""
+import pandas as pd
+import streamlit as st
+
+from app import metricas
+from app.datos import get_panel
+from app.graficas import figura_panel
+from app.vistas.avisos import aviso_respaldo
+
+SERIES_COMPARATIVO = {
+    "Tasa objetivo (Banxico)": "tasa_objetivo",
+    "TIIE Fondeo": "tiie_fondeo",
+    "TIIE 28": "tiie_28",
+    "Cetes 28": "cetes_28",
+    "Tipo de cambio FIX": "fix",
+    "Reservas internacionales": "reservas",
+    "Inflación anual México (quincenal)": "inflacion_general",
+    "Inflación subyacente México (quincenal)": "inflacion_subyacente",
+    "UDIS": "udis",
+    "Fed funds (efectiva)": "policy_rate",
+    "PCE (índice)": "inflation_pce",
+    "Desempleo EE.UU.": "unemployment",
+    "PIB real EE.UU. (t/t anualizado)": "gdp_growth",
+    # Derivadas (app/data_sources/derivadas.py)
+    "Inflación PCE (% a/a)": "inflation_pce_yoy",
+    "Inflación PCE (3 meses anualizada)": "inflation_pce_3m_anualizada",
+    "Tasa real México": "tasa_real_mx",
+    "Diferencial Banxico − Fed": "diferencial_mx_eua",
+    "FIX media móvil 20 días": "fix_media_20",
+}
+
+
+def layout_comparativo():
+    st.title("Comparativo")
+    st.write(
+        "Series de Banxico, FRED y derivadas alineadas por fecha en una sola gráfica. "
+        "Las series de menor frecuencia toman el último dato publicado."
+    )
+
+    try:
+        nombres = st.multiselect(
+            "Series a comparar",
+            list(SERIES_COMPARATIVO.keys()),
+            default=["Tasa objetivo (Banxico)", "Fed funds (efectiva)"],
+            key="comp_series",
+        )
+
+        col_a, col_b, col_c, col_d = st.columns(4)
+        with col_a:
+            fecha_inicio = st.date_input(
+                "Fecha inicial",
+                value=pd.to_datetime("2015-01-01").date(),
+                key="comp_start",
+            )
+        with col_b:
+            fecha_fin = st.date_input(
+                "Fecha final",
+                value=pd.Timestamp.today().date(),
+                key="comp_end",
+            )
+        with col_c:
+            frecuencias = {"Mensual": "M", "Semanal": "W", "Trimestral": "Q", "Diaria": "D"}
+            freq = frecuencias[st.selectbox("Frecuencia", list(frecuencias.keys()), key="comp_freq")]
+        with col_d:
+            agregaciones = {"Último dato": "last", "Promedio": "mean"}
+            how = agregaciones[st.selectbox("Agregación", list(agregaciones.keys()), key="comp_how")]
+
+        base_100 = st.checkbox("Base 100 al inicio del periodo", value=False, key="comp_base100")
+
+        if not nombres:
+            st.info("Selecciona al menos una serie.")
+            return
+        if fecha_fin < fecha_inicio:
+            st.warning("La fecha final no puede ser menor que la fecha inicial.")
+            return
+
+        claves = tuple(SERIES_COMPARATIVO[n] for n in nombres)
+        df = get_panel(
+            claves,
+            start=fecha_inicio.strftime("%Y-%m-%d"),
+            end=fecha_fin.strftime("%Y-%m-%d"),
+            freq=freq,
+            how=how,
+        )
+
+        if df.empty:
+            st.info("No hay datos para el periodo seleccionado.")
+            return
+
+        respaldo = df
+        if base_100:
+            df = df / df.bfill().iloc[0] * 100
+
+        df = df.rename(columns={v: k for k, v in SERIES_COMPARATIVO.items()})
+
+        with metricas.medir("plotly.comparativo"):
+            st.plotly_chart(figura_panel(df, "Comparativo"), use_container_width=True)
+        aviso_respaldo(respaldo)
+
+    except Exception as e:
+        st.error(f"Error al cargar el comparativo: {e}")
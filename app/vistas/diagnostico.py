@@ -0,0 +1,35 @@
+"""
+Panel de diagnóstico de la barra lateral (métricas de app.metricas).
+"""
+import pandas as pd
+import streamlit as st
+
+from app import metricas
+
+
+def layout_diagnostico():
+    """
+    Panel de la barra lateral con los agregados de app.metricas: tiempo por
+    llamada, bytes, reintentos y aciertos de caché (acumulados del proceso).
+    """
+    filas = metricas.resumen()
+    if not filas:
+        st.sidebar.caption("Sin métricas todavía.")
+        return
+
+    df = pd.DataFrame(filas)
+    df["ms_prom"] = (df["seg_prom"] * 1000).round(1)
+    df["ms_max"] = (df["seg_max"] * 1000).round(1)
+    df["ms_ultimo"] = (df["seg_ultimo"] * 1000).round(1)
+    df["kb"] = (df["bytes"] / 1024).round(1)
+    cols = [
+        "operacion", "llamadas", "ms_ultimo", "ms_prom", "ms_max", "kb",
+        "reintentos", "errores", "cache_hit", "cache_miss", "cache_stale", "cache_coalesced", "en_cola",
+    ]
+    st.sidebar.dataframe(df[cols], hide_index=True, use_container_width=True)
+    st.sidebar.download_button(
+        "metrics.prom",
+        metricas.prometheus(),
+        file_name="metrics.prom",
+        mime="text/plain",
+    )
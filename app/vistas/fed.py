@@ -0,0 +1,143 @@
+"""
+Página Fed: indicadores de Estados Unidos (FRED) y serie seleccionada.
+"""
+import pandas as pd
+import streamlit as st
+
+from app import assets
+from app.datos import leer_tabla, get_time_series
+from app.graficas import mostrar_serie
+from app.vistas.avisos import aviso_respaldo
+
+
+def layout_fed():
+        # --- CSS banner FED ---
+    st.markdown("""
+    <style>
+    .fed-banner img {
+        width: 100%;
+        height: 180px;
+        object-fit: cover;
+        border-radius: 16px;
+        margin-bottom: 1.2rem;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+    # Banner (app/fed_bn.jpg optimizado y codificado una sola vez, ver app/assets.py)
+    banner_src = assets.data_uri("fed")
+    if banner_src:
+        st.markdown(
+            f'<div class="fed-banner"><img src="{banner_src}" alt="Fed banner" /></div>',
+            unsafe_allow_html=True,
+        )
+    st.title("United States")
+
+    st.write(
+        "Macroeconomic indicators for the United States obtained from FRED"
+        "(St. Louis Fed): policy rate, PCE inflation, unemployment, and real GDP."
+    )
+
+    try:
+        # Tarjetas principales 
+        df = leer_tabla("fred_latest")
+        aviso_respaldo(df)
+
+        order = ["policy_range", "inflation_pce", "unemployment", "gdp_growth"]
+        labels = {
+            "policy_range": "Fed Funds Target Range",
+            "inflation_pce": "Inflation (PCE)",
+            "unemployment": "Unemployment Rate",
+            "gdp_growth": "Gross Domestic Product (GDP)",
+        }
+
+        # reindex: si una serie falló, su tarjeta aparece como N/E
+        df = df.set_index("clave").reindex(order).reset_index()
+
+        st.subheader("Key indicators – latest available data")
+        st.caption("Source: FRED (St. Louis Fed) / Board of Governors / BEA.")
+
+        cols = st.columns(4)
+        for i, col in enumerate(cols):
+            row = df.iloc[i]
+            clave = row["clave"]
+            label = labels.get(clave, clave)
+
+            fecha_dt = pd.to_datetime(row["fecha"])
+
+            # Texto de periodo según el tipo de serie
+            if pd.isna(fecha_dt):
+                period_str = ""
+            elif clave == "gdp_growth":
+                # Real GDP trimestral
+                period_str = f"Q{fecha_dt.quarter} {fecha_dt.year}"   # ej. Q2 2025
+            elif clave in ("inflation_pce", "unemployment"):
+                # Series mensuales
+                period_str = fecha_dt.strftime("%B %Y")               # ej. September 2025
+            else:
+                # Fed funds target range: dejamos fecha exacta
+                period_str = fecha_dt.strftime("%Y-%m-%d")
+
+            if pd.isna(row.get("valor")):
+                value_str = "N/E"
+            else:
+                value_str = row.get("valor_str", f"{row['valor']:.2f}%")
+
+            # Mostrar tarjeta con valor y subtítulo de periodo
+            with col:
+             st.markdown(
+               f"""
+             <div class="metric-card">
+              <div class="metric-title">{label}</div>
+              <div class="metric-value">{value_str}</div>
+              <div class="metric-sub">{period_str}</div>
+             </div>
+              """,
+               unsafe_allow_html=True,
+             )
+
+
+
+        #  Serie seleccionada (gráfica con rango) 
+        st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
+
+        st.markdown("### Serie seleccionada")
+
+        series_options = {
+            "Policy rate": "policy_rate",
+            "Inflation (PCE)": "inflation_pce",
+            "Unemployment Rate": "unemployment",
+            "Gross Domestic Product": "gdp_growth",
+        }
+
+        nombre_sel = st.selectbox(
+            "Selecciona una serie para graficar",
+            list(series_options.keys()),
+        )
+        clave_sel = series_options[nombre_sel]
+
+        col_a, col_b = st.columns(2)
+        with col_a:
+            start_date = st.date_input(
+                "Fecha inicial",
+                value=pd.to_datetime("2015-01-01").date(),
+            )
+        with col_b:
+            end_date = st.date_input(
+                "Fecha final",
+                value=pd.to_datetime("today").date(),
+            )
+
+        start_str = start_date.strftime("%Y-%m-%d")
+        end_str = end_date.strftime("%Y-%m-%d")
+
+        ts = get_time_series(clave_sel, start=start_str, end=end_str)
+
+        if ts.empty:
+            st.warning("No se encontraron datos para el periodo seleccionado.")
+        else:
+            mostrar_serie(ts, nombre_sel, key=f"fed_chart_{clave_sel}", nombre_metrica="plotly.fed")
+            aviso_respaldo(ts)
+
+    except Exception as e:
+        st.error(f"Error al cargar datos del FRED: {e}")
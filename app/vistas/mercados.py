@@ -0,0 +1,208 @@
+"""
+Página Mercados: tablas de índices, cripto, commodities y empresas (Yahoo Finance).
+"""
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from app.data_sources import markets
+from app.datos import leer_tabla
+from app.vistas.avisos import aviso_respaldo
+
+
+_COLUMNA_TENDENCIA = st.column_config.LineChartColumn("intradía", width="small")
+
+
+def _con_delta(nombre: str, df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """
+    Compara la tabla con la del sondeo anterior de esta sesión y marca en la
+    columna 'Δ' sólo las filas cuyo precio o cambio % se movió (▲ / ▼ / •).
+    Regresa (tabla, número de filas que cambiaron).
+    """
+    clave = f"vivo_previo_{nombre}"
+    previo = st.session_state.get(clave)
+    st.session_state[clave] = df
+
+    df = df.copy()
+    df["Δ"] = ""
+    if previo is None or previo.empty or df.empty:
+        return df, 0
+
+    ant = previo.drop_duplicates("name").set_index("name")[["price", "change_pct"]]
+    unido = df[["name", "price", "change_pct"]].join(ant, on="name", rsuffix="_ant")
+
+    def _distinto(a, b):
+        return ~((a == b) | (a.isna() & b.isna()))
+
+    cambio = _distinto(unido["price"], unido["price_ant"]) | _distinto(unido["change_pct"], unido["change_pct_ant"])
+    cambio &= unido["price_ant"].notna()
+    df["Δ"] = np.select(
+        [cambio & (unido["price"] > unido["price_ant"]), cambio & (unido["price"] < unido["price_ant"]), cambio],
+        ["▲", "▼", "•"],
+        "",
+    )
+    return df, int(cambio.sum())
+
+
+def layout_markets():
+    st.title("Mercados financieros")
+    
+    st.info(
+    "Nota: Los precios provienen de Yahoo Finance vía yfinance. "
+    "Dependiendo del activo y la sesión (Regular / Cierre / After-hours), "
+    "pueden existir diferencias pequeñas o un desfase de minutos respecto a la web de Yahoo Finance."
+    )
+
+    st.write(
+        "Precios y variaciones recientes de índices, criptomonedas,commodities y empresas privadas de alta valoración."
+        )
+
+    def _format_table(df):
+        if df is None or df.empty:
+            return df
+
+        df = df.copy()
+
+        # Renombra session a algo legible en español
+        session_map = {
+            "Regular": "Regular",
+            "Close": "Cierre",
+            "After-hours": "After-hours",
+        }
+        if "session" in df.columns:
+            df["session"] = df["session"].astype(str).map(session_map).fillna(df["session"])
+
+        # Formato de números
+        if "price" in df.columns:
+            # Redondeo inteligente:
+            # - crypto/stablecoins: más decimales
+            # - commodities: 2-4
+            # - índices: 2
+            # (sin depender del tipo: usamos heurística por nivel de precio)
+            def _fmt_price(x):
+                try:
+                    x = float(x)
+                except Exception:
+                    return x
+                if x < 5:
+                    return round(x, 4)
+                if x < 100:
+                    return round(x, 2)
+                return round(x, 2)
+
+            df["price"] = df["price"].apply(_fmt_price)
+
+        if "change_pct" in df.columns:
+            df["change_pct"] = pd.to_numeric(df["change_pct"], errors="coerce").round(2)
+
+        # Orden de columnas si existen
+        cols = [c for c in ["Δ", "name", "ticker", "price", "change_pct", "tendencia", "session"] if c in df.columns]
+        df = df[cols]
+
+        # Renombres finales
+        rename = {
+            "name": "name",
+            "ticker": "ticker",
+            "price": "price",
+            "change_pct": "change_pct",
+            "session": "session",
+        }
+        df = df.rename(columns=rename)
+
+        return df
+
+    def _render(df):
+        if df is None or df.empty:
+            st.info("No hay datos disponibles por el momento.")
+            return
+
+        df_show = _format_table(df)
+
+        # Mostrar con formateo visual (sin cambiar colores)
+        st.dataframe(
+            df_show,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "price": st.column_config.NumberColumn("price"),
+                "change_pct": st.column_config.NumberColumn("change_pct", format="%.2f%%"),
+                "tendencia": _COLUMNA_TENDENCIA,
+                "session": st.column_config.TextColumn("session"),
+            },
+        )
+
+    vivo = st.toggle(
+        "Actualización en vivo",
+        value=False,
+        key="mercados_vivo",
+        help=(
+            f"Cada tabla se actualiza sola: cada {markets.VIVO_SEG} s en sesión regular "
+            f"(cripto 24/7), cada {markets.VIVO_EXTENDIDO_SEG} s en pre/post y cada "
+            f"{markets.VIVO_CERRADO_SEG // 60} min con el mercado cerrado."
+        ),
+    )
+
+    def _mag7(df):
+        st.dataframe(df, use_container_width=True, column_config={"tendencia": _COLUMNA_TENDENCIA})
+
+    def _tabla(nombre, etiqueta, render):
+        if not vivo:
+            try:
+                df = leer_tabla(nombre)
+                render(df)
+                aviso_respaldo(df)
+            except Exception as e:
+                st.error(f"Error al cargar {etiqueta}: {e}")
+            return
+
+        # Sólo esta sección se vuelve a ejecutar; el intervalo sigue al marketState
+        intervalo = markets.intervalo_vivo(markets.GRUPOS[nombre])
+
+        @st.fragment(run_every=intervalo)
+        def _en_vivo():
+            try:
+                df = markets.tabla_vivo(nombre)
+            except Exception as e:
+                st.error(f"Error al cargar {etiqueta}: {e}")
+                return
+
+            # Cambió la sesión (abrió / cerró): se redefine el fragmento con el nuevo intervalo
+            if markets.intervalo_vivo(markets.GRUPOS[nombre]) != intervalo:
+                st.rerun(scope="app")
+
+            df, cambios = _con_delta(nombre, df)
+            render(df)
+            st.caption(
+                f"Actualizado {dt.datetime.now():%H:%M:%S} · {cambios} fila(s) con cambios · "
+                f"siguiente en {intervalo} s"
+            )
+
+        _en_vivo()
+
+    col1, col2 = st.columns(2)
+
+    # Columna izquierda: índices y cripto
+    with col1:
+        st.subheader("Magníficas 7")
+        st.caption("Alphabet, Amazon, Apple, Meta, Microsoft, Nvidia y Tesla.")
+        _tabla("markets_mag7", "Magníficas 7", _mag7)
+
+        st.subheader("Índices")
+        st.caption("Dow Jones, S&P 500, Nasdaq.")
+        _tabla("markets_indices", "índices", _render)
+
+        st.subheader("Criptomonedas")
+        st.caption("Bitcoin, Ethereum, Tether.")
+        _tabla("markets_crypto", "criptomonedas", _render)
+
+    # Columna derecha: commodities
+    with col2:
+        st.subheader("Commodities")
+        st.caption("Oro, Plata, Cobre, Petróleo (WTI/Brent) y Gas natural.")
+        _tabla("markets_commodities", "commodities", _render)
+            
+        st.subheader("Empresas privadas de alta valoración")
+        st.caption("Top 5 (tickers tipo .PVT disponibles en Yahoo Finance).")
+        _tabla("markets_private", "private companies", _render)
@@ -0,0 +1,84 @@
+"""
+Página Noticias: enlaces a fuentes oficiales (no descarga datos).
+"""
+import streamlit as st
+
+
+def layout_news():
+    import streamlit as st
+
+    st.title("Noticias Económicas")
+    st.write("Selección de fuentes oficiales para monitoreo en tiempo real.")
+    
+    # Estilo CSS personalizado para mejorar la apariencia de los hipervínculos
+    st.markdown("""
+        <style>
+        .news-card {
+            border-radius: 10px;
+            padding: 15px;
+            background-color: #f0f2f6;
+            margin-bottom: 10px;
+            border: 1px solid #e6e9ef;
+        }
+        .source-title {
+            color: #1c3d5a;
+            font-weight: bold;
+            font-size: 1.2rem;
+            margin-bottom: 10px;
+        }
+        </style>
+    """, unsafe_allow_html=True)
+
+    # --- FILA 1: REUTERS & BLOOMBERG LÍNEA ---
+    col1, col2 = st.columns(2)
+
+    with col1:
+        with st.container(border=True):
+            st.markdown("<div class='source-title'> Reuters</div>", unsafe_allow_html=True)
+            st.markdown("- [Global Economy](https://www.reuters.com/markets/econ-world/)")
+            st.markdown("- [Markets](https://www.reuters.com/markets/)")
+            st.markdown("- [Technology](https://www.reuters.com/technology/)")
+
+    with col2:
+        with st.container(border=True):
+            st.markdown("<div class='source-title'> Bloomberg Línea</div>", unsafe_allow_html=True)
+            st.markdown("- [México](https://www.bloomberglinea.com/latinoamerica/mexico/)")
+            st.markdown("- [Mercados](https://www.bloomberglinea.com/mercados/)")
+            st.markdown("- [Tecnología](https://www.bloomberglinea.com/tecnologia/)")
+            st.markdown("- [Latinoamérica](https://www.bloomberglinea.com/latinoamerica/)")
+            st.markdown("- [Estados Unidos](https://www.bloomberglinea.com/mundo/estados-unidos/)")
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # --- FILA 2: CNBC & YAHOO FINANCE ---
+    col3, col4 = st.columns(2)
+
+    with col3:
+        with st.container(border=True):
+            st.markdown("<div class='source-title'> CNBC</div>", unsafe_allow_html=True)
+            st.markdown("- [Technology](https://www.cnbc.com/technology/)")
+            st.markdown("- [Markets](https://www.cnbc.com/markets/)")
+            st.markdown("- [Politics](https://www.cnbc.com/politics/)")
+            st.markdown("- [Economy](https://www.cnbc.com/economy/)")
+
+    with col4:
+        with st.container(border=True):
+            st.markdown("<div class='source-title'> Yahoo Finance</div>", unsafe_allow_html=True)
+            st.markdown("- [Economy](https://finance.yahoo.com/topic/economic-news/)")
+            st.markdown("- [Technology](https://finance.yahoo.com/tech/)")
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # --- FILA 3: ING THINK (RESEARCH) ---
+    col5, col6 = st.columns(2)
+
+    with col5:
+        with st.container(border=True):
+            st.markdown("<div class='source-title'> ING Think</div>", unsafe_allow_html=True)
+            st.markdown("- [Commodities](https://think.ing.com/market/commodities/)")
+            st.markdown("- [Commodities, Food & Agri](https://think.ing.com/sector/commodities-food-agri/)")
+            st.markdown("- [Energy](https://think.ing.com/sector/energy/)")
+
+    # --- PIE DE PÁGINA O HERRAMIENTAS EXTRAS ---
+    st.divider()
+    st.caption("Nota: Los enlaces se abren en una nueva pestaña del navegador.")
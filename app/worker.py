@@ -0,0 +1,121 @@
+"""
+Worker de ingesta en segundo plano.
+
+Refresca cada fuente con un calendario acorde a la frecuencia de publicación
+de sus series y deja los resultados en el almacén local (data/series.sqlite),
+de modo que las páginas de Streamlit sólo leen de disco. Al final de cada
+vuelta actualiza también la instantánea (data/instantanea/) con la que
+la app arranca en frío o funciona sin conexión.
+
+Uso (desde la raíz del proyecto):
+    python -m app.worker          # corre indefinidamente
+    python -m app.worker --once   # refresca todo una vez y termina
+"""
+from pathlib import Path
+import sys
+
+#  raíz del proyecto en el path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import argparse
+import logging
+import time
+
+from app import config
+from app.data_sources import banxico, fred_api, instantanea, limitador, tablas
+
+log = logging.getLogger("worker")
+
+# Desde cuándo se mantienen las series históricas (mismo default que las gráficas)
+HISTORIA_DESDE = config.getenv("INGESTA_HISTORIA_DESDE", "2015-01-01")
+
+# Si una tarea falla se reintenta después de este tiempo
+REINTENTO_SEG = int(config.getenv("INGESTA_REINTENTO_SEG", "300"))
+
+
+def _tarea_tabla(nombre: str):
+    def _run() -> int:
+        df = tablas.refrescar(nombre)
+        return tablas.intervalo_seg(nombre, df)
+    return _run
+
+
+def _tarea_banxico(claves: list[str]):
+    """Todas las series de una frecuencia: se piden en lotes de banxico.LOTE_MAX ids."""
+    def _run() -> int:
+        for clave in claves:
+            instantanea.registrar_serie("banxico", clave)
+        banxico.actualizar_lote(claves, start=HISTORIA_DESDE)
+        return banxico.refresco_seg(claves[0])
+    return _run
+
+
+def _tarea_fred(clave: str):
+    def _run() -> int:
+        instantanea.registrar_serie("fred", fred_api.FRED_SERIES[clave])
+        fred_api.get_time_series(clave, start=HISTORIA_DESDE)
+        return fred_api.refresco_seg(fred_api.FRED_SERIES[clave])
+    return _run
+
+
+def _tareas() -> dict:
+    tareas = {}
+    for nombre in tablas.TABLAS:
+        tareas[f"tabla:{nombre}"] = _tarea_tabla(nombre)
+    por_frecuencia: dict[str, list[str]] = {}
+    for clave in banxico.SERIES_IDS:
+        por_frecuencia.setdefault(banxico.FRECUENCIAS[clave], []).append(clave)
+    for frecuencia, claves in por_frecuencia.items():
+        tareas[f"banxico:{frecuencia}"] = _tarea_banxico(claves)
+    for clave in fred_api.FRED_SERIES:
+        tareas[f"fred:{clave}"] = _tarea_fred(clave)
+    return tareas
+
+
+def run(once: bool = False) -> None:
+    instantanea.cargar()
+    tareas = _tareas()
+    proxima = {nombre: 0.0 for nombre in tareas}
+
+    while True:
+        for nombre, fn in tareas.items():
+            if proxima[nombre] > time.time():
+                continue
+            t0 = time.perf_counter()
+            try:
+                intervalo = fn()
+                log.info("%s ok (%.2fs), siguiente en %ss", nombre, time.perf_counter() - t0, intervalo)
+            except Exception:
+                log.exception("%s falló; reintento en %ss", nombre, REINTENTO_SEG)
+                intervalo = REINTENTO_SEG
+            proxima[nombre] = time.time() + intervalo
+
+        try:
+            if instantanea.escribir(forzar=once):
+                log.info("instantánea guardada en %s", instantanea.RUTA)
+        except Exception:
+            log.exception("No se pudo guardar la instantánea")
+
+        if once:
+            return
+
+        espera = min(proxima.values()) - time.time()
+        time.sleep(max(1.0, espera))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Worker de ingesta del Economic Dashboard")
+    parser.add_argument("--once", action="store_true", help="refresca todo una vez y termina")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    # Rellenos de fondo: comparten la cuota de la app (la cubeta está en el
+    # almacén) sin tocar la reserva que el limitador guarda para las páginas
+    limitador.fijar_prioridad_defecto(limitador.PRIORIDAD_FONDO)
+    run(once=args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: catálogo de Banxico con cientos de series.
+
+Genera un catálogo sintético de N series (mezcla de frecuencias) y sus
+respuestas en el servidor de réplica, apunta BANXICO_CATALOGO a él y mide:
+- get_latest_all (oportuno + fallback),
+- actualizar_lote en frío (toda la historia) y al refrescar la cola,
+- get_series_history_lote ya con todo en el almacén,
+con el número de consultas a SIE. Con lotes de banxico.LOTE_MAX ids el número
+de consultas (y el tiempo) crece con N / LOTE_MAX, no con N. El limitador de
+la cuota de SIE se apaga aquí: lo que se mide es el efecto de los lotes.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_catalogo --series 9 100 300 --latencia-ms 100
+"""
+from pathlib import Path
+import sys
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import argparse
+import datetime as dt
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
+from benchmarks.replay_server import (
+    ReplayServer, _caminata, _fechas_sinteticas, puerto_libre, variables_entorno,
+)
+
+FRECUENCIAS = ("diaria", "diaria", "semanal", "quincenal", "mensual")
+DESDE = "2015-01-01"
+
+
+def _catalogo(n: int, ruta: Path) -> dict:
+    """Escribe un catálogo de n series en 'ruta' y regresa las respuestas SIE sintéticas."""
+    rnd = random.Random(n)
+    sie = {}
+    lineas = ["clave,serie_id,frecuencia"]
+    for i in range(n):
+        frecuencia = FRECUENCIAS[i % len(FRECUENCIAS)]
+        serie_id = f"SX{i:05d}"
+        lineas.append(f"serie_{i:04d},{serie_id},{frecuencia}")
+        fechas = _fechas_sinteticas(dt.date(2014, 1, 1), frecuencia)
+        sie[serie_id] = {
+            "titulo": f"Serie sintética {i}",
+            "datos": [
+                {"fecha": f.strftime("%d/%m/%Y"), "dato": f"{v:,.4f}"}
+                for f, v in zip(fechas, _caminata(len(fechas), 20.0, 0.1, rnd))
+            ],
+        }
+    ruta.write_text("\n".join(lineas) + "\n", encoding="utf-8")
+    return sie
+
+
+def _medir_hijo() -> None:
+    """Corre en un proceso nuevo (el catálogo se lee al importar banxico)."""
+    import requests
+
+    from app.data_sources import banxico, store
+
+    url = os.environ["BENCH_REPLAY_URL"]
+
+    def _consultas() -> int:
+        return sum(requests.get(f"{url}/__stats", timeout=5).json()["peticiones"].values())
+
+    def _medir(nombre: str, fn) -> None:
+        requests.post(f"{url}/__reset", timeout=5)
+        t0 = time.perf_counter()
+        fn()
+        print(f"  {nombre:<22} {_consultas():6d} {time.perf_counter() - t0:8.2f}")
+
+    claves = list(banxico.SERIES_IDS)
+    _medir("latest", banxico.get_latest_all)
+    _medir("historia (frío)", lambda: banxico.actualizar_lote(claves, DESDE))
+    # Cola vencida: la siguiente vuelta vuelve a pedir los últimos días
+    with store._conexion() as con:
+        con.execute("UPDATE rangos SET actualizado = 0")
+    _medir("historia (cola)", lambda: banxico.actualizar_lote(claves, DESDE))
+    _medir("lectura (almacén)", lambda: banxico.get_series_history_lote(claves, DESDE))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Catálogo de Banxico con cientos de series")
+    parser.add_argument("--series", type=int, nargs="+", default=[9, 100, 300])
+    parser.add_argument("--latencia-ms", type=float, default=100.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    args = parser.parse_args(argv)
+
+    print(f"Latencia simulada: {args.latencia_ms:.0f} ms ± {args.jitter_ms:.0f} ms")
+    print(f"  {'':<22} {'cons.':>6} {'seg':>8}")
+    for n in args.series:
+        tmp = Path(tempfile.mkdtemp(prefix="dashboard-catalogo-"))
+        ruta = tmp / "catalogo.csv"
+        sie = _catalogo(n, ruta)
+
+        puerto = puerto_libre()
+        srv = ReplayServer(
+            ("127.0.0.1", puerto), {"sie": sie, "fred": {}, "yahoo": {}}, args.latencia_ms, args.jitter_ms,
+        ).iniciar()
+        env = {
+            **os.environ,
+            **variables_entorno(srv.url),
+            "BANXICO_TOKEN": os.getenv("BANXICO_TOKEN", "replay"),
+            "BANXICO_CATALOGO": str(ruta),
+            "HTTP_LIMITE_BANXICO": "off",
+            "DASHBOARD_DATA_DIR": str(tmp / "data"),
+            "BENCH_REPLAY_URL": srv.url,
+        }
+        print(f"{n} series:")
+        subprocess.run(
+            [sys.executable, "-c", "from benchmarks.bench_catalogo import _medir_hijo; _medir_hijo()"],
+            cwd=ROOT_DIR, env=env, check=True,
+        )
+        srv.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: payload y tiempo de la gráfica "Serie seleccionada".
+
+Compara px.line con la serie completa (lo que hacían layout_banxico /
+layout_fed) contra la figura WebGL reducida con LTTB de app.graficas, sobre
+una serie diaria sintética de 1991 a hoy.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_graficas
+"""
+from pathlib import Path
+import sys
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import timeit
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from app import graficas
+
+REPETICIONES = 5
+
+
+def _serie() -> pd.DataFrame:
+    fechas = pd.date_range("1991-01-01", pd.Timestamp.today().normalize(), freq="D")
+    rng = np.random.default_rng(0)
+    valores = 10 + np.cumsum(rng.normal(0, 0.05, len(fechas)))
+    return pd.DataFrame({"fecha": fechas, "valor": valores})
+
+
+def main() -> None:
+    ts = _serie()
+
+    casos = [
+        ("px.line completo   ", lambda: px.line(ts, x="fecha", y="valor", title="FIX")),
+        ("Scattergl + LTTB   ", lambda: graficas.figura_serie(ts, "FIX")),
+    ]
+
+    print(f"Serie diaria 1991-hoy ({len(ts):,} puntos), mejor de {REPETICIONES}:")
+    for nombre, fn in casos:
+        seg = min(timeit.repeat(fn, number=1, repeat=REPETICIONES))
+        payload = len(fn().to_json())
+        print(f"  {nombre}  {seg * 1000:8.1f} ms  {payload / 1024:9.1f} KB de JSON")
+
+    # La reducción conserva extremos de la serie
+    x, y = graficas.reducir(ts)
+    print(f"  puntos enviados: {len(y):,}  (max {y.max():.3f} vs {ts['valor'].max():.3f}, "
+          f"min {y.min():.3f} vs {ts['valor'].min():.3f})")
+
+
+if __name__ == "__main__":
+    main()
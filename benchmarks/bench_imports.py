@@ -0,0 +1,109 @@
+"""
+Presupuesto de tiempo de importación (estilo `python -X importtime`).
+
+Para main.py y cada página de app/vistas/ lanza un intérprete nuevo con
+-X importtime, importa primero streamlit (ya cargado en el servidor) y
+después el módulo, y reporta:
+- el tiempo acumulado de importar el módulo (mejor de REPETICIONES),
+- las dependencias pesadas que arrastra.
+
+Falla (código de salida 1) si algún módulo se pasa de su presupuesto o carga
+una dependencia que no le corresponde (p. ej. yfinance fuera de Mercados).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_imports
+"""
+from pathlib import Path
+import sys
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import json
+import os
+import subprocess
+
+REPETICIONES = 3
+
+# Presupuesto (ms) por módulo, medido con streamlit ya importado
+PRESUPUESTO_MS = {
+    "app.main": 20,
+    "app.vistas.noticias": 30,
+    "app.vistas.banxico": 1500,
+    "app.vistas.fed": 1500,
+    "app.vistas.mercados": 1500,
+    "app.vistas.comparativo": 1500,
+}
+
+PESADOS = ("pandas", "numpy", "plotly", "yfinance", "requests", "dotenv")
+
+# Dependencias que cada módulo NO debe cargar al importarse
+PROHIBIDOS = {
+    "app.main": PESADOS,
+    "app.vistas.noticias": PESADOS,
+    "app.vistas.banxico": ("yfinance",),
+    "app.vistas.fed": ("yfinance",),
+    "app.vistas.mercados": ("yfinance", "plotly"),
+    "app.vistas.comparativo": ("yfinance",),
+}
+
+_CODIGO = """
+import json, sys
+import streamlit
+antes = set(sys.modules)
+import {modulo}
+nuevos = {{m.split(".")[0] for m in set(sys.modules) - antes}}
+print(json.dumps(sorted(nuevos)))
+"""
+
+
+def _medir(modulo: str) -> tuple[float, list[str]]:
+    """(ms acumulados de importar 'modulo', paquetes raíz que cargó)."""
+    env = dict(os.environ, PYTHONPATH=str(ROOT_DIR))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CODIGO.format(modulo=modulo)],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+
+    acumulado_us = None
+    for linea in proc.stderr.splitlines():
+        if not linea.startswith("import time:"):
+            continue
+        partes = linea.split("|")
+        if len(partes) == 3 and partes[2].strip() == modulo and not partes[2][1:].startswith(" "):
+            acumulado_us = int(partes[1])
+    if acumulado_us is None:
+        raise RuntimeError(f"No se encontró {modulo} en la salida de -X importtime")
+
+    nuevos = json.loads(proc.stdout.strip().splitlines()[-1])
+    return acumulado_us / 1000, nuevos
+
+
+def main() -> None:
+    fallas = []
+    print(f"{'módulo':<26} {'ms':>8} {'presup.':>8}  dependencias pesadas")
+    for modulo, presupuesto in PRESUPUESTO_MS.items():
+        mediciones = [_medir(modulo) for _ in range(REPETICIONES)]
+        ms = min(m[0] for m in mediciones)
+        nuevos = mediciones[0][1]
+        pesados = [p for p in PESADOS if p in nuevos]
+
+        print(f"{modulo:<26} {ms:8.1f} {presupuesto:8d}  {', '.join(pesados) or '-'}")
+
+        if ms > presupuesto:
+            fallas.append(f"{modulo}: {ms:.1f} ms > {presupuesto} ms")
+        prohibidos = [p for p in PROHIBIDOS.get(modulo, ()) if p in nuevos]
+        if prohibidos:
+            fallas.append(f"{modulo}: importa {', '.join(prohibidos)}")
+
+    if fallas:
+        print("\nFuera de presupuesto:")
+        for f in fallas:
+            print(f"  - {f}")
+        sys.exit(1)
+    print("\nTodo dentro de presupuesto.")
+
+
+if __name__ == "__main__":
+    main()
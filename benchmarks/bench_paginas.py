@@ -0,0 +1,116 @@
+"""
+Benchmark de extremo a extremo de las páginas del dashboard, sin red.
+
+Levanta el servidor de réplica (replay_server.py) con la latencia indicada,
+apunta la app a él y recorre cada página con el arnés de pruebas de
+Streamlit (AppTest). Para cada página reporta:
+- tiempo de render en frío (caches y almacén local vacíos) y en caliente,
+- peticiones a los proveedores y bytes recibidos en cada caso.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_paginas --latencia-ms 150 --jitter-ms 50
+"""
+from pathlib import Path
+import sys
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.replay_server import ReplayServer, cargar_fixtures, puerto_libre, variables_entorno
+
+MAIN_PATH = str(ROOT_DIR / "app" / "main.py")
+PAGINAS = ("Banxico", "Fed", "Mercados", "Comparativo", "Noticias")
+
+
+def _limpiar_estado(data_dir: str) -> None:
+    """Deja la app como recién arrancada: sin caches en memoria ni almacén local."""
+    from app import datos
+    from app.data_sources import derivadas, instantanea, intradia, limitador, markets, store, tablas
+
+    datos.leer_tabla.cache_clear()
+    datos.get_series_history.cache_clear()
+    datos.get_time_series.cache_clear()
+    datos.get_panel.cache_clear()
+    markets._snapshot = {"ts": 0.0, "quotes": {}, "closes": {}, "ts_ticker": {}}
+    intradia.reiniciar()
+    derivadas.reiniciar()
+    limitador._cubetas.clear()
+    instantanea.reiniciar()
+    tablas._fallas.clear()
+
+    shutil.rmtree(data_dir, ignore_errors=True)
+    store._inicializado = False
+
+
+def _render(at, pagina: str) -> float:
+    t0 = time.perf_counter()
+    at.sidebar.radio[0].set_value(pagina).run()
+    seg = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(f"{pagina}: {at.exception[0].value}")
+    for err in at.error:
+        print(f"  [{pagina}] st.error: {err.value}")
+    return seg
+
+
+def _totales(stats: dict) -> tuple[int, int]:
+    return sum(stats["peticiones"].values()), sum(stats["bytes"].values())
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de render por página (sin red)")
+    parser.add_argument("--latencia-ms", type=float, default=100.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    args = parser.parse_args(argv)
+
+    # Las URLs se leen al importar app.data_sources: el entorno va primero
+    puerto = puerto_libre()
+    data_dir = tempfile.mkdtemp(prefix="dashboard-bench-")
+    os.environ.update(variables_entorno(f"http://127.0.0.1:{puerto}"))
+    os.environ.update({
+        "BANXICO_TOKEN": os.getenv("BANXICO_TOKEN", "replay"),
+        "FRED_API_KEY": os.getenv("FRED_API_KEY", "replay"),
+        "DASHBOARD_DATA_DIR": data_dir,
+    })
+
+    srv = ReplayServer(("127.0.0.1", puerto), cargar_fixtures(), args.latencia_ms, args.jitter_ms).iniciar()
+
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+
+    set_log_level("error")
+
+    # Primer run: paga los imports para que no cuenten en la primera página
+    at = AppTest.from_file(MAIN_PATH, default_timeout=300).run()
+
+    print(f"Latencia simulada: {args.latencia_ms:.0f} ms ± {args.jitter_ms:.0f} ms")
+    print(f"{'página':<10} {'frío ms':>9} {'pet.':>5} {'bytes':>10} {'caliente ms':>12} {'pet.':>5} {'bytes':>8}")
+
+    for pagina in PAGINAS:
+        _limpiar_estado(data_dir)
+        srv.reset()
+        frio = _render(at, pagina)
+        pet_frio, bytes_frio = _totales(srv.stats())
+
+        srv.reset()
+        caliente = _render(at, pagina)
+        pet_cal, bytes_cal = _totales(srv.stats())
+
+        print(
+            f"{pagina:<10} {frio * 1000:9.0f} {pet_frio:5d} {bytes_frio:10,d} "
+            f"{caliente * 1000:12.0f} {pet_cal:5d} {bytes_cal:8,d}"
+        )
+
+    srv.shutdown()
+    shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
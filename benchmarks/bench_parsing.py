@@ -0,0 +1,166 @@
+"""
+Benchmark: parseo de observaciones (loop por fila vs. vectorizado).
+
+Genera una serie diaria sintética de 30 años en el formato de SIE
+(dd/mm/yyyy, miles con coma, 'N/E' en fines de semana) y en el de FRED
+(YYYY-MM-DD, '.' sin dato) y compara el parseo fila por fila que usaban
+banxico.py / fred_api.py contra el parseo vectorizado actual.
+
+También mide el pico de memoria (tracemalloc) de una respuesta de rango de
+SIE con varias series: resp.json() + _datos_a_frame contra la lectura en
+flujo de lector_sie.py, comparado con el tamaño de los arreglos finales.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_parsing
+"""
+from pathlib import Path
+import sys
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import datetime as dt
+import json
+import timeit
+import tracemalloc
+
+import pandas as pd
+
+from app.data_sources import banxico, fred_api, lector_sie
+
+ANIOS = 30
+REPETICIONES = 5
+SERIES_MEMORIA = 20
+
+
+def _payload_sie() -> list[dict]:
+    inicio = dt.date.today() - dt.timedelta(days=365 * ANIOS)
+    datos = []
+    for i in range(365 * ANIOS):
+        f = inicio + dt.timedelta(days=i)
+        dato = "N/E" if f.weekday() >= 5 else f"{1000 + i * 0.37:,.4f}"
+        datos.append({"fecha": f.strftime("%d/%m/%Y"), "dato": dato})
+    return datos
+
+
+def _payload_fred() -> list[dict]:
+    inicio = dt.date.today() - dt.timedelta(days=365 * ANIOS)
+    obs = []
+    for i in range(365 * ANIOS):
+        f = inicio + dt.timedelta(days=i)
+        valor = "." if f.weekday() >= 5 else f"{2 + i * 0.0001:.4f}"
+        obs.append({"date": f.isoformat(), "value": valor})
+    return obs
+
+
+# --- Implementaciones anteriores (loop por fila), como referencia ---
+
+def _sie_loop(clave: str, datos: list[dict]) -> pd.DataFrame:
+    rows = []
+    for obs in datos:
+        vraw = obs.get("dato", "")
+        if vraw in ("N/E", "", None):
+            continue
+        try:
+            v = float(str(vraw).replace(",", ""))
+        except Exception:
+            continue
+        if clave in ("inflacion_general", "inflacion_subyacente") and v < 1.0:
+            v = v * 100.0
+        rows.append((obs.get("fecha", ""), v))
+
+    df = pd.DataFrame(rows, columns=["fecha", "valor"])
+    df["fecha"] = pd.to_datetime(df["fecha"], dayfirst=True, errors="coerce")
+    return df.dropna(subset=["fecha"]).sort_values("fecha")
+
+
+def _fred_loop(data: list[dict]) -> pd.DataFrame:
+    rows = []
+    for obs in data:
+        val_raw = obs["value"]
+        if val_raw in (".", ""):
+            continue
+        rows.append((obs["date"], float(val_raw)))
+    df = pd.DataFrame(rows, columns=["fecha", "valor"])
+    df["fecha"] = pd.to_datetime(df["fecha"])
+    return df.sort_values("fecha")
+
+
+def _medir(fn) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=REPETICIONES))
+
+
+def _respuesta_sie(datos: list[dict]) -> bytes:
+    series = [{"idSerie": f"SF{i}", "titulo": f"Serie {i}", "datos": datos} for i in range(SERIES_MEMORIA)]
+    return json.dumps({"bmx": {"series": series}}).encode("utf-8")
+
+
+def _con_json(cuerpo: bytes) -> int:
+    n = 0
+    for s in json.loads(cuerpo)["bmx"]["series"]:
+        n += len(banxico._datos_a_frame("fix", s["datos"]))
+    return n
+
+
+def _en_flujo(cuerpo: bytes, capacidad: int) -> int:
+    pedazos = (cuerpo[i:i + lector_sie.PEDAZO_BYTES] for i in range(0, len(cuerpo), lector_sie.PEDAZO_BYTES))
+    n = 0
+    for _, _, fechas, valores in lector_sie.leer_series(pedazos, capacidad):
+        n += len(banxico._arreglos_a_frame("fix", fechas, valores))
+    return n
+
+
+def _pico(fn, *args) -> tuple[int, int]:
+    """(pico de memoria en bytes, resultado) de fn(*args)."""
+    tracemalloc.start()
+    resultado = fn(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico, resultado
+
+
+def _memoria(sie: list[dict]) -> None:
+    cuerpo = _respuesta_sie(sie)
+    mb = 1024 * 1024
+    print(f"Respuesta SIE de {SERIES_MEMORIA} series ({len(cuerpo) / mb:.1f} MB), pico de memoria:")
+    por_serie = None
+    casos = (("resp.json()", _con_json, (cuerpo,)), ("en flujo   ", _en_flujo, (cuerpo, len(sie))))
+    for nombre, fn, args in casos:
+        pico, n = _pico(fn, *args)
+        seg = _medir(lambda: fn(*args))
+        por_serie = n // SERIES_MEMORIA * 16          # fecha (8 B) + valor (8 B)
+        print(f"  {nombre}  {pico / mb:8.1f} MB  {seg * 1000:8.1f} ms")
+    print(f"  arreglos finales de una serie: {por_serie / mb:.1f} MB (todas: {por_serie * SERIES_MEMORIA / mb:.1f} MB)")
+
+
+def main() -> None:
+    sie = _payload_sie()
+    fred = _payload_fred()
+
+    # Mismo resultado en ambos caminos
+    a = _sie_loop("fix", sie).reset_index(drop=True)
+    b = banxico._datos_a_frame("fix", sie)
+    pd.testing.assert_frame_equal(a, b, check_dtype=False)
+
+    casos = [
+        ("SIE  loop       ", lambda: _sie_loop("fix", sie)),
+        ("SIE  vectorizado", lambda: banxico._datos_a_frame("fix", sie)),
+        ("FRED loop       ", lambda: _fred_loop(fred)),
+        ("FRED vectorizado", lambda: fred_api._observaciones_a_frame(fred).dropna()),
+    ]
+
+    print(f"Serie diaria de {ANIOS} años ({len(sie):,} observaciones), mejor de {REPETICIONES}:")
+    tiempos = {}
+    for nombre, fn in casos:
+        tiempos[nombre] = _medir(fn)
+        print(f"  {nombre}  {tiempos[nombre] * 1000:8.1f} ms")
+
+    print(f"  speedup SIE : {tiempos['SIE  loop       '] / tiempos['SIE  vectorizado']:.1f}x")
+    print(f"  speedup FRED: {tiempos['FRED loop       '] / tiempos['FRED vectorizado']:.1f}x")
+
+    _memoria(sie)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Carga sobre las fuentes al crecer el número de sesiones simultáneas.
+
+Simula N sesiones que abren al mismo tiempo (con el caché frío) lo que piden
+las páginas Banxico, Fed y Mercados: tarjetas, una serie histórica de cada
+fuente y las tablas de mercados. Con el caché single-flight de app/cache.py
+el número de peticiones al servidor de réplica debe ser el mismo con 1 que
+con 50 sesiones.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_sesiones --sesiones 1 10 50 --latencia-ms 100
+"""
+from pathlib import Path
+import sys
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from benchmarks.bench_paginas import _limpiar_estado, _totales
+from benchmarks.replay_server import ReplayServer, cargar_fixtures, puerto_libre, variables_entorno
+
+INICIO, FIN = "2020-01-01", "2024-12-31"
+
+
+def _sesion(datos, barrera: threading.Barrier, errores: list) -> None:
+    barrera.wait()
+    try:
+        datos.leer_tabla("banxico_latest")
+        datos.get_series_history("fix", start=INICIO, end=FIN)
+        datos.leer_tabla("fred_latest")
+        datos.get_time_series("policy_rate", start=INICIO, end=FIN)
+        for nombre in ("markets_mag7", "markets_indices", "markets_crypto"):
+            datos.leer_tabla(nombre)
+    except Exception as e:
+        errores.append(e)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Peticiones a las fuentes vs. sesiones simultáneas")
+    parser.add_argument("--sesiones", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--latencia-ms", type=float, default=100.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    args = parser.parse_args(argv)
+
+    puerto = puerto_libre()
+    data_dir = tempfile.mkdtemp(prefix="dashboard-bench-")
+    os.environ.update(variables_entorno(f"http://127.0.0.1:{puerto}"))
+    os.environ.update({
+        "BANXICO_TOKEN": os.getenv("BANXICO_TOKEN", "replay"),
+        "FRED_API_KEY": os.getenv("FRED_API_KEY", "replay"),
+        "DASHBOARD_DATA_DIR": data_dir,
+    })
+
+    srv = ReplayServer(("127.0.0.1", puerto), cargar_fixtures(), args.latencia_ms, args.jitter_ms).iniciar()
+
+    from app import datos
+
+    print(f"Latencia simulada: {args.latencia_ms:.0f} ms ± {args.jitter_ms:.0f} ms")
+    print(f"{'sesiones':>8} {'pet.':>6} {'bytes':>10} {'seg':>7}  errores")
+    for n in args.sesiones:
+        _limpiar_estado(data_dir)
+        srv.reset()
+        barrera = threading.Barrier(n)
+        errores: list = []
+        hilos = [threading.Thread(target=_sesion, args=(datos, barrera, errores)) for _ in range(n)]
+
+        t0 = time.perf_counter()
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        seg = time.perf_counter() - t0
+
+        pet, n_bytes = _totales(srv.stats())
+        print(f"{n:8d} {pet:6d} {n_bytes:10,d} {seg:7.2f}  {len(errores)}")
+
+    srv.shutdown()
+    shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
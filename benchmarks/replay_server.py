@@ -0,0 +1,362 @@
+"""
+Servidor local que sustituye a SIE (Banxico), FRED y Yahoo con respuestas grabadas.
+
+Atiende las mismas rutas que usan los módulos de app/data_sources:
+- SIE:   /SieAPIRest/service/v1/series/{ids}/datos/oportuno
+         /SieAPIRest/service/v1/series/{ids}/datos/{inicio}/{fin}
+- FRED:  /fred/series/observations?series_id=...&observation_start=...
+         (también sort_order=desc + limit)
+- Yahoo: /v7/finance/quote?symbols=A,B,C
+         /v7/finance/spark?symbols=A,B,C&range=1d&interval=5m  (velas intradía)
+
+con latencia y jitter configurables, y lleva la cuenta de peticiones y bytes
+por proveedor (GET /__stats, POST /__reset).
+
+Las respuestas salen de benchmarks/fixtures/{sie,fred,yahoo}.json. Se graban
+desde las APIs reales con --grabar (requiere BANXICO_TOKEN / FRED_API_KEY);
+si no existen se generan series sintéticas con la misma forma.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.replay_server --puerto 8765 --latencia-ms 150 --jitter-ms 50
+    python -m benchmarks.replay_server --grabar
+y apuntar la app con:
+    BANXICO_BASE_URL=http://127.0.0.1:8765/SieAPIRest/service/v1/series
+    FRED_BASE_URL=http://127.0.0.1:8765/fred/series/observations
+    YAHOO_QUOTE_URL=http://127.0.0.1:8765/v7/finance/quote
+    YAHOO_CHART_URL=http://127.0.0.1:8765/v7/finance/spark
+"""
+from pathlib import Path
+import sys
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import argparse
+import datetime as dt
+import json
+import random
+import socket
+import threading
+import zlib
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+SIE_PREFIJO = "/SieAPIRest/service/v1/series/"
+FRED_RUTA = "/fred/series/observations"
+YAHOO_RUTA = "/v7/finance/quote"
+YAHOO_SPARK_RUTA = "/v7/finance/spark"
+
+# Frecuencia (pandas) de las series sintéticas
+_FREQ_PANDAS = {"diaria": "B", "semanal": "W-FRI", "quincenal": "SMS-16", "mensual": "MS", "trimestral": "QS"}
+
+
+# -----------------------
+# Fixtures
+# -----------------------
+def _fechas_sinteticas(desde: dt.date, frecuencia: str) -> list[dt.date]:
+    import pandas as pd
+
+    fechas = pd.date_range(desde, dt.date.today(), freq=_FREQ_PANDAS[frecuencia])
+    return [f.date() for f in fechas]
+
+
+def _caminata(n: int, inicio: float, escala: float, rnd: random.Random) -> list[float]:
+    valores, v = [], inicio
+    for _ in range(n):
+        v = max(0.0001, v + rnd.gauss(0, escala))
+        valores.append(v)
+    return valores
+
+
+def generar_fixtures() -> dict:
+    """Series sintéticas con el formato de cada API (sin red)."""
+    from app.data_sources import banxico, fred_api, markets
+
+    rnd = random.Random(42)
+    sie = {}
+    for clave, serie_id in banxico.SERIES_IDS.items():
+        frecuencia = banxico.FRECUENCIAS.get(clave, "mensual")
+        fechas = _fechas_sinteticas(dt.date(1991, 1, 1), frecuencia)
+        inflacion = clave.startswith("inflacion")
+        valores = _caminata(len(fechas), 0.04 if inflacion else 20.0, 0.0005 if inflacion else 0.1, rnd)
+        sie[serie_id] = {
+            "titulo": clave,
+            "datos": [
+                {"fecha": f.strftime("%d/%m/%Y"), "dato": f"{v:,.4f}"}
+                for f, v in zip(fechas, valores)
+            ],
+        }
+
+    fred = {}
+    ids = set(fred_api.FRED_SERIES.values()) | set(fred_api.FRECUENCIAS)
+    for serie_id in sorted(ids):
+        frecuencia = fred_api.FRECUENCIAS.get(serie_id, "mensual")
+        fechas = _fechas_sinteticas(dt.date(1960, 1, 1), frecuencia)
+        valores = _caminata(len(fechas), 100.0 if serie_id == "PCEPI" else 3.0, 0.05, rnd)
+        fred[serie_id] = [{"date": f.isoformat(), "value": f"{v:.4f}"} for f, v in zip(fechas, valores)]
+
+    yahoo = {}
+    for t in markets.ALL_TICKERS:
+        prev = rnd.uniform(1, 5000)
+        yahoo[t] = {
+            "symbol": t,
+            "marketState": "REGULAR",
+            "regularMarketPrice": prev * rnd.uniform(0.97, 1.03),
+            "regularMarketPreviousClose": prev,
+        }
+
+    return {"sie": sie, "fred": fred, "yahoo": yahoo}
+
+
+def grabar_fixtures() -> dict:
+    """Graba respuestas reales de SIE, FRED y Yahoo (requiere credenciales y red)."""
+    from app.data_sources import banxico, fred_api, markets
+
+    hoy = dt.date.today().isoformat()
+    sie = {}
+    for clave, serie_id in banxico.SERIES_IDS.items():
+        raw = banxico._banxico_request(f"{banxico.BASE_URL}/{serie_id}/datos/1991-01-01/{hoy}")
+        if raw:
+            sie[serie_id] = {"titulo": raw[0].get("titulo", clave), "datos": raw[0].get("datos", [])}
+
+    fred = {}
+    ids = set(fred_api.FRED_SERIES.values()) | set(fred_api.FRECUENCIAS)
+    for serie_id in sorted(ids):
+        resp = fred_api.http_client.get(
+            "fred", fred_api.FRED_BASE_URL,
+            params={"series_id": serie_id, "api_key": fred_api.FRED_API_KEY, "file_type": "json"},
+        )
+        resp.raise_for_status()
+        fred[serie_id] = resp.json().get("observations", [])
+
+    yahoo = markets._fetch_quotes(markets.ALL_TICKERS)
+    return {"sie": sie, "fred": fred, "yahoo": yahoo}
+
+
+def cargar_fixtures() -> dict:
+    datos = {}
+    for nombre in ("sie", "fred", "yahoo"):
+        ruta = FIXTURES_DIR / f"{nombre}.json"
+        if not ruta.exists():
+            return guardar_fixtures(generar_fixtures())
+        datos[nombre] = json.loads(ruta.read_text(encoding="utf-8"))
+    return datos
+
+
+def guardar_fixtures(datos: dict) -> dict:
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    for nombre, contenido in datos.items():
+        (FIXTURES_DIR / f"{nombre}.json").write_text(json.dumps(contenido), encoding="utf-8")
+    return datos
+
+
+# -----------------------
+# Servidor
+# -----------------------
+def variables_entorno(url: str) -> dict:
+    """Variables de entorno para apuntar la app a un servidor de réplica en 'url'."""
+    return {
+        "BANXICO_BASE_URL": url + SIE_PREFIJO.rstrip("/"),
+        "FRED_BASE_URL": url + FRED_RUTA,
+        "YAHOO_QUOTE_URL": url + YAHOO_RUTA,
+        "YAHOO_CHART_URL": url + YAHOO_SPARK_RUTA,
+    }
+
+
+def puerto_libre(host: str = "127.0.0.1") -> int:
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, direccion, fixtures: dict, latencia_ms: float = 0.0, jitter_ms: float = 0.0):
+        super().__init__(direccion, _Handler)
+        self.latencia_ms = latencia_ms
+        self.jitter_ms = jitter_ms
+        self.peticiones = Counter()
+        self.bytes = Counter()
+        self._lock = threading.Lock()
+
+        self.sie = fixtures["sie"]
+        self.fred = fixtures["fred"]
+        self.yahoo = fixtures["yahoo"]
+        # Fechas ISO precalculadas para filtrar rangos de SIE sin reparsear
+        self._sie_iso = {
+            sid: [dt.datetime.strptime(o["fecha"], "%d/%m/%Y").date().isoformat() for o in s["datos"]]
+            for sid, s in self.sie.items()
+        }
+
+    @property
+    def url(self) -> str:
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def env(self) -> dict:
+        return variables_entorno(self.url)
+
+    def registrar(self, proveedor: str, n_bytes: int) -> None:
+        with self._lock:
+            self.peticiones[proveedor] += 1
+            self.bytes[proveedor] += n_bytes
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"peticiones": dict(self.peticiones), "bytes": dict(self.bytes)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.peticiones.clear()
+            self.bytes.clear()
+
+    def iniciar(self) -> "ReplayServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    # --- respuestas ---
+    def responder_sie(self, ruta: str):
+        partes = ruta[len(SIE_PREFIJO):].split("/")
+        if len(partes) < 3 or partes[1] != "datos":
+            return 404, {"error": "ruta SIE no soportada"}
+        ids = partes[0].split(",")
+        series = []
+        for sid in ids:
+            s = self.sie.get(sid)
+            if s is None:
+                continue
+            datos = s["datos"]
+            if partes[2] == "oportuno":
+                datos = datos[-1:]
+            elif len(partes) >= 4:
+                iso = self._sie_iso[sid]
+                datos = [o for o, f in zip(datos, iso) if partes[2] <= f <= partes[3]]
+            series.append({"idSerie": sid, "titulo": s["titulo"], "datos": datos})
+        return 200, {"bmx": {"series": series}}
+
+    def responder_fred(self, qs: dict):
+        serie_id = qs.get("series_id", [""])[0]
+        obs = self.fred.get(serie_id)
+        if obs is None:
+            return 400, {"error_message": f"Bad Request. The series does not exist: {serie_id}"}
+        inicio = qs.get("observation_start", ["0000-00-00"])[0]
+        fin = qs.get("observation_end", ["9999-99-99"])[0]
+        obs = [o for o in obs if inicio <= o["date"] <= fin]
+        if qs.get("sort_order", ["asc"])[0] == "desc":
+            obs = obs[::-1]
+        if "limit" in qs:
+            obs = obs[: int(qs["limit"][0])]
+        return 200, {"count": len(obs), "observations": obs}
+
+    def responder_yahoo(self, qs: dict):
+        simbolos = qs.get("symbols", [""])[0].split(",")
+        result = [self.yahoo[s] for s in simbolos if s in self.yahoo]
+        return 200, {"quoteResponse": {"result": result, "error": None}}
+
+    def responder_spark(self, qs: dict):
+        """Velas de 5 minutos de la última sesión que terminan en el precio de la cotización grabada."""
+        simbolos = qs.get("symbols", [""])[0].split(",")
+        fin = int(time.time()) // 300 * 300
+        ts = list(range(fin - 77 * 300, fin + 1, 300))
+        result = []
+        for s in simbolos:
+            q = self.yahoo.get(s)
+            precio = (q or {}).get("regularMarketPrice")
+            if precio is None:
+                continue
+            # Semilla por símbolo: la misma respuesta en cada corrida
+            caminata = _caminata(len(ts), 1.0, 0.002, random.Random(zlib.crc32(s.encode())))
+            cierre = [precio * v / caminata[-1] for v in caminata]
+            result.append({
+                "symbol": s,
+                "response": [{
+                    "meta": {"symbol": s, "dataGranularity": "5m", "range": "1d"},
+                    "timestamp": ts,
+                    "indicators": {"quote": [{"close": cierre}]},
+                }],
+            })
+        return 200, {"spark": {"result": result, "error": None}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: ReplayServer
+
+    def log_message(self, *args):
+        pass
+
+    def _enviar(self, codigo: int, cuerpo: dict) -> int:
+        data = json.dumps(cuerpo).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        return len(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        qs = parse_qs(url.query)
+
+        if url.path == "/__stats":
+            self._enviar(200, self.server.stats())
+            return
+
+        if url.path.startswith(SIE_PREFIJO):
+            proveedor, (codigo, cuerpo) = "banxico", self.server.responder_sie(url.path)
+        elif url.path == FRED_RUTA:
+            proveedor, (codigo, cuerpo) = "fred", self.server.responder_fred(qs)
+        elif url.path == YAHOO_RUTA:
+            proveedor, (codigo, cuerpo) = "yahoo", self.server.responder_yahoo(qs)
+        elif url.path == YAHOO_SPARK_RUTA:
+            proveedor, (codigo, cuerpo) = "yahoo", self.server.responder_spark(qs)
+        else:
+            self._enviar(404, {"error": "ruta no soportada"})
+            return
+
+        espera = self.server.latencia_ms + random.uniform(-1, 1) * self.server.jitter_ms
+        if espera > 0:
+            time.sleep(espera / 1000.0)
+
+        self.server.registrar(proveedor, self._enviar(codigo, cuerpo))
+
+    def do_POST(self):
+        if urlparse(self.path).path == "/__reset":
+            self.server.reset()
+            self._enviar(200, {"ok": True})
+        else:
+            self._enviar(404, {"error": "ruta no soportada"})
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor de réplica de SIE / FRED / Yahoo")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--latencia-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--grabar", action="store_true", help="graba fixtures desde las APIs reales y termina")
+    parser.add_argument("--sintetico", action="store_true", help="regenera fixtures sintéticos y termina")
+    args = parser.parse_args(argv)
+
+    if args.grabar:
+        guardar_fixtures(grabar_fixtures())
+        return
+    if args.sintetico:
+        guardar_fixtures(generar_fixtures())
+        return
+
+    srv = ReplayServer((args.host, args.puerto), cargar_fixtures(), args.latencia_ms, args.jitter_ms)
+    print(f"Réplica escuchando en {srv.url}")
+    for k, v in srv.env().items():
+        print(f"  {k}={v}")
+    srv.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Configuración común de las pruebas.
+
+Pone la raíz del proyecto en el path y apunta el almacén local a una carpeta
+temporal antes de importar cualquier módulo de app/ (store.DATA_DIR y las
+credenciales se leen al importar). Ninguna prueba sale a la red: las que
+necesitan HTTP levantan un servidor local.
+
+Uso (desde la raíz del proyecto):
+    python -m pytest -q
+"""
+from pathlib import Path
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+os.environ["DASHBOARD_DATA_DIR"] = tempfile.mkdtemp(prefix="dashboard-pruebas-")
+os.environ.setdefault("BANXICO_TOKEN", "pruebas")
+os.environ.setdefault("FRED_API_KEY", "pruebas")
+
+import pytest
+
+
+@pytest.fixture
+def almacen():
+    """Almacén local vacío para la prueba (app.data_sources.store)."""
+    from app.data_sources import store
+
+    shutil.rmtree(store.DATA_DIR, ignore_errors=True)
+    store._inicializado = False
+    yield store
+    shutil.rmtree(store.DATA_DIR, ignore_errors=True)
+    store._inicializado = False
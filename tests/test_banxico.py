@@ -0,0 +1,63 @@
+"""Consultas a SIE de Banxico (app/data_sources/banxico.py) contra un servidor local."""
+import datetime as dt
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+
+from app.data_sources import banxico, http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serie diaria desde la fecha inicial de la URL hasta 'hasta' (puede ser futura)."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        partes = urlparse(self.path).path.strip("/").split("/")
+        serie_id, inicio, fin = partes[-4], partes[-2], partes[-1]
+        self.server.rangos.append((inicio, fin))
+        dia, datos = dt.date.fromisoformat(inicio), []
+        while dia <= self.server.hasta:
+            datos.append({"fecha": dia.strftime("%d/%m/%Y"), "dato": f"{dia.toordinal() % 1000}.5"})
+            dia += dt.timedelta(days=1)
+        datos.append({"fecha": dia.strftime("%d/%m/%Y"), "dato": "N/E"})
+        cuerpo = json.dumps({"bmx": {"series": [{"idSerie": serie_id, "titulo": "x", "datos": datos}]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+@pytest.fixture
+def sie(monkeypatch):
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.daemon_threads = True
+    srv.rangos = []
+    srv.hasta = banxico._hoy_mx() + dt.timedelta(days=3)     # publicaciones con fecha futura
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    monkeypatch.setattr(banxico, "BASE_URL", f"http://127.0.0.1:{srv.server_address[1]}/series")
+    yield srv
+    srv.shutdown()
+
+
+def test_latest_n_pide_solo_la_ventana_y_corta_en_hoy_de_mexico(sie):
+    hoy = banxico._hoy_mx()
+    df = banxico.get_latest_n("fix", 3)
+
+    assert list(df.columns) == ["fecha", "valor"]
+    assert df["fecha"].dt.date.tolist() == [hoy - dt.timedelta(days=k) for k in (2, 1, 0)]
+    inicio, fin = sie.rangos[-1]
+    assert fin == hoy.isoformat()
+    assert dt.date.fromisoformat(inicio) == hoy - dt.timedelta(days=banxico._ventana_dias("fix", 3))
+
+    asincrono = http_client.ejecutar(banxico.get_latest_n_async("fix", 3))
+    assert asincrono.equals(df)
+
+
+def test_latest_n_clave_desconocida():
+    with pytest.raises(KeyError):
+        banxico.get_latest_n("no_existe", 1)
@@ -0,0 +1,143 @@
+"""Caché TTL + stale-while-revalidate + single-flight (app/cache.py)."""
+import threading
+import time
+
+import pytest
+
+from app.cache import cached
+
+
+def _esperar(condicion, limite: float = 2.0) -> None:
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin, "tiempo agotado"
+        time.sleep(0.005)
+
+
+def test_vencido_regresa_lo_anterior_y_refresca_en_fondo():
+    llamadas = []
+    liberar = threading.Event()
+
+    @cached(ttl_seg=0.05)
+    def dato(x):
+        llamadas.append(x)
+        if len(llamadas) > 1:
+            liberar.wait(2)
+        return len(llamadas)
+
+    assert dato("a") == 1
+    assert dato("a") == 1                  # dentro del TTL
+    time.sleep(0.06)
+
+    # Vencido: responde de inmediato con el valor viejo mientras el refresco espera
+    t0 = time.monotonic()
+    assert dato("a") == 1
+    assert dato("a") == 1
+    assert time.monotonic() - t0 < 0.5
+    _esperar(lambda: len(llamadas) == 2)   # un solo refresco aunque haya dos lecturas vencidas
+
+    liberar.set()
+    _esperar(lambda: dato("a") == 2)
+    assert len(llamadas) == 2
+
+
+def test_refresco_fallido_conserva_el_valor():
+    estado = {"fallar": False, "n": 0}
+
+    @cached(ttl_seg=0.02)
+    def dato():
+        estado["n"] += 1
+        if estado["fallar"]:
+            raise RuntimeError("fuente caída")
+        return estado["n"]
+
+    assert dato() == 1
+    estado["fallar"] = True
+    time.sleep(0.03)
+    assert dato() == 1
+    _esperar(lambda: estado["n"] == 2)
+    time.sleep(0.01)
+    assert dato() == 1
+
+
+def test_una_sola_peticion_por_clave_y_el_error_llega_a_todos():
+    empezo, liberar = threading.Event(), threading.Event()
+    llamadas = []
+
+    @cached(ttl_seg=60)
+    def dato(x):
+        llamadas.append(x)
+        empezo.set()
+        liberar.wait(2)
+        raise ValueError(f"sin datos para {x}")
+
+    errores = []
+
+    def _pedir():
+        try:
+            dato("a")
+        except ValueError as e:
+            errores.append(str(e))
+
+    primero = threading.Thread(target=_pedir)
+    primero.start()
+    empezo.wait(2)
+    otros = [threading.Thread(target=_pedir) for _ in range(5)]
+    for t in otros:
+        t.start()
+    time.sleep(0.05)
+    liberar.set()
+    for t in [primero, *otros]:
+        t.join(2)
+
+    assert llamadas == ["a"]
+    assert errores == ["sin datos para a"] * 6
+
+    # El error no queda guardado: la siguiente llamada vuelve a la fuente
+    with pytest.raises(ValueError):
+        dato("a")
+    assert llamadas == ["a", "a"]
+
+
+def test_respaldo_se_guarda_vencido():
+    import pandas as pd
+
+    n = {"v": 0}
+
+    @cached(ttl_seg=3600)
+    def tabla():
+        n["v"] += 1
+        df = pd.DataFrame({"v": [n["v"]]})
+        if n["v"] == 1:
+            df.attrs["respaldo"] = True
+        return df
+
+    assert tabla()["v"].iloc[0] == 1
+    # La copia de respaldo se sirve una vez y dispara la búsqueda del dato fresco
+    assert tabla()["v"].iloc[0] == 1
+    _esperar(lambda: tabla()["v"].iloc[0] == 2)
+
+
+def test_posicionales_y_por_nombre_comparten_clave_y_ttl():
+    llamadas = []
+    ttl_pedidos = []
+
+    def _ttl(clave, *a, **kw):
+        ttl_pedidos.append((clave, a, kw))
+        return 60
+
+    @cached(_ttl)
+    def serie(clave, start, end=None):
+        llamadas.append((clave, start, end))
+        return len(llamadas)
+
+    assert serie("fix", "2020-01-01", "2020-02-01") == 1
+    # Acierto con posicionales (el TTL se consulta con los mismos argumentos)
+    assert serie("fix", "2020-01-01", "2020-02-01") == 1
+    assert serie("fix", start="2020-01-01", end="2020-02-01") == 1
+    assert serie(clave="fix", end="2020-02-01", start="2020-01-01") == 1
+    # El valor por defecto cuenta igual que pasarlo
+    assert serie("fix", "2021-01-01") == 2
+    assert serie("fix", "2021-01-01", None) == 2
+    assert len(llamadas) == 2
+    assert ttl_pedidos and all(p == ("fix", p[1], {}) for p in ttl_pedidos)
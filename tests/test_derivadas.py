@@ -0,0 +1,136 @@
+"""Recálculo incremental de series derivadas (app/data_sources/derivadas.py)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data_sources import derivadas
+
+
+@pytest.fixture
+def bases(monkeypatch):
+    """
+    Bases en memoria en lugar del almacén / la fuente. Se revisan en cada
+    llamada (REFRESCO_SEG 0) y se anotan las fechas desde las que se leyeron.
+    """
+    datos: dict[tuple, pd.DataFrame] = {}
+    lecturas: list[tuple] = []
+
+    def _leer_base(fuente, clave, start):
+        lecturas.append((fuente, clave, start))
+        df = datos[(fuente, clave)]
+        return df[df["fecha"] >= pd.Timestamp(start)].reset_index(drop=True)
+
+    monkeypatch.setattr(derivadas, "_leer_base", _leer_base)
+    monkeypatch.setattr(derivadas, "_refresco_base", lambda fuente, clave: 0)
+    derivadas.reiniciar()
+    yield datos, lecturas
+    derivadas.reiniciar()
+
+
+def _espiar(monkeypatch, op: str) -> list[int]:
+    """Anota cuántos puntos recalcula cada llamada a la operación 'op'."""
+    calculados = []
+    original = derivadas._OPERACIONES[op]
+
+    def _op(spec, base, menos, idx):
+        calculados.append(len(idx))
+        return original(spec, base, menos, idx)
+
+    monkeypatch.setitem(derivadas._OPERACIONES, op, _op)
+    return calculados
+
+
+def _completa(clave: str, datos: dict) -> pd.DataFrame:
+    """La misma derivada calculada desde cero con las bases actuales."""
+    guardadas = dict(derivadas._bases), dict(derivadas._derivadas)
+    derivadas.reiniciar()
+    try:
+        return derivadas.serie(clave)
+    finally:
+        derivadas._bases.update(guardadas[0])
+        derivadas._derivadas.update(guardadas[1])
+
+
+def _fix(fin: str) -> pd.DataFrame:
+    fechas = pd.bdate_range(derivadas.DESDE, fin)
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({"fecha": fechas, "valor": 17 + rng.normal(0, 0.1, len(fechas)).cumsum()})
+
+
+def test_media_movil_recalcula_solo_la_cola(bases, monkeypatch):
+    datos, lecturas = bases
+    calculados = _espiar(monkeypatch, "media_movil")
+    base = ("banxico", "fix")
+
+    datos[base] = _fix("2016-06-30")
+    antes = derivadas.serie("fix_media_20")
+    assert calculados == [len(datos[base])]
+
+    # Revisión de un dato de la cola y tres días nuevos
+    nuevo = _fix("2016-07-05")
+    nuevo.loc[nuevo.index[-5], "valor"] += 1
+    datos[base] = nuevo
+    despues = derivadas.serie("fix_media_20")
+
+    # Sólo se releyó la cola de la base y sólo se recalculó desde la revisión
+    assert lecturas[-1][2] == str(np.datetime64("2016-06-30") - np.timedelta64(derivadas._relectura_dias("banxico"), "D"))
+    assert calculados[-1] == 5
+    pd.testing.assert_frame_equal(despues, _completa("fix_media_20", datos))
+
+    # Lo anterior a la revisión es lo mismo que ya estaba calculado
+    n = len(despues) - 5
+    pd.testing.assert_frame_equal(despues.iloc[:n], antes.iloc[:n])
+
+    # Sin cambios en la base no se recalcula nada
+    n = len(calculados)
+    derivadas.serie("fix_media_20")
+    assert len(calculados) == n
+
+
+def test_yoy_con_revision_mensual(bases, monkeypatch):
+    datos, _ = bases
+    calculados = _espiar(monkeypatch, "yoy")
+    base = ("fred", "inflation_pce")
+    fechas = pd.date_range(derivadas.DESDE, "2019-12-01", freq="MS")
+    datos[base] = pd.DataFrame({"fecha": fechas, "valor": 100 * 1.002 ** np.arange(len(fechas))})
+    derivadas.serie("inflation_pce_yoy")
+
+    revisada = datos[base].copy()
+    revisada.loc[revisada.index[-3], "valor"] *= 1.01
+    datos[base] = revisada
+    despues = derivadas.serie("inflation_pce_yoy")
+
+    assert calculados[-1] == 3
+    pd.testing.assert_frame_equal(despues, _completa("inflation_pce_yoy", datos))
+
+
+def test_diferencial_se_marca_por_cualquiera_de_sus_bases(bases, monkeypatch):
+    datos, _ = bases
+    calculados = _espiar(monkeypatch, "diferencial")
+    fechas = pd.bdate_range(derivadas.DESDE, "2016-12-30")
+    datos[("banxico", "tasa_objetivo")] = pd.DataFrame({"fecha": fechas, "valor": 4.0})
+    mensual = pd.date_range(derivadas.DESDE, "2016-12-01", freq="MS")
+    datos[("banxico", "inflacion_general")] = pd.DataFrame({"fecha": mensual, "valor": 3.0})
+    derivadas.serie("tasa_real_mx")
+
+    # Sólo cambia la base que se resta (su último dato): se recalcula desde ahí
+    restada = datos[("banxico", "inflacion_general")].copy()
+    restada.loc[restada.index[-1], "valor"] = 3.5
+    datos[("banxico", "inflacion_general")] = restada
+    despues = derivadas.serie("tasa_real_mx")
+
+    assert calculados[-1] == int((despues["fecha"] >= "2016-12-01").sum())
+    assert despues["valor"].iloc[-1] == pytest.approx(0.5)
+    pd.testing.assert_frame_equal(despues, _completa("tasa_real_mx", datos))
+
+
+def test_ultimas_lee_solo_la_ventana(bases):
+    datos, lecturas = bases
+    hoy = pd.Timestamp.today().normalize()
+    fechas = pd.bdate_range(derivadas.DESDE, hoy)
+    datos[("banxico", "fix")] = pd.DataFrame({"fecha": fechas, "valor": np.arange(len(fechas), dtype=float)})
+
+    df = derivadas.ultimas("fix_media_20", 3)
+    assert len(df) == 3
+    assert df["valor"].tolist() == pytest.approx([len(fechas) - 1 - 9.5 - k for k in (2, 1, 0)])
+    assert lecturas[0][2] > str((hoy - pd.Timedelta(days=120)).date())
@@ -0,0 +1,88 @@
+"""Reintentos del cliente HTTP compartido (app/data_sources/http_client.py)."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.data_sources import http_client, limitador
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Las primeras 'fallas' peticiones reciben 429 con Retry-After; luego 200."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        srv = self.server
+        srv.peticiones += 1
+        if srv.peticiones <= srv.fallas:
+            self.send_response(429)
+            self.send_header("Retry-After", srv.retry_after)
+            cuerpo = b"lento"
+        else:
+            self.send_response(200)
+            cuerpo = b"ok"
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+@pytest.fixture
+def servidor(monkeypatch):
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.daemon_threads = True
+    srv.peticiones, srv.fallas, srv.retry_after = 0, 1, "120"
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    # Proveedor sin límite de peticiones
+    monkeypatch.setitem(http_client.TIMEOUTS, "pruebas", 10.0)
+    monkeypatch.setattr(http_client, "BACKOFF_JITTER", 0.0)
+    yield srv, f"http://127.0.0.1:{srv.server_address[1]}/"
+    srv.shutdown()
+
+
+def test_retry_after_largo_no_bloquea_una_pagina(servidor):
+    srv, url = servidor
+    t0 = time.monotonic()
+    with limitador.prioridad(limitador.PRIORIDAD_INTERACTIVA):
+        resp = http_client.get("pruebas", url)
+    assert resp.status_code == 429
+    assert srv.peticiones == 1
+    assert time.monotonic() - t0 < 1
+
+
+def test_retry_after_se_acota_al_timeout_en_fondo(servidor, monkeypatch):
+    srv, url = servidor
+    monkeypatch.setitem(http_client.TIMEOUTS, "pruebas", 0.3)
+    t0 = time.monotonic()
+    with limitador.prioridad(limitador.PRIORIDAD_FONDO):
+        resp = http_client.get("pruebas", url)
+    assert resp.status_code == 200
+    assert srv.peticiones == 2
+    # Retry-After: 120 se acota al timeout del proveedor (0.3 s)
+    assert 0.25 <= time.monotonic() - t0 < 2
+
+
+def test_retry_after_corto_se_respeta_en_una_pagina(servidor):
+    srv, url = servidor
+    srv.retry_after = "0.1"
+    with limitador.prioridad(limitador.PRIORIDAD_INTERACTIVA):
+        assert http_client.get("pruebas", url).status_code == 200
+        assert http_client.ejecutar(http_client.aget("pruebas", url)).status_code == 200
+    assert srv.peticiones == 3
+
+
+def test_async_tampoco_espera_de_mas(servidor):
+    srv, url = servidor
+    with limitador.prioridad(limitador.PRIORIDAD_INTERACTIVA):
+        resp = http_client.ejecutar(http_client.aget("pruebas", url))
+    assert resp.status_code == 429
+    assert srv.peticiones == 1
+
+
+def test_espera_sin_retry_after_es_backoff():
+    with limitador.prioridad(limitador.PRIORIDAD_FONDO):
+        assert http_client._espera_reintento("fred", 1, None) == pytest.approx(http_client.BACKOFF_FACTOR, abs=http_client.BACKOFF_JITTER)
+        assert http_client._espera_reintento("fred", 1, "Wed, 21 Oct 2015 07:28:00 GMT") is not None
+        assert http_client._espera_reintento("fred", 1, "999") == http_client.TIMEOUTS["fred"]
@@ -0,0 +1,40 @@
+"""Instantánea del último estado conocido (app/data_sources/instantanea.py)."""
+import pandas as pd
+
+from app.data_sources import instantanea
+
+
+def _tablas(valor: int) -> dict:
+    return {"banxico_latest": (pd.DataFrame({"valor": [valor]}), 1000.0 + valor)}
+
+
+def _carpetas() -> list[str]:
+    return sorted(p.name for p in instantanea.RUTA.glob("g*"))
+
+
+def test_una_escritura_mas_vieja_no_reemplaza_a_la_nueva(almacen):
+    instantanea._escribir_archivo(200.0, _tablas(2), {})
+    # Escritura más lenta que empezó antes (otro proceso): llega después
+    instantanea._escribir_archivo(100.0, _tablas(1), {})
+
+    datos = instantanea._leer_archivo()
+    assert datos["generado"] == 200.0
+    assert datos["tablas"]["banxico_latest"][0]["valor"].tolist() == [2]
+    assert _carpetas() == ["g200000"]
+
+
+def test_se_limpian_solo_las_subcarpetas_que_ya_no_se_pueden_publicar(almacen):
+    instantanea._escribir_archivo(100.0, _tablas(1), {})
+    instantanea._escribir_archivo(200.0, _tablas(2), {})
+    # Otra escritura en curso (sin publicar) más nueva que la publicada
+    (instantanea.RUTA / "g250000").mkdir()
+    instantanea._escribir_archivo(300.0, _tablas(3), {})
+
+    # g100000 ya no se puede publicar; g200000 era la publicada (quien la esté
+    # leyendo la sigue viendo) y g250000 puede estar escribiéndose
+    assert _carpetas() == ["g200000", "g250000", "g300000"]
+    assert instantanea._leer_archivo()["generado"] == 300.0
+
+    instantanea._escribir_archivo(400.0, _tablas(4), {})
+    assert _carpetas() == ["g300000", "g400000"]
+    assert instantanea._leer_archivo()["tablas"]["banxico_latest"][0]["valor"].tolist() == [4]
@@ -0,0 +1,222 @@
+"""Lectura en flujo de respuestas de SIE (app/data_sources/lector_sie.py)."""
+import datetime as dt
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from app.data_sources import lector_sie
+
+SERIES = {
+    "SF43718": ("Tipo de cambio FIX", [("02/01/2024", "16.9220"), ("03/01/2024", "N/E"), ("04/01/2024", "1,017.5")]),
+    "SP68257": ('Valor de UDIS "base" {1995}', [("01/01/2024", "7.981"), ("31/02/2024", "8.0"), ("02/01/2024", "7.99")]),
+    "SF61745": ("Tasa objetivo", []),
+}
+
+
+def _cuerpo(series: dict = SERIES) -> bytes:
+    return json.dumps({"bmx": {"series": [
+        {"idSerie": sid, "titulo": titulo, "datos": [{"fecha": f, "dato": d} for f, d in datos]}
+        for sid, (titulo, datos) in series.items()
+    ]}}, ensure_ascii=False).encode("utf-8")
+
+
+def _pedazos(cuerpo: bytes, n: int):
+    return (cuerpo[i:i + n] for i in range(0, len(cuerpo), n))
+
+
+def _leidas(pedazos) -> list:
+    return [(sid, titulo, f.copy(), v.copy()) for sid, titulo, f, v in lector_sie.leer_series(pedazos)]
+
+
+@pytest.mark.parametrize("n", [1, 3, 7, 64, 10**6])
+def test_cualquier_tamano_de_pedazo_da_lo_mismo(n):
+    leidas = _leidas(_pedazos(_cuerpo(), n))
+
+    assert [(sid, titulo) for sid, titulo, _, _ in leidas] == [(sid, t) for sid, (t, _) in SERIES.items()]
+    _, _, fechas, valores = leidas[0]
+    assert fechas.astype("datetime64[D]").tolist() == [dt.date(2024, 1, 2), dt.date(2024, 1, 3), dt.date(2024, 1, 4)]
+    np.testing.assert_array_equal(valores, [16.922, np.nan, 1017.5])
+    # Fecha inexistente (31/02) -> NaT, no 2 de marzo
+    assert np.isnat(leidas[1][2][1])
+    assert len(leidas[2][2]) == 0
+
+
+def test_cuerpo_cortado_lanza_sin_entregar_la_ultima_serie():
+    cuerpo = _cuerpo()
+    ultima = list(SERIES)[-1]
+    for corte in range(len(cuerpo) - 1):
+        vistas = []
+        with pytest.raises(ValueError):
+            for sid, _, _, _ in lector_sie.leer_series(_pedazos(cuerpo[:corte], 1)):
+                vistas.append(sid)
+        assert ultima not in vistas, corte
+
+
+def test_series_anteriores_al_corte_llegan_completas():
+    cuerpo = _cuerpo()
+    corte = cuerpo.index(b'"datos": []') + 10     # a media respuesta, ya dentro de la tercera serie
+    vistas = []
+    with pytest.raises(ValueError, match="incompleta"):
+        for sid, _, fechas, _ in lector_sie.leer_series(_pedazos(cuerpo[:corte], 1)):
+            vistas.append((sid, len(fechas)))
+    assert vistas == [("SF43718", 3), ("SP68257", 3)]
+
+
+def test_respuesta_sin_series_y_sin_bmx():
+    assert _leidas([b'{"bmx": {"series": []}}\n']) == []
+    with pytest.raises(ValueError, match="bmx"):
+        _leidas([b'{"error": "token"}'])
+
+
+@pytest.mark.parametrize("n", [1, 5, 10**6])
+def test_otro_orden_de_llaves_y_dato_numerico(n):
+    cuerpo = json.dumps({"bmx": {"series": [
+        {"idSerie": "SF1", "titulo": "Invertida",
+         "datos": [{"dato": "1.5", "fecha": "01/01/2020"}, {"dato": "N/E", "fecha": "02/01/2020"}]},
+        {"idSerie": "SF2", "titulo": "Numérica", "datos": [{"fecha": "01/01/2020", "dato": 1.5},
+                                                           {"fecha": "02/01/2020", "dato": 2}]},
+    ]}}).encode()
+    leidas = {sid: (f, v) for sid, _, f, v in _leidas(_pedazos(cuerpo, n))}
+
+    assert set(leidas) == {"SF1", "SF2"}
+    assert len(leidas["SF1"][0]) == 2
+    np.testing.assert_array_equal(leidas["SF1"][1], [1.5, np.nan])
+    np.testing.assert_array_equal(leidas["SF2"][1], [1.5, 2.0])
+
+
+@pytest.mark.parametrize("datos", [
+    '[{"fecha": "01/01/2020"}]',                                  # sin 'dato'
+    '[{"fecha": "01/01/2020", "dato": {"valor": "1"}}]',          # anidado
+    '[["01/01/2020", "1.5"]]',                                    # otra forma
+])
+@pytest.mark.parametrize("n", [1, 4, 10**6])
+def test_observaciones_con_otra_forma_lanzan(datos, n):
+    cuerpo = ('{"bmx": {"series": [{"idSerie": "SF1", "titulo": "x", "datos": %s}]}}' % datos).encode()
+    with pytest.raises(ValueError):
+        _leidas(_pedazos(cuerpo, n))
+
+
+@pytest.mark.parametrize("serie", [
+    '{"datos": [{"fecha": "01/01/2020", "dato": "1"}], "idSerie": "SF1", "titulo": "x"}',
+    '{"idSerie": "SF1", "datos": [{"fecha": "01/01/2020", "dato": "1"}], "titulo": "x"}',
+    '{"idSerie": "SF1", "titulo": "x"}, {"idSerie": "SF2", "datos": []}',
+])
+def test_series_con_llaves_en_otro_orden_lanzan(serie):
+    # Lanzar en lugar de atribuir las observaciones a otra serie (o perderlas)
+    cuerpo = ('{"bmx": {"series": [%s]}}' % serie).encode()
+    with pytest.raises(ValueError):
+        _leidas(_pedazos(cuerpo, 3))
+
+
+def test_lectura_asincrona_igual_a_la_sincrona():
+    import asyncio
+
+    async def _apedazos(cuerpo, n):
+        for p in _pedazos(cuerpo, n):
+            yield p
+
+    async def _aleidas(pedazos):
+        return [(sid, f.copy(), v.copy()) async for sid, _, f, v in lector_sie.aleer_series(pedazos)]
+
+    cuerpo = _cuerpo()
+    asincronas = asyncio.run(_aleidas(_apedazos(cuerpo, 3)))
+    sincronas = [(sid, f, v) for sid, _, f, v in _leidas(_pedazos(cuerpo, 3))]
+    assert [s for s, _, _ in asincronas] == [s for s, _, _ in sincronas]
+    for (_, fa, va), (_, fs, vs) in zip(asincronas, sincronas):
+        np.testing.assert_array_equal(fa, fs)
+        np.testing.assert_array_equal(va, vs)
+
+    with pytest.raises(ValueError, match="incompleta"):
+        asyncio.run(_aleidas(_apedazos(cuerpo[:-5], 3)))
+
+
+# ---------- Descarga en flujo de un lote (banxico._descargar_lote_flujo) ----------
+
+class _Servidor(ThreadingHTTPServer):
+    """Responde siempre 'cuerpo' y cierra la conexión (sin Content-Length, como un corte)."""
+    daemon_threads = True
+
+    def __init__(self, cuerpo: bytes):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.cuerpo = cuerpo
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(self.server.cuerpo)
+
+
+@pytest.fixture
+def servidor_sie(monkeypatch):
+    from app.data_sources import banxico
+
+    servidores = []
+
+    def _iniciar(cuerpo: bytes):
+        srv = _Servidor(cuerpo)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        servidores.append(srv)
+        monkeypatch.setattr(banxico, "BASE_URL", f"http://127.0.0.1:{srv.server_address[1]}/series")
+
+    yield _iniciar
+    for srv in servidores:
+        srv.shutdown()
+
+
+LOTE = {"fix": "SF43718", "udis": "SP68257", "tasa_objetivo": "SF61745", "tiie_28": "SF43783"}
+A, B = dt.date(2024, 1, 1), dt.date(2024, 1, 31)
+
+
+def test_lote_completo_guarda_todo_y_cubre_las_faltantes(almacen, servidor_sie):
+    from app.data_sources import banxico
+
+    servidor_sie(_cuerpo())
+    banxico._descargar_lote_flujo(A, B, LOTE)
+
+    assert len(almacen.leer("banxico", "fix", A, B)) == 2          # sin el N/E
+    # tiie_28 no vino en la respuesta: su rango queda cubierto (vacío)
+    assert [(r[0], r[1]) for r in almacen.rangos("banxico", "tiie_28")] == [(A, B)]
+
+
+def test_lote_cortado_no_marca_rangos_de_lo_incompleto(almacen, servidor_sie):
+    from app.data_sources import banxico
+
+    cuerpo = _cuerpo()
+    servidor_sie(cuerpo[:cuerpo.index(b'"SF61745"') + 40])
+    with pytest.raises(ValueError):
+        banxico._descargar_lote_flujo(A, B, LOTE)
+
+    # Las series que llegaron completas sí se guardan
+    assert [(r[0], r[1]) for r in almacen.rangos("banxico", "fix")] == [(A, B)]
+    # La cortada y las que no alcanzaron a llegar no quedan como cubiertas
+    assert almacen.rangos("banxico", "tasa_objetivo") == []
+    assert almacen.rangos("banxico", "tiie_28") == []
+
+
+def test_lote_asincrono_lee_en_flujo_con_httpx(almacen, servidor_sie):
+    from app.data_sources import banxico, http_client
+
+    cuerpo = _cuerpo()
+    servidor_sie(cuerpo)
+    http_client.ejecutar(banxico._descargar_lote_flujo_async(A, B, {"fix": "SF43718", "tiie_28": "SF43783"}))
+    assert len(almacen.leer("banxico", "fix", A, B)) == 2
+    assert [(r[0], r[1]) for r in almacen.rangos("banxico", "tiie_28")] == [(A, B)]
+
+    # Cortada: igual que la versión síncrona, sin rangos de lo incompleto
+    servidor_sie(cuerpo[:cuerpo.index(b'"SF61745"') + 40])
+    otro = {"tasa_objetivo": "SF61745", "tiie_91": "SF43878", "udis": "SP68257"}
+    with pytest.raises(ValueError):
+        http_client.ejecutar(banxico._descargar_lote_flujo_async(A, B, otro))
+    assert almacen.rangos("banxico", "tasa_objetivo") == []
+    assert almacen.rangos("banxico", "tiie_91") == []
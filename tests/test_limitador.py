@@ -0,0 +1,125 @@
+"""Token bucket con cola de prioridad (app/data_sources/limitador.py)."""
+import asyncio
+import itertools
+import threading
+import time
+
+from app.data_sources import limitador
+from app.data_sources.limitador import PRIORIDAD_FONDO, PRIORIDAD_INTERACTIVA, Cubeta
+
+
+_nombres = itertools.count()
+
+
+def _vacia(tasa: float) -> Cubeta:
+    """Cubeta nueva con ráfaga 1 ya consumida que se rellena a 'tasa' tokens por segundo."""
+    c = Cubeta(f"pruebas-{next(_nombres)}", int(tasa) + 1, 1.0, rafaga=1)
+    assert c.intentar()
+    return c
+
+
+def _formar(c: Cubeta, n: int) -> None:
+    fin = time.monotonic() + 2
+    while len(c._cola) < n:
+        assert time.monotonic() < fin
+        time.sleep(0.001)
+
+
+def test_orden_por_prioridad_y_llegada():
+    c = _vacia(tasa=20)
+    orden = []
+    hilos = []
+    for nombre, prioridad in [("fondo1", PRIORIDAD_FONDO), ("pagina1", PRIORIDAD_INTERACTIVA),
+                              ("fondo2", PRIORIDAD_FONDO), ("pagina2", PRIORIDAD_INTERACTIVA)]:
+        h = threading.Thread(target=lambda n=nombre, p=prioridad: (c.adquirir(p), orden.append(n)))
+        h.start()
+        hilos.append(h)
+        _formar(c, len(hilos))
+    for h in hilos:
+        h.join(3)
+
+    assert orden == ["pagina1", "pagina2", "fondo1", "fondo2"]
+    assert c._cola == []
+
+
+def test_recarga_a_la_tasa_configurada():
+    c = _vacia(tasa=20)
+    t0 = time.monotonic()
+    for _ in range(10):
+        c.adquirir()
+    transcurrido = time.monotonic() - t0
+    # 10 tokens a 20/s: medio segundo, sin ráfagas por encima de la capacidad
+    assert 0.45 <= transcurrido < 0.8
+
+
+def test_async_orden_y_tasa():
+    c = _vacia(tasa=20)
+    orden = []
+
+    async def _pedir(nombre, prioridad):
+        await c.adquirir_async(prioridad)
+        orden.append((nombre, time.monotonic()))
+
+    async def _todas():
+        tareas = []
+        for i in range(6):
+            prioridad = PRIORIDAD_FONDO if i % 2 == 0 else PRIORIDAD_INTERACTIVA
+            tareas.append(asyncio.create_task(_pedir(f"{prioridad}-{i}", prioridad)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tareas)
+
+    t0 = time.monotonic()
+    asyncio.run(_todas())
+
+    assert [n for n, _ in orden] == ["0-1", "0-3", "0-5", "10-0", "10-2", "10-4"]
+    assert 0.25 <= orden[-1][1] - t0 < 0.8
+    assert c._cola == []
+
+
+def test_async_cancelada_deja_la_cola():
+    c = _vacia(tasa=2)
+
+    async def _cancelar():
+        tarea = asyncio.create_task(c.adquirir_async())
+        await asyncio.sleep(0.05)
+        assert len(c._cola) == 1
+        tarea.cancel()
+        await asyncio.gather(tarea, return_exceptions=True)
+
+    asyncio.run(_cancelar())
+    assert c._cola == []
+
+
+def test_prioridad_del_contexto(monkeypatch):
+    monkeypatch.setattr(limitador, "_prioridad_defecto", PRIORIDAD_INTERACTIVA)
+    assert limitador.prioridad_actual() == PRIORIDAD_INTERACTIVA
+    with limitador.prioridad(PRIORIDAD_FONDO):
+        assert limitador.prioridad_actual() == PRIORIDAD_FONDO
+    assert limitador.prioridad_actual() == PRIORIDAD_INTERACTIVA
+
+
+def test_dos_procesos_comparten_la_cuota():
+    # Dos cubetas con el mismo proveedor (como la app y el worker) leen la
+    # misma fila del almacén: entre las dos no pasan de la tasa
+    app = _vacia(tasa=20)
+    worker = Cubeta(app.nombre, 21, 1.0, rafaga=1)
+    assert not worker.intentar()
+
+    t0 = time.monotonic()
+    hilos = [threading.Thread(target=c.adquirir) for c in (app, worker) for _ in range(5)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join(3)
+    assert 0.45 <= time.monotonic() - t0 < 0.9
+
+
+def test_el_fondo_deja_la_reserva_para_las_paginas():
+    c = Cubeta(f"pruebas-{next(_nombres)}", 401, 100.0, rafaga=4)     # reserva de 2, recarga lenta
+    assert c.intentar(PRIORIDAD_FONDO)
+    assert c.intentar(PRIORIDAD_FONDO)
+    assert not c.intentar(PRIORIDAD_FONDO)
+    # Las páginas sí usan la reserva
+    assert c.intentar(PRIORIDAD_INTERACTIVA)
+    assert c.intentar(PRIORIDAD_INTERACTIVA)
+    assert not c.intentar(PRIORIDAD_INTERACTIVA)
@@ -0,0 +1,37 @@
+"""Conversión vectorizada de observaciones (app/data_sources/parseo.py)."""
+import numpy as np
+
+from app.data_sources import parseo
+
+
+def test_valores_texto_centinelas_y_numeros_json():
+    np.testing.assert_array_equal(
+        parseo.valores_a_float(["1,234.5", "N/E", "", None, "2"]),
+        [1234.5, np.nan, np.nan, np.nan, 2.0],
+    )
+    # Números JSON (sin pasar por texto) y mezclados con texto
+    np.testing.assert_array_equal(parseo.valores_a_float([1.5, 2, "3"]), [1.5, 2.0, 3.0])
+    np.testing.assert_array_equal(parseo.valores_a_float([1.5, "N/E", "x"]), [1.5, np.nan, np.nan])
+    np.testing.assert_array_equal(parseo.valores_a_float(["."], nulos=(".",)), [np.nan])
+
+
+def test_fechas_validas_e_invalidas():
+    fechas = parseo.fechas_ddmmyyyy([
+        "02/01/2024",
+        "29/02/2024",
+        "31/02/2024",      # no existe
+        "01/02/20245",     # más larga: no se trunca a 2024
+        "1/2/2024",
+        "0ñ/02/2024",      # no ASCII
+        "0:/02/2024",      # no dígito
+        "01-02-2024",
+        None,
+    ])
+    assert fechas[:2].astype("datetime64[D]").astype(str).tolist() == ["2024-01-02", "2024-02-29"]
+    assert np.isnat(fechas[2:]).all()
+
+
+def test_fechas_iso():
+    fechas = parseo.fechas_iso(["2024-01-31", "no"])
+    assert str(fechas[0].astype("datetime64[D]")) == "2024-01-31"
+    assert np.isnat(fechas[1])
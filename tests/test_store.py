@@ -0,0 +1,74 @@
+"""Almacén local de series: rangos consultados y huecos (app/data_sources/store.py)."""
+import datetime as dt
+import time
+
+import pandas as pd
+
+HOY = dt.date.today()
+
+
+def _dias(a: dt.date, b: dt.date) -> pd.DataFrame:
+    fechas = pd.date_range(a, b, freq="D")
+    return pd.DataFrame({"fecha": fechas, "valor": range(len(fechas))})
+
+
+def _tramos(store, fuente="fred", clave="x"):
+    return [(ini, fin) for ini, fin, _ in store.rangos(fuente, clave)]
+
+
+def test_sin_datos_todo_es_hueco(almacen):
+    a, b = dt.date(2020, 1, 1), dt.date(2020, 12, 31)
+    assert almacen.rangos_faltantes("fred", "x", a, b) == [(a, b)]
+    # Lo posterior a hoy no se pide
+    assert almacen.rangos_faltantes("fred", "x", HOY, HOY + dt.timedelta(days=30)) == [(HOY, HOY)]
+
+
+def test_rangos_que_se_tocan_o_traslapan_se_unen(almacen):
+    d = dt.date
+    almacen.guardar("fred", "x", _dias(d(2020, 1, 1), d(2020, 1, 31)), d(2020, 1, 1), d(2020, 1, 31))
+    almacen.guardar("fred", "x", _dias(d(2020, 2, 1), d(2020, 2, 29)), d(2020, 2, 1), d(2020, 2, 29))
+    almacen.guardar("fred", "x", _dias(d(2020, 4, 1), d(2020, 4, 30)), d(2020, 4, 1), d(2020, 4, 30))
+    assert _tramos(almacen) == [(d(2020, 1, 1), d(2020, 2, 29)), (d(2020, 4, 1), d(2020, 4, 30))]
+
+    assert almacen.rangos_faltantes("fred", "x", d(2019, 12, 1), d(2020, 5, 15)) == [
+        (d(2019, 12, 1), d(2019, 12, 31)),
+        (d(2020, 3, 1), d(2020, 3, 31)),
+        (d(2020, 5, 1), d(2020, 5, 15)),
+    ]
+
+    # El hueco de marzo, traslapando ambos lados, deja un solo tramo
+    almacen.guardar("fred", "x", _dias(d(2020, 2, 15), d(2020, 4, 15)), d(2020, 2, 15), d(2020, 4, 15))
+    assert _tramos(almacen) == [(d(2020, 1, 1), d(2020, 4, 30))]
+    assert almacen.rangos_faltantes("fred", "x", d(2020, 1, 1), d(2020, 4, 30)) == []
+
+
+def test_guardar_reemplaza_las_observaciones_del_rango(almacen):
+    d = dt.date
+    almacen.guardar("fred", "x", _dias(d(2020, 1, 1), d(2020, 1, 10)), d(2020, 1, 1), d(2020, 1, 10))
+    # La revisión trae menos fechas: las que ya no vienen se borran
+    revision = pd.DataFrame({"fecha": pd.to_datetime(["2020-01-05", "2020-01-06"]), "valor": [50.0, None]})
+    almacen.guardar("fred", "x", revision, d(2020, 1, 5), d(2020, 1, 10))
+
+    df = almacen.leer("fred", "x", d(2020, 1, 1), d(2020, 1, 10))
+    assert df["fecha"].dt.day.tolist() == [1, 2, 3, 4, 5]
+    assert df["valor"].tolist() == [0.0, 1.0, 2.0, 3.0, 50.0]
+
+
+def test_cola_vencida_se_vuelve_a_leer(almacen):
+    inicio = HOY - dt.timedelta(days=60)
+    almacen.guardar("banxico", "x", _dias(inicio, HOY), inicio, HOY, actualizado=time.time() - 7200)
+
+    # Dentro del TTL la cola sigue valiendo
+    assert almacen.rangos_faltantes("banxico", "x", inicio, HOY, relectura_dias=7, ttl_seg=10_000) == []
+    # Vencida: sólo se piden los últimos 'relectura_dias'
+    assert almacen.rangos_faltantes("banxico", "x", inicio, HOY, relectura_dias=7, ttl_seg=3600) == [
+        (HOY - dt.timedelta(days=7), HOY)
+    ]
+    # Sin relectura el rango completo cuenta como consultado
+    assert almacen.rangos_faltantes("banxico", "x", inicio, HOY, ttl_seg=3600) == []
+
+    # Al releer la cola el rango queda fresco otra vez
+    cola = HOY - dt.timedelta(days=7)
+    almacen.guardar("banxico", "x", _dias(cola, HOY), cola, HOY)
+    assert _tramos(almacen, "banxico") == [(inicio, HOY)]
+    assert almacen.rangos_faltantes("banxico", "x", inicio, HOY, relectura_dias=7, ttl_seg=3600) == []